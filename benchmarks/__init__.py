@@ -0,0 +1,9 @@
+"""
+Performance benchmarks for the Daily Word application.
+
+Benchmarks run against local stand-ins for the word list, the dictionary
+API and SES (see fake_services), so results don't depend on the network or
+on AWS. Run them as modules from the project root, e.g.
+
+    python -m benchmarks.pipeline
+"""
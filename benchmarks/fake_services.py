@@ -0,0 +1,318 @@
+"""
+Local HTTP stand-ins for the services the application talks to.
+
+One threaded server answers:
+
+- GET /wordlist: a generated list of common-looking words
+- GET /entries/en/<word>: a Free Dictionary API style entry for any word
+- POST /: an SES SendEmail response (the query protocol boto3 uses for SES)
+
+Each route waits for a configurable latency before answering, to model
+network round trips. FakeSMTPServer is a minimal SMTP server for the SMTP
+transport, with the same kind of latency setting.
+"""
+import json
+import time
+import uuid
+import base64
+import itertools
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+_SYLLABLES = ("ka", "lo", "mi", "ren", "sta", "vor", "ten", "bli", "dra", "ques")
+
+SES_RESPONSE = """<SendEmailResponse xmlns="http://ses.amazonaws.com/doc/2010-12-01/">
+  <SendEmailResult>
+    <MessageId>{message_id}</MessageId>
+  </SendEmailResult>
+  <ResponseMetadata>
+    <RequestId>{request_id}</RequestId>
+  </ResponseMetadata>
+</SendEmailResponse>"""
+
+def generate_words(count):
+    """Generate distinct pronounceable words of two to four syllables."""
+    words = []
+    for length in (2, 3, 4):
+        for parts in itertools.product(_SYLLABLES, repeat=length):
+            words.append("".join(parts))
+            if len(words) == count:
+                return words
+    return words
+
+def make_entry(word):
+    """Build a dictionary API entry for a word."""
+    return {
+        "word": word,
+        "phonetics": [{"text": f"/{word}/", "audio": ""}],
+        "meanings": [
+            {
+                "partOfSpeech": "noun",
+                "definitions": [
+                    {"definition": f"A sample meaning of {word}.", "example": f"The {word} was easy to remember."},
+                    {"definition": f"Another sense of {word}."}
+                ],
+                "synonyms": ["sample", "example"],
+                "antonyms": ["original"]
+            },
+            {
+                "partOfSpeech": "verb",
+                "definitions": [{"definition": f"To use {word} in a sentence."}],
+                "synonyms": [],
+                "antonyms": []
+            }
+        ]
+    }
+
+class FakeServiceHandler(BaseHTTPRequestHandler):
+    """Request handler for the word list, dictionary and SES routes."""
+
+    # Keep connections open so clients can reuse them, like the real services
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle's algorithm delay the body
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status, body, content_type):
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+
+        if self.path == "/wordlist":
+            self._respond(200, self.server.word_list, "text/plain")
+        elif self.path.startswith("/entries/en/"):
+            word = unquote(self.path[len("/entries/en/"):])
+            self._respond(200, json.dumps([make_entry(word)]), "application/json")
+        else:
+            self._respond(404, json.dumps({"title": "No Definitions Found"}), "application/json")
+
+    def do_POST(self):
+        # Read the form body so the connection can be reused
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.ses_latency)
+
+        with self.server.lock:
+            self.server.emails_sent += 1
+        self._respond(200, SES_RESPONSE.format(message_id=uuid.uuid4(), request_id=uuid.uuid4()), "text/xml")
+
+class FakeServices:
+    """
+    Run the stand-in server on a background thread.
+
+    Args:
+        latency (float): Seconds to wait before answering word list and dictionary requests
+        ses_latency (float): Seconds to wait before answering SES requests
+        word_count (int): Number of words in the word list
+    """
+
+    def __init__(self, latency=0.0, ses_latency=0.0, word_count=10000):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeServiceHandler)
+        self.server.daemon_threads = True
+        self.server.latency = latency
+        self.server.ses_latency = ses_latency
+        self.server.word_list = "\n".join(generate_words(word_count))
+        self.server.emails_sent = 0
+        self.server.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def emails_sent(self):
+        return self.server.emails_sent
+
+    def environment(self):
+        """Environment variables that point the application at this server."""
+        return {
+            "WORD_LIST_URL": f"{self.url}/wordlist",
+            "DICTIONARY_API_URL": f"{self.url}/entries/en",
+            "AWS_SES_ENDPOINT_URL": self.url
+        }
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """One SMTP session: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP and QUIT."""
+
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def _read_data(self):
+        lines = []
+        for line in self.rfile:
+            if line in (b".\r\n", b".\n"):
+                return b"".join(lines)
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return None
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply("220 fake-smtp ESMTP ready")
+        authenticated = server.username is None
+        recipients = []
+        sent = 0
+
+        for raw in self.rfile:
+            command, _, argument = raw.decode("utf-8", "replace").strip().partition(" ")
+            command = command.upper()
+
+            if server.max_messages_per_connection and sent >= server.max_messages_per_connection:
+                self._reply("421 fake-smtp closing connection")
+                return
+            if command == "EHLO":
+                extensions = ["8BITMIME", "SIZE 10485760"] + (["AUTH PLAIN"] if server.username else [])
+                self.wfile.write("".join(f"250-{line}\r\n" for line in ["fake-smtp"] + extensions[:-1]).encode())
+                self._reply(f"250 {extensions[-1]}")
+            elif command == "HELO":
+                self._reply("250 fake-smtp")
+            elif command == "AUTH":
+                credentials = base64.b64decode(argument.partition(" ")[2] or "").split(b"\0")
+                authenticated = credentials[1:] == [server.username.encode(), (server.password or "").encode()]
+                self._reply("235 Authentication succeeded" if authenticated else "535 Authentication failed")
+            elif command in ("MAIL", "RCPT", "DATA") and not authenticated:
+                self._reply("530 Authentication required")
+            elif command == "MAIL":
+                recipients = []
+                self._reply("250 OK")
+            elif command == "RCPT":
+                address = argument.partition(":")[2].strip().strip("<>")
+                if address in server.reject:
+                    self._reply("550 Mailbox unavailable")
+                else:
+                    recipients.append(address)
+                    self._reply("250 OK")
+            elif command == "DATA":
+                if not recipients:
+                    self._reply("503 Need RCPT first")
+                    continue
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = self._read_data()
+                if data is None:
+                    return
+                time.sleep(server.latency)
+                with server.lock:
+                    server.emails_sent += len(recipients)
+                    if server.keep_messages:
+                        server.messages.append((list(recipients), data))
+                self._reply(f"250 OK queued as {uuid.uuid4().hex}")
+                recipients = []
+                sent += 1
+                # Drop the connection without a word, like a server closing an idle or busy session
+                if (server.max_messages_per_connection and sent >= server.max_messages_per_connection
+                        and not server.announce_close):
+                    return
+            elif command in ("RSET", "NOOP"):
+                recipients = []
+                self._reply("250 OK")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("500 Command not recognized")
+
+class FakeSMTPServer:
+    """
+    Run a minimal SMTP server on a background thread.
+
+    Args:
+        latency (float): Seconds to wait before accepting each message
+        username (str): Require AUTH PLAIN with this name (and password)
+        password (str): Password for username
+        max_messages_per_connection (int): Close a session after this many
+            messages, to exercise reconnects
+        announce_close (bool): Reply 421 to the next command before closing
+            such a session, instead of dropping it silently
+        reject (set): Recipients refused with a 550
+        keep_messages (bool): Keep (recipients, message bytes) of every message in messages
+    """
+
+    def __init__(self, latency=0.0, username=None, password=None, max_messages_per_connection=None,
+                 reject=(), keep_messages=False, announce_close=False):
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeSMTPHandler)
+        self.server.daemon_threads = True
+        self.server.latency = latency
+        self.server.username = username
+        self.server.password = password
+        self.server.max_messages_per_connection = max_messages_per_connection
+        self.server.announce_close = announce_close
+        self.server.reject = set(reject)
+        self.server.keep_messages = keep_messages
+        self.server.messages = []
+        self.server.emails_sent = 0
+        self.server.connections = 0
+        self.server.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def host(self):
+        return self.server.server_address[0]
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    @property
+    def emails_sent(self):
+        return self.server.emails_sent
+
+    @property
+    def connections(self):
+        return self.server.connections
+
+    @property
+    def messages(self):
+        return self.server.messages
+
+    def environment(self):
+        """Environment variables that send the application's email through this server."""
+        env = {
+            "EMAIL_TRANSPORT": "smtp",
+            "SMTP_HOST": self.host,
+            "SMTP_PORT": str(self.port),
+            "SMTP_SECURITY": "none"
+        }
+        if self.server.username:
+            env.update({"SMTP_USERNAME": self.server.username, "SMTP_PASSWORD": self.server.password or ""})
+        return env
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,184 @@
+"""
+Shared benchmark helpers: stage timing, summaries and baseline comparison.
+"""
+import os
+import json
+import time
+import functools
+import contextlib
+import numpy as np
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# A result is a regression when it is this much worse than the baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and, for latencies, at least this many milliseconds worse (ignores timer noise)
+MIN_REGRESSION_MS = 0.5
+
+class StageTimer:
+    """
+    Time calls to application functions by wrapping module attributes.
+
+    Wrapping replaces the attribute on every given module, so functions
+    imported by name elsewhere (from x import f) are timed too.
+    """
+
+    def __init__(self):
+        self.samples = {}
+        self._wrapped = []
+
+    def record(self, stage, seconds):
+        self.samples.setdefault(stage, []).append(seconds)
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def wrap(self, stage, *targets):
+        """
+        Time every call of a function under a stage name.
+
+        Args:
+            stage (str): Stage name
+            targets: (module, attribute name) pairs that refer to the same function
+        """
+        module, name = targets[0]
+        original = getattr(module, name)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            with self.measure(stage):
+                return original(*args, **kwargs)
+
+        for module, name in targets:
+            self._wrapped.append((module, name, getattr(module, name)))
+            setattr(module, name, timed)
+
+    def restore(self):
+        """Put the original functions back."""
+        for module, name, original in reversed(self._wrapped):
+            setattr(module, name, original)
+        self._wrapped = []
+
+    def reset(self):
+        self.samples = {}
+
+    def summary(self):
+        return {stage: summarize(samples) for stage, samples in self.samples.items()}
+
+def summarize(samples):
+    """Summarize durations in seconds as millisecond percentiles."""
+    ms = np.asarray(samples) * 1000.0
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "count": len(ms),
+        "mean": float(ms.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(ms.max())
+    }
+
+def get_baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+def load_baseline(path):
+    """Load saved results, or None if there are none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_results(results, path):
+    """Save results as JSON, e.g. as a new baseline."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Find the measurements that got worse than the baseline.
+
+    Both arguments map scenario names to {"stages": {stage: summary}} and
+    optional "throughput" (higher is better) and "bytes" (lower is better)
+    numbers.
+
+    Returns:
+        list: Human-readable descriptions of each regression
+    """
+    regressions = []
+    for scenario, current in results.items():
+        previous = baseline.get(scenario)
+        if not previous:
+            continue
+
+        for stage, stats in current.get("stages", {}).items():
+            old = previous.get("stages", {}).get(stage)
+            if not old:
+                continue
+            for key in ("p50", "p95"):
+                if stats[key] > old[key] * (1 + tolerance) and stats[key] - old[key] > MIN_REGRESSION_MS:
+                    regressions.append(
+                        f"{scenario} {stage} {key}: {stats[key]:.2f} ms (baseline {old[key]:.2f} ms)"
+                    )
+
+        for key, higher_is_better in (("throughput", True), ("bytes", False), ("peak_memory", False)):
+            new, old = current.get(key), previous.get(key)
+            if not new or not old:
+                continue
+            worse = new < old / (1 + tolerance) if higher_is_better else new > old * (1 + tolerance)
+            if worse:
+                regressions.append(f"{scenario} {key}: {new:,.1f} (baseline {old:,.1f})")
+
+    return regressions
+
+def print_report(title, results):
+    """Print stage latencies and totals for every scenario."""
+    print(f"\n{title}")
+    print("=" * 78)
+    for scenario, result in results.items():
+        extras = []
+        if result.get("throughput"):
+            extras.append(f"{result['throughput']:,.1f}/s")
+        if result.get("bytes") is not None:
+            extras.append(f"{result['bytes']:,} bytes written")
+        if result.get("peak_memory") is not None:
+            extras.append(f"{result['peak_memory'] / 1024:,.1f} KiB peak")
+        print(f"\n{scenario}" + (f"  ({', '.join(extras)})" if extras else ""))
+        print(f"  {'stage':<22}{'calls':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for stage, stats in result.get("stages", {}).items():
+            print(f"  {stage:<22}{stats['count']:>8}{stats['p50']:>10.2f}{stats['p95']:>10.2f}"
+                  f"{stats['p99']:>10.2f}{stats['max']:>10.2f}")
+    print()
+
+def check_baseline(name, results, baseline_path=None, save=False, tolerance=DEFAULT_TOLERANCE):
+    """
+    Save results as the baseline, or compare them against the saved one.
+
+    Returns:
+        int: Process exit code, 1 if there are regressions
+    """
+    path = baseline_path or get_baseline_path(name)
+    if save:
+        save_results(results, path)
+        print(f"Saved baseline to {path}")
+        return 0
+
+    baseline = load_baseline(path)
+    if baseline is None:
+        print(f"No baseline at {path}. Run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, tolerance)
+    if regressions:
+        print(f"Regressions against {path} (tolerance {tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print(f"No regressions against {path}.")
+    return 0
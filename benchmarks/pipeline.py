@@ -0,0 +1,152 @@
+"""
+End-to-end benchmark of the daily pipeline and the email fan-out.
+
+Runs dailydose.main.main() against the local stand-in services with 1, 1k
+and 100k subscribers, and reports latency percentiles for each stage (word
+list, dictionary lookup, storage, template rendering, SES sends, the whole
+fan-out and the whole pipeline) plus email throughput. Email goes to the
+SES stand-in, or with --transport smtp to a local SMTP server.
+
+    python -m benchmarks.pipeline
+    python -m benchmarks.pipeline --subscribers 1,1000 --latency-ms 20 --save-baseline
+    python -m benchmarks.pipeline --transport smtp --subscribers 1000
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import contextlib
+from .fake_services import FakeServices, FakeSMTPServer
+from .harness import DEFAULT_TOLERANCE, StageTimer, print_report, check_baseline, save_results
+
+# Emails each subscriber count may send over all its runs; large lists get fewer runs
+SEND_BUDGET = 10000
+
+def configure_environment(services, cache_dir, mongo):
+    """Point the application at the stand-ins. Must run before dailydose is imported."""
+    os.environ.update(services.environment())
+    os.environ.update({
+        "DAILYDOSE_CACHE_DIR": cache_dir,
+        "EMAIL_ENABLED": "true",
+        "EMAIL_SENDER": "benchmark@example.com",
+        "AWS_REGION": "us-east-1",
+        "AWS_ACCESS_KEY_ID": "benchmark",
+        "AWS_SECRET_ACCESS_KEY": "benchmark",
+        "MONGODB_URI": "" if mongo in ("none", "mongomock") else mongo,
+        "WORD_SELECTION": "uniform"
+    })
+
+def load_application(mongo):
+    """Import the application modules, connecting storage to mongomock if asked."""
+    from dailydose import main as app
+    from dailydose.core import word_utils, storage, pipeline, email_service
+
+    if mongo == "mongomock":
+        import mongomock
+        client = mongomock.MongoClient()
+        storage.word_collection = client[storage.MONGODB_DB_NAME][storage.MONGODB_COLLECTION]
+
+    return app, word_utils, pipeline, email_service
+
+def instrument(timer, app, word_utils, pipeline, email_service, transport="ses"):
+    """Time each pipeline stage."""
+    timer.wrap("word_list", (word_utils, "get_word_list"))
+    timer.wrap("dictionary_lookup", (word_utils, "get_word_info"), (app, "get_word_info"))
+    timer.wrap("storage", (pipeline, "save_word_history"))
+    timer.wrap("template_render", (email_service, "render_word_email"))
+    timer.wrap(f"{transport}_send", (email_service, "send_email"))
+    timer.wrap("fanout", (pipeline, "notify"))
+
+def run_scenario(app, timer, services, subscribers, runs):
+    """
+    Run the whole pipeline several times with a given number of subscribers.
+
+    services is whichever stand-in receives the email (it counts emails_sent).
+
+    Returns:
+        dict: Stage summaries, runs, emails sent and fan-out throughput (emails/s)
+    """
+    os.environ["EMAIL_SUBSCRIBERS"] = ",".join(f"reader{i}@example.com" for i in range(subscribers))
+    timer.reset()
+    sent_before = services.emails_sent
+
+    # The application prints a line per email; keep the report readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(runs):
+            with timer.measure("pipeline"):
+                app.main()
+
+    emails = services.emails_sent - sent_before
+    fanout_seconds = sum(timer.samples.get("fanout", []))
+    return {
+        "subscribers": subscribers,
+        "runs": runs,
+        "emails": emails,
+        "throughput": emails / fanout_seconds if fanout_seconds else None,
+        "stages": timer.summary()
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.pipeline", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscribers", default="1,1000,100000",
+                        help="Comma-separated subscriber counts (default: 1,1000,100000)")
+    parser.add_argument("--runs", type=int, default=10,
+                        help=f"Pipeline runs per subscriber count, capped at {SEND_BUDGET} emails (default: 10)")
+    parser.add_argument("--latency-ms", type=float, default=50.0,
+                        help="Word list and dictionary response latency (default: 50)")
+    parser.add_argument("--ses-latency-ms", type=float, default=0.0,
+                        help="SES response latency, or SMTP latency per message (default: 0)")
+    parser.add_argument("--transport", choices=("ses", "smtp"), default="ses",
+                        help="Send email to the SES stand-in or a local SMTP server (default: ses)")
+    parser.add_argument("--mongo", default="none",
+                        help="Storage: none (local file), mongomock, or a MongoDB URI (default: none)")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    parser.add_argument("--baseline", help="Baseline file (default: benchmarks/baselines/pipeline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown before reporting a regression (default: {DEFAULT_TOLERANCE})")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    counts = [int(count) for count in args.subscribers.split(",") if count.strip()]
+
+    work_dir = tempfile.mkdtemp(prefix="dailydose-bench-")
+    cwd = os.getcwd()
+    results = {}
+
+    with FakeServices(latency=args.latency_ms / 1000, ses_latency=args.ses_latency_ms / 1000) as services, \
+            FakeSMTPServer(latency=args.ses_latency_ms / 1000) as smtp_server:
+        configure_environment(services, os.path.join(work_dir, ".cache"), args.mongo)
+        if args.transport == "smtp":
+            os.environ.update(smtp_server.environment())
+        mail_server = smtp_server if args.transport == "smtp" else services
+        try:
+            app, word_utils, pipeline, email_service = load_application(args.mongo)
+        except ImportError as e:
+            print(f"Error: {e}. Install mongomock or choose another --mongo option.")
+            return 2
+
+        timer = StageTimer()
+        instrument(timer, app, word_utils, pipeline, email_service, args.transport)
+
+        # The history file is relative to the working directory
+        os.chdir(work_dir)
+        try:
+            for count in counts:
+                runs = max(1, min(args.runs, SEND_BUDGET // max(count, 1)))
+                print(f"Running {runs} pipeline runs with {count:,} subscribers...")
+                results[f"subscribers={count}"] = run_scenario(app, timer, mail_server, count, runs)
+        finally:
+            timer.restore()
+            os.chdir(cwd)
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_report(f"Daily pipeline benchmark ({args.transport})", results)
+    if args.output:
+        save_results(results, args.output)
+    return check_baseline("pipeline", results, args.baseline, args.save_baseline, args.tolerance)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Micro-benchmarks for the history storage backends as history grows.
+
+For each backend and history size (10 to 1,000,000 words by default), the
+history is filled with that many words and new words are then saved one at
+a time. The report shows per-save latency, bytes written per save and peak
+Python memory of a save.
+
+    python -m benchmarks.storage
+    python -m benchmarks.storage --backends file --sizes 10,1000,100000
+
+New backends are added to BACKENDS with a setup function that fills the
+backend and a save function that stores one word.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from .fake_services import make_entry
+from .harness import DEFAULT_TOLERANCE, summarize, print_report, check_baseline, save_results
+
+# Saves measured per size; large histories get fewer (each save may rewrite everything)
+SAVE_BUDGET = 2_000_000
+MAX_SAVES = 50
+MIN_SAVES = 3
+
+def bytes_written():
+    """
+    Bytes this process has written so far, through any file or socket.
+
+    Returns:
+        int: Byte count, or None where /proc/self/io isn't available
+    """
+    try:
+        with open("/proc/self/io", "r") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def history_entry(word, date="2023-01-01"):
+    """A history file entry like the ones save_to_file writes."""
+    return {"word": word, "date_added": date, "review_count": 0, "next_review": date}
+
+def setup_file(storage, size, work_dir):
+    storage.HISTORY_FILE = os.path.join(work_dir, "word_history.json")
+    storage.word_collection = None
+    with open(storage.HISTORY_FILE, "w") as f:
+        json.dump({"words": [history_entry(f"word{i}") for i in range(size)]}, f, indent=2)
+
+def setup_mongo(storage, size, work_dir, mongo):
+    storage.HISTORY_FILE = os.path.join(work_dir, "word_history.json")
+    if mongo == "mongomock":
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        import pymongo
+        client = pymongo.MongoClient(mongo, serverSelectionTimeoutMS=5000)
+
+    collection = client[storage.MONGODB_DB_NAME][f"benchmark_{size}"]
+    collection.drop()
+    collection.create_index("word")
+    for start in range(0, size, 10000):
+        collection.insert_many([
+            dict(history_entry(f"word{i}"), last_reviewed="2023-01-01")
+            for i in range(start, min(start + 10000, size))
+        ])
+    storage.word_collection = collection
+
+def setup_both(storage, size, work_dir, mongo):
+    setup_file(storage, size, work_dir)
+    setup_mongo(storage, size, work_dir, mongo)
+
+# name: (setup(storage, size, work_dir, mongo), save(storage, word, info), needs MongoDB)
+BACKENDS = {
+    "file": (lambda storage, size, work_dir, mongo: setup_file(storage, size, work_dir),
+             lambda storage, word, info: storage.save_to_file(word, info), False),
+    "mongo": (setup_mongo, lambda storage, word, info: storage.save_to_mongodb(word, info), True),
+    "history": (setup_both, lambda storage, word, info: storage.save_word_history(word, info), True)
+}
+
+def run_scenario(storage, backend, size, work_dir, mongo):
+    """
+    Fill a backend with size words, then time saving new ones.
+
+    Returns:
+        dict: Save latency summary, mean bytes written per save and peak memory of one save
+    """
+    setup, save, _ = BACKENDS[backend]
+    setup(storage, size, work_dir, mongo)
+
+    saves = max(MIN_SAVES, min(MAX_SAVES, SAVE_BUDGET // max(size, 1)))
+    durations = []
+    written = []
+    for i in range(saves):
+        word = f"newword{i}"
+        info = make_entry(word)
+        before = bytes_written()
+        start = time.perf_counter()
+        save(storage, word, info)
+        durations.append(time.perf_counter() - start)
+        after = bytes_written()
+        if before is not None and after is not None:
+            written.append(after - before)
+
+    # One more save under tracemalloc, which slows everything down too much to time
+    tracemalloc.start()
+    save(storage, "peakword", make_entry("peakword"))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "backend": backend,
+        "size": size,
+        "stages": {"save": summarize(durations)},
+        "bytes": int(sum(written) / len(written)) if written else None,
+        "peak_memory": peak
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.storage", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", default="file,mongo,history",
+                        help=f"Comma-separated backends out of {', '.join(BACKENDS)} (default: all)")
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000,1000000",
+                        help="Comma-separated history sizes (default: 10 to 1000000)")
+    parser.add_argument("--mongo", default="mongomock",
+                        help="MongoDB for the mongo and history backends: mongomock or a URI (default: mongomock)")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    parser.add_argument("--baseline", help="Baseline file (default: benchmarks/baselines/storage.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown before reporting a regression (default: {DEFAULT_TOLERANCE})")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown:
+        print(f"Error: unknown backends: {', '.join(unknown)}")
+        return 2
+
+    work_dir = tempfile.mkdtemp(prefix="dailydose-bench-")
+    # Keep caches out of the project; must be set before dailydose is imported
+    os.environ["DAILYDOSE_CACHE_DIR"] = os.path.join(work_dir, ".cache")
+    from dailydose.core import storage
+
+    results = {}
+    try:
+        for backend in backends:
+            for size in sizes:
+                print(f"Benchmarking {backend} with {size:,} words in history...")
+                try:
+                    results[f"{backend} n={size}"] = run_scenario(storage, backend, size, work_dir, args.mongo)
+                except ImportError as e:
+                    print(f"Skipping {backend}: {e}. Install mongomock or pass --mongo URI.")
+                    break
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_report("Storage benchmark", results)
+    if args.output:
+        save_results(results, args.output)
+    return check_baseline("storage", results, args.baseline, args.save_baseline, args.tolerance)
+
+if __name__ == "__main__":
+    sys.exit(main())
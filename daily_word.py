@@ -5,7 +5,8 @@ Daily Word - A vocabulary learning tool
 This is the main entry point for backward compatibility.
 New code should use the modular structure.
 """
-from dailydose.main import main
+from dailydose.cli import cli
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Without arguments this is the same as running main()
+    cli() 
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Entry point for running the package directly.
 """
-from dailydose.main import main
+from dailydose.cli import cli
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    cli()
@@ -0,0 +1,350 @@
+"""
+Command-line interface for the Daily Word application.
+
+Running without a command shows today's word, as before.
+"""
+import argparse
+import datetime
+from dailydose.main import main
+from dailydose.core import cache, compression, email_service, graph, metrics, planner, profiling, quiz, search, storage, suppression
+from dailydose.core.models import dumps
+from dailydose.core.storage import initialize_mongodb
+from dailydose.core.digest import prepare_digest, display_digest, send_digest
+from dailydose.core.difficulty import TIERS, get_difficulty_table, lookup_tiers
+from dailydose.core.history_io import BATCH_SIZE, export_history, import_history
+from dailydose.core.word_utils import get_cached_word_info
+
+def run_digest(args):
+    """Build a multi-word digest and send it to digest subscribers"""
+    source = "new words" if args.new else "your most recent words"
+    print(f"Building a digest of {args.count} {source}...\n")
+    
+    initialize_mongodb()
+    
+    entries = prepare_digest(args.count, new_words=args.new, max_workers=args.workers, record=not args.dry_run)
+    display_digest(entries)
+    
+    if args.dry_run:
+        print("Dry run: no emails sent.")
+    elif email_service.EMAIL_ENABLED:
+        send_digest(entries)
+    else:
+        print("To enable email functionality, set EMAIL_ENABLED=true in your .env file.")
+
+def run_difficulty(args):
+    """Build the difficulty table and show tier sizes or the tiers of given words"""
+    table = get_difficulty_table(rebuild=args.rebuild)
+    
+    if args.words:
+        for word, tier in zip(args.words, lookup_tiers(table, args.words)):
+            print(f"{word}: {tier or 'not in the word list'}")
+        return
+    
+    print(f"Difficulty table covers {len(table['words'])} words:")
+    for number, name in enumerate(TIERS):
+        print(f"  {name}: {int((table['tiers'] == number).sum())}")
+
+def run_related(args):
+    """Show the words within a number of synonym or antonym steps of a word"""
+    word_graph = graph.get_graph(rebuild=args.rebuild)
+    print(f"Word graph covers {len(word_graph['words'])} words from "
+          f"{int(word_graph['has_entry'].sum())} cached entries.")
+    
+    related = graph.related_words(word_graph, args.word, hops=args.hops, relation=args.relation)
+    if not related:
+        print(f"No related words found for '{args.word}'.")
+        return
+    
+    for step in range(1, args.hops + 1):
+        words = [other for other, steps in related if steps == step]
+        if words:
+            print(f"{step} step{'s' if step > 1 else ''}: {', '.join(words)}")
+
+def run_search(args):
+    """Find words whose definitions or examples contain all the given terms"""
+    index = search.get_index(rebuild=args.rebuild)
+    query = " ".join(args.terms)
+    
+    matches = search.search(index, query)
+    if not matches:
+        print(f"No words found for '{query}' in {len(index['words'])} cached entries.")
+        return
+    
+    print(f"{len(matches)} of {len(index['words'])} cached words match '{query}':")
+    for word in matches[:args.limit]:
+        entry = cache.load_entry(word)
+        snippet = search.find_snippet(entry, query) if entry is not None else None
+        print(f"  {word}: {snippet}" if snippet else f"  {word}")
+    if len(matches) > args.limit:
+        print(f"  ... and {len(matches) - args.limit} more (use --limit to show them)")
+
+def run_quiz(args):
+    """Show multiple-choice quizzes on a word, by default the most recent one"""
+    if args.word:
+        word = args.word
+    else:
+        initialize_mongodb()
+        recent = storage.get_recent_words(1)
+        if not recent:
+            print("No words in your history yet. Name a word to quiz on.")
+            return
+        word = recent[0]
+    
+    word_info = get_cached_word_info(word)
+    if not word_info:
+        print(f"Could not find '{word}' in the dictionary.")
+        return
+    
+    index = quiz.get_index(rebuild=args.rebuild)
+    quizzes = quiz.make_quizzes(word_info, args.count, index=index, choices=args.choices, key=word)
+    if not quizzes:
+        print(f"'{word}' has no definition to quiz on.")
+        return
+    
+    for number, word_quiz in enumerate(quizzes):
+        if number:
+            print()
+        print(quiz.render_quiz_text(word_quiz))
+
+def run_plan(args):
+    """Choose, fetch and render the words of the coming days"""
+    initialize_mongodb()
+    
+    start = datetime.date.fromisoformat(args.start) if args.start else None
+    results = planner.plan_days(args.days, start=start, level=args.level, replan=args.replan)
+    
+    for day in results:
+        level = day["level"] or "any level"
+        if day["word"] is None:
+            print(f"  {day['date']}  {level:<12}  no word could be prepared")
+        else:
+            note = "" if day["planned"] else "  (already planned)"
+            print(f"  {day['date']}  {level:<12}  {day['word']}{note}")
+    
+    failed = sum(day["word"] is None for day in results)
+    if failed:
+        print(f"Warning: {failed} days have no word and will fall back to choosing one at send time. "
+              f"Run the plan again to retry them.")
+
+def run_history_export(args):
+    """Stream word history to a JSON lines file"""
+    initialize_mongodb()
+    
+    try:
+        result = export_history(args.output, backend=args.backend, resume=not args.restart, batch_size=args.batch_size)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    
+    print(f"Exported {result['records']} records to {args.output}.")
+    if result["verified"]:
+        print("Verified: record counts match.")
+    else:
+        print(f"Warning: the source now holds {result['expected']} records. It may have changed during the export.")
+
+def run_history_import(args):
+    """Stream word history from a JSON lines file into a backend"""
+    initialize_mongodb()
+    
+    try:
+        result = import_history(args.input, backend=args.backend, resume=not args.restart, batch_size=args.batch_size)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}")
+        return
+    
+    print(f"Imported {result['written']} of {result['records']} records from {args.input}.")
+    if result["skipped"]:
+        print(f"Skipped {result['skipped']} lines without a word or with a repeated word.")
+    print(f"History now holds {result['total']} words.")
+    if result["verified"]:
+        print("Verified: record counts match.")
+    else:
+        print("Warning: record counts don't match. Check the history for missing entries.")
+
+def iter_training_samples():
+    """Yield stored dictionary payloads: cached entries and MongoDB history documents"""
+    for word, entry in cache.iter_entries():
+        yield dumps(entry)
+    
+    if storage.word_collection is not None:
+        for doc in storage.word_collection.find({}, {"_id": 0, "payload": 1, "phonetics": 1, "meanings": 1}):
+            doc = storage.unpack_document(doc)
+            if doc:
+                yield dumps(doc)
+
+def run_compression_train(args):
+    """Train a new compression dictionary on stored payloads"""
+    initialize_mongodb()
+    
+    samples = list(iter_training_samples())
+    try:
+        result = compression.train_dictionary(samples, codec=args.codec, size=args.size)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    
+    sizes = compression.measure(samples, result["codec"])
+    print(f"Trained a {result['size']:,} byte {result['codec']} dictionary ({result['id']:08x}) on {len(samples)} payloads.")
+    print(f"Saved to {result['path']}. New payloads use it; older ones stay readable.")
+    print(f"Payloads: {sizes['raw']:,} bytes raw, {sizes['plain']:,} compressed alone, "
+          f"{sizes['trained']:,} with the dictionary ({sizes['raw'] / max(sizes['trained'], 1):.1f}x).")
+
+def run_suppression_add(args):
+    """Add addresses to the suppression list"""
+    result = suppression.suppress(args.addresses)
+    print(f"Added {result['added']} addresses. The suppression list holds {result['total']}.")
+
+def run_suppression_import(args):
+    """Add the addresses in a file of addresses or SES notifications to the suppression list"""
+    try:
+        result = suppression.import_suppressions(args.input)
+    except OSError as e:
+        print(f"Error: {e}")
+        return
+    print(f"Added {result['added']} addresses from {args.input}. The suppression list holds {result['total']}.")
+
+def run_suppression_poll(args):
+    """Read SES bounce and complaint notifications from SQS into the suppression list"""
+    try:
+        result = suppression.poll_ses_queue(args.queue_url, max_batches=args.max_batches)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"Read {result['messages']} notifications and added {result['added']} addresses. "
+          f"The suppression list holds {result['total']}.")
+
+def run_suppression_check(args):
+    """Show whether addresses are on the suppression list"""
+    for address in args.addresses:
+        print(f"{address}: {'suppressed' if suppression.is_suppressed(address) else 'not suppressed'}")
+
+def build_parser():
+    """Build the argument parser for the dailydose command"""
+    parser = argparse.ArgumentParser(
+        prog="dailydose",
+        description="A vocabulary learning utility that provides daily word information."
+    )
+    parser.add_argument("--metrics", choices=metrics.EXPORT_FORMATS,
+                        help="Collect stage timings and counters and write them on exit")
+    parser.add_argument("--metrics-file", help="Metrics file (default: .cache/metrics.json or .cache/metrics.prom)")
+    parser.add_argument("--profile", choices=profiling.PROFILE_MODES,
+                        help="Profile the run with cProfile or the sampling profiler")
+    parser.add_argument("--profile-output", help="Profile file (default: a timestamped file in .cache/profiles)")
+    parser.add_argument("--profile-top", type=int, default=20, help="Functions in the profile summary (default: 20)")
+    parser.add_argument("--trace-memory", action="store_true", help="Report the peak traced memory of each stage")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    digest = subparsers.add_parser("digest", help="Send a multi-word digest email")
+    digest.add_argument("--count", type=int, default=7, help="Number of words in the digest (default: 7)")
+    digest.add_argument("--new", action="store_true", help="Use new random words instead of recent history")
+    digest.add_argument("--workers", type=int, default=8, help="Concurrent dictionary lookups (default: 8)")
+    digest.add_argument("--dry-run", action="store_true", help="Build and show the digest without sending it")
+    digest.set_defaults(func=run_digest)
+    
+    difficulty = subparsers.add_parser("difficulty", help="Build the word list difficulty table")
+    difficulty.add_argument("words", nargs="*", help="Words to look up in the table")
+    difficulty.add_argument("--rebuild", action="store_true", help="Rebuild the table even if one is saved")
+    difficulty.set_defaults(func=run_difficulty)
+    
+    related = subparsers.add_parser("related", help="Show related words from the synonym/antonym graph")
+    related.add_argument("word", help="Word to start from")
+    related.add_argument("--hops", type=int, default=1, help="Largest number of steps (default: 1)")
+    related.add_argument("--relation", choices=graph.RELATIONS + ("all",), default="synonyms",
+                         help="Edges to follow (default: synonyms)")
+    related.add_argument("--rebuild", action="store_true", help="Rebuild the graph from the whole cache")
+    related.set_defaults(func=run_related)
+    
+    search_parser = subparsers.add_parser("search", help="Find words whose definitions or examples contain terms")
+    search_parser.add_argument("terms", nargs="+", help="Terms that must all appear")
+    search_parser.add_argument("--limit", type=int, default=20, help="Most words to show (default: 20)")
+    search_parser.add_argument("--rebuild", action="store_true", help="Rebuild the index from the whole cache")
+    search_parser.set_defaults(func=run_search)
+    
+    quiz_parser = subparsers.add_parser("quiz", help="Quiz yourself on the definition of a word")
+    quiz_parser.add_argument("word", nargs="?", help="Word to quiz on (default: your most recent word)")
+    quiz_parser.add_argument("--choices", type=int, default=quiz.QUIZ_CHOICES,
+                             help=f"Answers per question (default: {quiz.QUIZ_CHOICES})")
+    quiz_parser.add_argument("--count", type=int, default=1, help="Number of quizzes (default: 1)")
+    quiz_parser.add_argument("--rebuild", action="store_true", help="Rebuild the distractor index from the whole cache")
+    quiz_parser.set_defaults(func=run_quiz)
+    
+    plan = subparsers.add_parser("plan", help="Choose and prepare the words of the coming days")
+    plan.add_argument("--days", type=int, default=7, help="Number of days to plan (default: 7)")
+    plan.add_argument("--start", help="First day as YYYY-MM-DD (default: tomorrow)")
+    plan.add_argument("--level", choices=TIERS, help="Use one difficulty level instead of the weekly progression")
+    plan.add_argument("--replan", action="store_true", help="Choose new words for days that are already planned")
+    plan.set_defaults(func=run_plan)
+    
+    history = subparsers.add_parser("history", help="Export or import word history as JSON lines")
+    history_commands = history.add_subparsers(dest="history_command", required=True)
+    backend_help = "History backend: MongoDB when connected (auto), the local file, or MongoDB"
+    
+    export = history_commands.add_parser("export", help="Write word history to a JSON lines file")
+    export.add_argument("output", help="JSON lines file to write")
+    export.add_argument("--backend", choices=("auto", "file", "mongo"), default="auto", help=backend_help)
+    export.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"Records per write and checkpoint (default: {BATCH_SIZE})")
+    export.add_argument("--restart", action="store_true", help="Ignore any checkpoint and start from the beginning")
+    export.set_defaults(func=run_history_export)
+    
+    import_ = history_commands.add_parser("import", help="Load word history from a JSON lines file")
+    import_.add_argument("input", help="JSON lines file to read")
+    import_.add_argument("--backend", choices=("auto", "file", "mongo"), default="auto", help=backend_help)
+    import_.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"Records per write and checkpoint (default: {BATCH_SIZE})")
+    import_.add_argument("--restart", action="store_true", help="Ignore any checkpoint and start from the beginning")
+    import_.set_defaults(func=run_history_import)
+    
+    compression_parser = subparsers.add_parser("compression", help="Manage compression of stored dictionary payloads")
+    compression_commands = compression_parser.add_subparsers(dest="compression_command", required=True)
+    
+    train = compression_commands.add_parser("train", help="Train a dictionary on cached entries and MongoDB history")
+    train.add_argument("--codec", choices=compression.CODECS,
+                       help="Codec to train for (default: DAILYDOSE_COMPRESSION, zstd when installed)")
+    train.add_argument("--size", type=int, default=compression.DICTIONARY_SIZE,
+                       help=f"Dictionary size in bytes (default: {compression.DICTIONARY_SIZE})")
+    train.set_defaults(func=run_compression_train)
+    
+    suppression_parser = subparsers.add_parser("suppression", help="Manage addresses that must not be emailed")
+    suppression_commands = suppression_parser.add_subparsers(dest="suppression_command", required=True)
+    
+    add = suppression_commands.add_parser("add", help="Suppress addresses")
+    add.add_argument("addresses", nargs="+", help="Email addresses")
+    add.set_defaults(func=run_suppression_add)
+    
+    import_suppressions = suppression_commands.add_parser(
+        "import", help="Suppress the addresses in a file of addresses or SES notifications (JSON lines)")
+    import_suppressions.add_argument("input", help="File to read")
+    import_suppressions.set_defaults(func=run_suppression_import)
+    
+    poll = suppression_commands.add_parser("poll", help="Read SES bounce and complaint notifications from SQS")
+    poll.add_argument("--queue-url", help="SQS queue URL (default: SUPPRESSION_QUEUE_URL)")
+    poll.add_argument("--max-batches", type=int, default=100, help="Most batches of 10 messages to read (default: 100)")
+    poll.set_defaults(func=run_suppression_poll)
+    
+    check = suppression_commands.add_parser("check", help="Show whether addresses are suppressed")
+    check.add_argument("addresses", nargs="+", help="Email addresses")
+    check.set_defaults(func=run_suppression_check)
+    
+    return parser
+
+def cli(argv=None):
+    """Parse command-line arguments and run the requested command"""
+    args = build_parser().parse_args(argv)
+    
+    if args.metrics:
+        metrics.enable(args.metrics, args.metrics_file)
+    
+    def run():
+        if args.command is None:
+            main()
+        else:
+            with metrics.timer("run", command=args.command):
+                args.func(args)
+    
+    if args.profile or args.trace_memory:
+        profiling.run_profiled(run, mode=args.profile, output=args.profile_output,
+                               top=args.profile_top, trace_memory=args.trace_memory)
+    else:
+        run()
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,204 @@
+"""
+Async counterparts of the core word, storage and email functions.
+
+For embedding dailydose in an asyncio application. HTTP lookups use
+aiohttp, which is in requirements.txt; if it isn't installed they fall back
+to requests on the worker threads below, which works but ties up a thread
+per request. The blocking SDKs (pymongo, boto3) and file I/O
+always run on a bounded thread pool. Each event loop limits how many
+requests and thread pool jobs it has in flight, so thousands of
+concurrent calls wait on the loop instead of piling up sockets or
+threads.
+
+Results and errors match the sync functions, except that nothing here
+calls sys.exit(): get_random_word_async() raises instead.
+"""
+import os
+import random
+import asyncio
+import weakref
+import functools
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp
+except ImportError:  # Optional: without it, HTTP requests run on the thread pool
+    aiohttp = None
+from . import cache, metrics, morphology, storage, email_service, word_utils
+from .models import WordEntry
+from .log import get_logger
+
+# Threads for blocking calls (pymongo, boto3, files, and HTTP without aiohttp)
+ASYNC_WORKERS = int(os.environ.get("DAILYDOSE_ASYNC_WORKERS", "32"))
+# Open HTTP requests per event loop
+HTTP_CONCURRENCY = int(os.environ.get("DAILYDOSE_HTTP_CONCURRENCY", "100"))
+# Seconds before an HTTP request is abandoned
+HTTP_TIMEOUT = float(os.environ.get("DAILYDOSE_HTTP_TIMEOUT", "30"))
+
+logger = get_logger("aio")
+
+_executor = None
+
+# Per event loop: aiohttp session and the semaphores that bound in-flight work
+_loop_state = weakref.WeakKeyDictionary()
+
+class _LoopState:
+    __slots__ = ("session", "http_slots", "worker_slots")
+
+    def __init__(self):
+        self.session = None
+        self.http_slots = asyncio.Semaphore(HTTP_CONCURRENCY)
+        self.worker_slots = asyncio.Semaphore(ASYNC_WORKERS)
+
+def _state():
+    loop = asyncio.get_running_loop()
+    state = _loop_state.get(loop)
+    if state is None:
+        state = _loop_state[loop] = _LoopState()
+    return state
+
+def get_executor():
+    """Return the shared thread pool for blocking calls."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix="dailydose-aio")
+    return _executor
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking function on the shared thread pool.
+
+    At most ASYNC_WORKERS calls per event loop are handed to the pool at
+    once; the rest wait on the loop.
+    """
+    state = _state()
+    async with state.worker_slots:
+        return await asyncio.get_running_loop().run_in_executor(
+            get_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+def _get_session(state):
+    if state.session is None or state.session.closed:
+        state.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_CONCURRENCY),
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+        )
+    return state.session
+
+def _requests_get(url):
+    response = requests.get(url, timeout=HTTP_TIMEOUT)
+    return response.status_code, response.content
+
+async def http_get(url):
+    """
+    Fetch a URL without blocking the event loop.
+
+    Returns:
+        tuple: (status code, body bytes)
+    """
+    state = _state()
+    async with state.http_slots:
+        if aiohttp is None:
+            return await run_blocking(_requests_get, url)
+        async with _get_session(state).get(url) as response:
+            return response.status, await response.read()
+
+async def close():
+    """Close the current event loop's HTTP session, if one was opened."""
+    state = _loop_state.pop(asyncio.get_running_loop(), None)
+    if state is not None and state.session is not None:
+        await state.session.close()
+
+async def get_word_list_async():
+    """
+    Async get_word_list(): the common English words, skipping very short words.
+
+    Raises:
+        requests.HTTPError: If the word list can't be downloaded
+    """
+    with metrics.timer("word_fetch"):
+        status, content = await http_get(word_utils.WORD_LIST_URL)
+    if status != 200:
+        raise requests.HTTPError(f"Word list request failed with status {status}")
+    words = [word for word in content.decode('utf-8').splitlines() if len(word) >= word_utils.MIN_WORD_LENGTH]
+    await run_blocking(morphology.set_known_words, words)
+    return words
+
+async def get_random_word_async():
+    """Async get_random_word(); errors are raised rather than exiting the process."""
+    return random.choice(await get_word_list_async())
+
+async def get_word_info_async(word):
+    """Async get_word_info(): the dictionary entry for a word, or None."""
+    try:
+        with metrics.timer("dictionary_lookup"):
+            status, content = await http_get(f"{word_utils.DICTIONARY_API_URL}/{word}")
+
+        if status == 200:
+            metrics.increment("dictionary_lookups", result="found")
+            return WordEntry.from_json(content)
+        else:
+            metrics.increment("dictionary_lookups", result="not_found")
+            return None
+    except Exception as e:
+        metrics.increment("dictionary_lookups", result="error")
+        print(f"Error fetching word information: {e}")
+        return None
+
+def _cache_entry(word, word_info):
+    # Derived content is computed once and cached with the entry, as in get_cached_word_info
+    word_utils.get_derived_content(word_info)
+    cache.save_entry(word, word_info)
+
+async def get_cached_word_info_async(word):
+    """Async get_cached_word_info(): cached entry, or a lookup that is then cached."""
+    word_info = await run_blocking(cache.load_entry, word)
+    if word_info is not None and word_info.get("derived", {}).get("version") == word_utils.DERIVED_CONTENT_VERSION:
+        metrics.increment("cache_lookups", cache="dictionary", result="hit")
+        return word_info
+
+    metrics.increment("cache_lookups", cache="dictionary", result="miss")
+    word_info = word_info or await get_word_info_async(word)
+    if word_info:
+        word_info = WordEntry.coerce(word_info)
+        await run_blocking(_cache_entry, word, word_info)
+    return word_info
+
+async def get_word_infos_async(words):
+    """
+    Async get_word_infos(): look up several words concurrently.
+
+    Returns:
+        dict: Word information keyed by word, None for words that weren't found
+    """
+    unique = list(dict.fromkeys(words))
+    results = await asyncio.gather(*(get_cached_word_info_async(word) for word in unique))
+    return dict(zip(unique, results))
+
+async def save_word_history_async(word, info):
+    """Async save_word_history(): True if the word was also saved to MongoDB."""
+    return await run_blocking(storage.save_word_history, word, info)
+
+async def send_email_async(recipient_email, artifact):
+    """Async send_email(): send a prebuilt email artifact via SES or SMTP."""
+    return await run_blocking(email_service.send_email, recipient_email, artifact)
+
+async def send_word_email_async(recipient_email, word_data, artifact=None):
+    """Async send_word_email(): render (if needed) and send a word email."""
+    if artifact is None and email_service.EMAIL_ENABLED and email_service.get_transport() is not None:
+        try:
+            artifact = await run_blocking(email_service.get_email_artifact, word_data)
+        except Exception as e:
+            logger.error("email_failed", extra={"recipient": recipient_email, "error": repr(e)})
+            return False
+    return await send_email_async(recipient_email, artifact)
+
+async def send_emails_async(recipients, artifact):
+    """
+    Send one artifact to many recipients concurrently.
+
+    Returns:
+        list: True or False per recipient, in order
+    """
+    return await asyncio.gather(*(send_email_async(email, artifact) for email in recipients))
@@ -0,0 +1,155 @@
+"""
+Local cache for dictionary entries fetched from the Free Dictionary API,
+and the array directories that the indexes built from it are saved in.
+"""
+import os
+import shutil
+from urllib.parse import quote, unquote
+import numpy as np
+from dotenv import load_dotenv
+from .models import WordEntry, dumps
+from . import compression
+
+# Load environment variables from .env file if it exists
+load_dotenv()
+
+# Base directory for everything DailyDose caches locally
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.environ.get("DAILYDOSE_CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache"))
+DICTIONARY_CACHE_DIR = os.path.join(CACHE_DIR, "dictionary")
+
+# Entries are compressed (see compression.py), so their files aren't named .json;
+# .json files from before compression are still read
+ENTRY_SUFFIX = ".entry"
+LEGACY_SUFFIX = ".json"
+
+# Entries already read or written by this process
+_entries = {}
+
+def normalize_word(word):
+    """Return the form of a word that cache keys and headwords are compared in."""
+    return " ".join(word.split()).lower()
+
+def get_entry_path(word):
+    """Return the cache file path for a word."""
+    return os.path.join(DICTIONARY_CACHE_DIR, f"{quote(word, safe='')}{ENTRY_SUFFIX}")
+
+def _find_entry_path(word):
+    for path in (get_entry_path(word), get_entry_path(word)[:-len(ENTRY_SUFFIX)] + LEGACY_SUFFIX):
+        if os.path.exists(path):
+            return path
+    return None
+
+def load_entry(word):
+    """
+    Load a cached dictionary entry.
+
+    Args:
+        word (str): The word to look up
+
+    Returns:
+        WordEntry: The cached entry, or None if the word isn't cached
+    """
+    if word in _entries:
+        return _entries[word]
+
+    path = _find_entry_path(word)
+    if path is None:
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            entry = WordEntry.from_json(compression.decompress(f.read()))
+    except (OSError, ValueError, AttributeError, IndexError) as e:
+        print(f"Warning: Ignoring unreadable cache entry for '{word}': {e}")
+        return None
+
+    _entries[word] = entry
+    return entry
+
+def save_entry(word, entry):
+    """Store a dictionary entry (a WordEntry or raw dict) in the cache, trimmed and compressed."""
+    entry = WordEntry.coerce(entry)
+    _entries[word] = entry
+
+    try:
+        os.makedirs(DICTIONARY_CACHE_DIR, exist_ok=True)
+        path = get_entry_path(word)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compression.compress(dumps(entry)))
+        os.replace(tmp_path, path)
+        legacy_path = path[:-len(ENTRY_SUFFIX)] + LEGACY_SUFFIX
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+    except OSError as e:
+        print(f"Warning: Could not cache entry for '{word}': {e}")
+
+def iter_cached_words():
+    """Yield every word that has an entry in the on-disk cache."""
+    if not os.path.isdir(DICTIONARY_CACHE_DIR):
+        return
+
+    words = set()
+    for name in os.listdir(DICTIONARY_CACHE_DIR):
+        for suffix in (ENTRY_SUFFIX, LEGACY_SUFFIX):
+            if name.endswith(suffix):
+                words.add(unquote(name[:-len(suffix)]))
+    yield from sorted(words)
+
+def iter_entries():
+    """Yield (word, entry) pairs for every cached dictionary entry."""
+    for word in iter_cached_words():
+        entry = load_entry(word)
+        if entry is not None:
+            yield word, entry
+
+def clear_memory_cache():
+    """Forget entries held in memory; the on-disk cache is kept."""
+    _entries.clear()
+
+def save_arrays(arrays, path):
+    """
+    Save named arrays as a directory of .npy files, replacing the directory.
+
+    Args:
+        arrays (dict): Array per name
+        path (str): Directory to write
+    """
+    tmp_path = f"{path}.tmp"
+    old_path = f"{path}.old"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), array, allow_pickle=False)
+
+    # Swap whole directories so readers never see arrays from two builds;
+    # arrays already memory-mapped keep reading the old files
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+def load_arrays(path, names, description="index"):
+    """
+    Memory-map arrays saved by save_arrays().
+
+    Args:
+        path (str): Directory to read
+        names (iterable): Names of the arrays to load
+        description (str): What the arrays are, for the warning
+
+    Returns:
+        dict: Array per name, or None if the directory is missing or unreadable
+    """
+    if not os.path.isdir(path):
+        return None
+
+    try:
+        return {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+                for name in names}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable {description}: {e}")
+        return None
@@ -0,0 +1,279 @@
+"""
+Compression for stored dictionary payloads.
+
+Dictionary entries are small and highly repetitive JSON: the same keys,
+part-of-speech labels and URL prefixes in every entry. Compressed one at a
+time they barely shrink, but with a dictionary trained on our own entries
+they shrink several-fold. zlib with a preset dictionary built from the
+same corpus is the default, since it needs nothing beyond the standard
+library; zstd (the optional zstandard package) trains better dictionaries
+but then every host that reads the payloads needs it.
+
+A compressed payload starts with a codec byte and the 4-byte id of its
+dictionary (0 for none), so payloads stay readable after the dictionary is
+retrained: every trained dictionary is kept in the dictionary directory.
+That directory holds data, not cache: MongoDB payloads can't be read
+without it, so it lives outside .cache and belongs in backups. Anything
+starting with "{" or "[" is plain JSON and is returned as is.
+Retrain with:
+
+    python -m dailydose compression train
+"""
+import os
+import re
+import json
+import zlib
+import struct
+import hashlib
+from collections import Counter
+
+try:
+    import zstandard
+except ImportError:  # Optional: zlib with a preset dictionary is used instead
+    zstandard = None
+from . import cache
+
+CODECS = ("zstd", "zlib")
+
+# Codec for new payloads: zlib, zstd, auto (zstd if installed, else zlib) or none
+COMPRESSION = os.environ.get("DAILYDOSE_COMPRESSION", "zlib").lower()
+# Compression level, the codec's default if unset
+COMPRESSION_LEVEL = os.environ.get("DAILYDOSE_COMPRESSION_LEVEL") or None
+# Trained dictionaries, <project>/compression if unset; share it between hosts that read the same MongoDB
+DICTIONARY_DIR = os.environ.get("DAILYDOSE_COMPRESSION_DIR") or None
+# Size of a trained dictionary in bytes (zlib uses at most 32 KiB)
+DICTIONARY_SIZE = 16384
+# Fewest entries a dictionary is trained on
+MIN_SAMPLES = 20
+
+_CODEC_IDS = {"zstd": 1, "zlib": 2}
+_CODEC_NAMES = {number: name for name, number in _CODEC_IDS.items()}
+_HEADER = struct.Struct(">BI")
+_ZLIB_MAX_DICTIONARY = 32768
+
+# Strings and "key": pairs that repeat across entries, and URL prefixes
+_TOKENS = re.compile(rb'"[^"\\]{0,80}"\s*[:,\]}]?|https?://[^"]*/')
+
+# Loaded dictionaries by (codec, id), and the current id per codec
+_dictionaries = {}
+_current = None
+
+def get_codec():
+    """Return the codec for new payloads, or None when compression is off."""
+    if COMPRESSION == "none":
+        return None
+    if COMPRESSION == "zlib" or zstandard is None:
+        return "zlib"
+    return "zstd"
+
+def _level(codec):
+    if COMPRESSION_LEVEL is not None:
+        return int(COMPRESSION_LEVEL)
+    return 3 if codec == "zstd" else 6
+
+def get_dictionary_dir():
+    """Return the directory holding trained dictionaries."""
+    return DICTIONARY_DIR or os.path.join(cache.PROJECT_ROOT, "compression")
+
+def _dictionary_path(codec, dictionary_id):
+    return os.path.join(get_dictionary_dir(), f"{codec}-{dictionary_id:08x}.dict")
+
+def _current_path():
+    return os.path.join(get_dictionary_dir(), "current.json")
+
+def get_current_ids():
+    """Return the id of the current dictionary per codec, e.g. {"zlib": 305419896}."""
+    global _current
+    if _current is None:
+        try:
+            with open(_current_path()) as f:
+                _current = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            _current = {}
+    return _current
+
+def load_dictionary(codec, dictionary_id):
+    """
+    Return a trained dictionary's bytes.
+
+    Raises:
+        ValueError: If the dictionary isn't in the dictionary directory
+    """
+    key = (codec, dictionary_id)
+    if key not in _dictionaries:
+        try:
+            with open(_dictionary_path(codec, dictionary_id), "rb") as f:
+                _dictionaries[key] = f.read()
+        except OSError:
+            raise ValueError(f"Missing {codec} compression dictionary {dictionary_id:08x} in {get_dictionary_dir()}")
+    return _dictionaries[key]
+
+def reload():
+    """Forget loaded dictionaries, e.g. after training a new one."""
+    global _current
+    _dictionaries.clear()
+    _current = None
+
+def compress(data, codec=None, dictionary_id=None):
+    """
+    Compress JSON bytes with the current dictionary.
+
+    Args:
+        data (bytes): Payload to compress
+        codec (str): "zstd" or "zlib", the configured codec if omitted
+        dictionary_id (int): Dictionary to use instead of the current one, 0 for none
+
+    Returns:
+        bytes: The compressed payload, or data unchanged when compression is off
+    """
+    codec = codec or get_codec()
+    if codec is None:
+        return data
+
+    if dictionary_id is None:
+        dictionary_id = get_current_ids().get(codec, 0)
+    dictionary = load_dictionary(codec, dictionary_id) if dictionary_id else None
+    header = _HEADER.pack(_CODEC_IDS[codec], dictionary_id)
+
+    if codec == "zstd":
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return header + zstandard.ZstdCompressor(level=_level(codec), dict_data=dict_data).compress(data)
+
+    compressor = zlib.compressobj(_level(codec), zlib.DEFLATED, -15, zdict=dictionary or b"")
+    return header + compressor.compress(data) + compressor.flush()
+
+def decompress(payload):
+    """
+    Return the JSON bytes of a payload written by compress(), or plain JSON as is.
+
+    Raises:
+        ValueError: If the payload is damaged or its codec or dictionary is unavailable
+    """
+    payload = bytes(payload)
+    if payload[:1] in (b"{", b"["):
+        return payload
+    if len(payload) < _HEADER.size or payload[0] not in _CODEC_NAMES:
+        raise ValueError("Unknown payload format")
+
+    codec_id, dictionary_id = _HEADER.unpack_from(payload)
+    codec = _CODEC_NAMES[codec_id]
+    dictionary = load_dictionary(codec, dictionary_id) if dictionary_id else None
+    body = payload[_HEADER.size:]
+
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("Payload is zstd-compressed. Install the zstandard package to read it.")
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        try:
+            return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(body)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Damaged zstd payload: {e}")
+
+    try:
+        decompressor = zlib.decompressobj(-15, zdict=dictionary or b"")
+        return decompressor.decompress(body) + decompressor.flush()
+    except zlib.error as e:
+        raise ValueError(f"Damaged zlib payload: {e}")
+
+def build_zlib_dictionary(samples, size=DICTIONARY_SIZE):
+    """
+    Build a zlib preset dictionary from sample payloads.
+
+    zlib can't train a dictionary, so this one is put together from the
+    corpus: first the strings that appear in the most samples (weighted by
+    length), then whole samples that consist mostly of such strings, which
+    also cover the structure between them. Deflate finds the end of the
+    dictionary at the shortest distance, so the most valuable parts go last.
+    """
+    size = min(size, _ZLIB_MAX_DICTIONARY)
+    counts = Counter()
+    for sample in samples:
+        counts.update(set(_TOKENS.findall(sample)))
+    common = {token: count for token, count in counts.items() if count > 1}
+
+    tokens = []
+    total = 0
+    for token in sorted(common, key=lambda token: common[token] * len(token), reverse=True):
+        if total + len(token) <= size // 4:
+            tokens.append(token)
+            total += len(token)
+
+    def typicality(sample):
+        return sum(common.get(token, 0) for token in set(_TOKENS.findall(sample))) / len(sample)
+
+    examples = []
+    for sample in sorted(samples, key=typicality, reverse=True):
+        if total + len(sample) <= size:
+            examples.append(sample)
+            total += len(sample)
+
+    return b"".join(reversed(tokens)) + b"".join(reversed(examples))
+
+def train_dictionary(samples, codec=None, size=DICTIONARY_SIZE):
+    """
+    Train a dictionary on sample payloads and make it current.
+
+    Earlier dictionaries are kept, so payloads compressed with them stay readable.
+
+    Args:
+        samples (list): JSON bytes of stored entries
+        codec (str): "zstd" or "zlib", the configured codec if omitted
+        size (int): Dictionary size in bytes
+
+    Returns:
+        dict: "codec", "id", "path" and "size" of the new dictionary
+
+    Raises:
+        ValueError: If there are too few samples or the codec is unavailable
+    """
+    codec = codec or get_codec() or "zlib"
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec: {codec}")
+    if codec == "zstd" and zstandard is None:
+        raise ValueError("zstd needs the zstandard package (pip install zstandard).")
+    if len(samples) < MIN_SAMPLES:
+        raise ValueError(f"Need at least {MIN_SAMPLES} stored entries to train on, found {len(samples)}.")
+
+    if codec == "zstd":
+        try:
+            trained = zstandard.train_dictionary(size, samples)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Could not train a zstd dictionary: {e}")
+        dictionary, dictionary_id = trained.as_bytes(), trained.dict_id()
+    else:
+        dictionary = build_zlib_dictionary(samples, size)
+        dictionary_id = int.from_bytes(hashlib.sha256(dictionary).digest()[:4], "big") or 1
+
+    os.makedirs(get_dictionary_dir(), exist_ok=True)
+    path = _dictionary_path(codec, dictionary_id)
+    with open(path, "wb") as f:
+        f.write(dictionary)
+
+    current = dict(get_current_ids(), **{codec: dictionary_id})
+    tmp_path = f"{_current_path()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(current, f)
+    os.replace(tmp_path, _current_path())
+    reload()
+
+    return {"codec": codec, "id": dictionary_id, "path": path, "size": len(dictionary)}
+
+def measure(samples, codec=None):
+    """
+    Compare the total size of samples raw, compressed alone, and compressed with the current dictionary.
+
+    Returns:
+        dict: "raw", "plain" (no dictionary) and "trained" byte totals
+    """
+    codec = codec or get_codec() or "zlib"
+    return {
+        "raw": sum(len(sample) for sample in samples),
+        "plain": sum(len(compress(sample, codec, dictionary_id=0)) for sample in samples),
+        "trained": sum(len(compress(sample, codec)) for sample in samples)
+    }
+
+if COMPRESSION not in ("auto", "none") + CODECS:
+    print(f"Warning: Ignoring unknown DAILYDOSE_COMPRESSION '{COMPRESSION}' (use zlib, zstd, auto or none).")
+    COMPRESSION = "zlib"
+elif COMPRESSION == "zstd" and zstandard is None:
+    print("Warning: DAILYDOSE_COMPRESSION=zstd needs the zstandard package. Using zlib instead.")
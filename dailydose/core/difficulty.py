@@ -0,0 +1,252 @@
+"""
+Batch difficulty scoring for the whole word list.
+
+Every word is described by a handful of numeric features that are computed
+for the entire list at once with NumPy. The resulting table is saved to
+disk, so difficulty-based selection is an array lookup rather than a
+per-word calculation. The tiers in the table are the difficulty levels
+shown and emailed for these words too (see
+word_utils.get_learning_difficulty), so a word chosen for a level is
+labelled with that level.
+"""
+import os
+import hashlib
+import numpy as np
+from .cache import CACHE_DIR
+from .morphology import count_morphemes
+from . import word_utils
+
+DIFFICULTY_TABLE_FILE = os.path.join(CACHE_DIR, "difficulty.npz")
+
+# Tier names, indexed by the tier numbers stored in the table
+TIERS = ("Basic", "Intermediate", "Advanced")
+
+# Score quantiles separating Basic/Intermediate and Intermediate/Advanced
+TIER_QUANTILES = (0.4, 0.8)
+
+# Feature columns and how much each contributes to the score
+FEATURES = ("length", "syllables", "frequency_rank", "affixes", "bigram_rarity")
+FEATURE_WEIGHTS = np.array([1.0, 0.8, 1.2, 0.4, 0.6])
+
+# (path, table) of the saved table read for per-word lookups
+_saved = None
+
+# Letter codes: 0 pads short words, 1-26 are a-z and 27 is anything else
+_ALPHABET_SIZE = 28
+_VOWEL_CODES = np.array([1, 5, 9, 15, 21, 25])  # a, e, i, o, u, y
+_E_CODE = 5
+_L_CODE = 12
+
+def encode_words(words):
+    """
+    Encode words as a padded matrix of letter codes.
+
+    Args:
+        words (list): Words to encode
+
+    Returns:
+        tuple: (codes, lengths) where codes is an (n, max_length) uint8 array
+    """
+    lengths = np.fromiter((len(word) for word in words), dtype=np.int32, count=len(words))
+    width = int(lengths.max()) if len(words) else 0
+
+    padded = "".join(word.lower().ljust(width, "\0") for word in words)
+    raw = np.frombuffer(padded.encode("ascii", "replace"), dtype=np.uint8).reshape(len(words), width)
+
+    codes = np.where((raw >= ord("a")) & (raw <= ord("z")), raw - ord("a") + 1, 27).astype(np.uint8)
+    codes[raw == 0] = 0
+    return codes, lengths
+
+def estimate_syllables(codes, lengths):
+    """Estimate syllable counts by counting runs of vowels, ignoring a silent final 'e'."""
+    is_vowel = np.isin(codes, _VOWEL_CODES)
+    starts = is_vowel.copy()
+    starts[:, 1:] &= ~is_vowel[:, :-1]
+    syllables = starts.sum(axis=1)
+
+    rows = np.arange(len(lengths))
+    last = codes[rows, np.maximum(lengths - 1, 0)]
+    before_last = codes[rows, np.maximum(lengths - 2, 0)]
+    silent_e = (last == _E_CODE) & (before_last != _L_CODE) & (syllables > 1)
+
+    return np.maximum(syllables - silent_e, 1)
+
+def bigram_rarity(codes):
+    """
+    Score how unusual each word's letter pairs are within the word list.
+
+    Returns:
+        np.ndarray: Mean negative log frequency of each word's letter bigrams
+    """
+    if codes.shape[1] < 2:
+        return np.zeros(len(codes))
+
+    bigrams = codes[:, :-1].astype(np.int32) * _ALPHABET_SIZE + codes[:, 1:]
+    valid = (codes[:, :-1] > 0) & (codes[:, 1:] > 0)
+
+    counts = np.bincount(bigrams[valid], minlength=_ALPHABET_SIZE * _ALPHABET_SIZE)
+    surprisal = -np.log((counts + 1) / (counts.sum() + len(counts)))
+
+    per_word = np.where(valid, surprisal[bigrams], 0.0).sum(axis=1)
+    return per_word / np.maximum(valid.sum(axis=1), 1)
+
+def compute_features(words):
+    """
+    Compute the feature matrix for a frequency-ordered word list.
+
+    Args:
+        words (list): Words, most frequent first
+
+    Returns:
+        np.ndarray: (n, len(FEATURES)) float array
+    """
+    codes, lengths = encode_words(words)
+    frequency_rank = np.arange(len(words)) / max(len(words) - 1, 1)
+    affixes = np.fromiter((count_morphemes(word) for word in words), dtype=np.float64, count=len(words))
+
+    return np.column_stack([
+        lengths,
+        estimate_syllables(codes, lengths),
+        frequency_rank,
+        affixes,
+        bigram_rarity(codes)
+    ]).astype(np.float64)
+
+def score_features(features):
+    """Combine standardized features into a single difficulty score per word."""
+    if not len(features):
+        return np.zeros(0)
+    std = features.std(axis=0)
+    standardized = (features - features.mean(axis=0)) / np.where(std > 0, std, 1)
+    return standardized @ FEATURE_WEIGHTS
+
+def hash_word_list(words):
+    """Return a hash of a word list, to tell whether a saved table was built from it."""
+    return hashlib.sha1("\n".join(words).encode("utf-8")).hexdigest()
+
+def build_difficulty_table(words):
+    """
+    Score every word in a frequency-ordered word list.
+
+    Args:
+        words (list): Words, most frequent first
+
+    Returns:
+        dict: "words", "features", "scores", "tiers" and "order" arrays; order
+            sorts words alphabetically for lookups. "words_hash" holds
+            hash_word_list(words)
+    """
+    features = compute_features(words)
+    scores = score_features(features)
+    thresholds = np.quantile(scores, TIER_QUANTILES) if len(words) else np.zeros(2)
+
+    words = np.array(words)
+    return {
+        "words": words,
+        "features": features,
+        "scores": scores,
+        "tiers": np.searchsorted(thresholds, scores, side="right").astype(np.int8),
+        "order": np.argsort(words, kind="stable"),
+        "words_hash": np.array(hash_word_list(words.tolist()))
+    }
+
+def save_difficulty_table(table, path=None):
+    """Save a difficulty table to disk."""
+    path = path or DIFFICULTY_TABLE_FILE
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # savez_compressed adds .npz unless the name already ends with it
+    np.savez_compressed(path, **table)
+    _remember(path, table)
+
+def _remember(path, table):
+    global _saved
+    _saved = (path, table)
+
+def get_saved_table():
+    """Return the saved difficulty table, read once per process, or None if there isn't one; never builds one."""
+    path = DIFFICULTY_TABLE_FILE
+    if _saved is None or _saved[0] != path or _saved[1] is None and os.path.exists(path):
+        _remember(path, load_difficulty_table(path))
+    return _saved[1]
+
+def lookup_tier(word):
+    """Return the tier name of one word in the saved table, or None if it isn't there."""
+    table = get_saved_table()
+    if table is None:
+        return None
+    return lookup_tiers(table, [word])[0]
+
+def load_difficulty_table(path=None):
+    """Load a saved difficulty table, or return None if there isn't one."""
+    path = path or DIFFICULTY_TABLE_FILE
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable difficulty table: {e}")
+        return None
+
+def get_difficulty_table(words=None, rebuild=False):
+    """
+    Return the saved difficulty table, building and saving it when needed.
+
+    Args:
+        words (list): Frequency-ordered word list to build from, fetched
+            with get_word_list() if omitted. A saved table built from a
+            different list is rebuilt
+        rebuild (bool): Rebuild even if a saved table exists
+
+    Returns:
+        dict: The difficulty table
+    """
+    table = None if rebuild else load_difficulty_table()
+    if table is not None and words is not None and str(table.get("words_hash", "")) != hash_word_list(words):
+        table = None
+    if table is None:
+        if words is None:
+            words = word_utils.get_word_list()
+        table = build_difficulty_table(words)
+        save_difficulty_table(table)
+    return table
+
+def lookup_indices(table, words):
+    """
+    Find the table rows of several words at once.
+
+    Returns:
+        np.ndarray: Row index per word, -1 for words not in the table
+    """
+    # Compare at the lookup words' own width; forcing the table's narrower
+    # string dtype would cut "bananarama" down to "banana"
+    words = np.asarray(words, dtype=str)
+    if not len(table["words"]):
+        return np.full(len(words), -1, dtype=np.int64)
+
+    sorted_words = table["words"][table["order"]]
+    positions = np.searchsorted(sorted_words, words)
+    positions = np.minimum(positions, len(sorted_words) - 1)
+    found = sorted_words[positions] == words
+    return np.where(found, table["order"][positions], -1)
+
+def lookup_tiers(table, words):
+    """
+    Get the difficulty tier names for several words at once.
+
+    Returns:
+        list: Tier name per word, None for words not in the table
+    """
+    indices = lookup_indices(table, words)
+    return [TIERS[table["tiers"][i]] if i >= 0 else None for i in indices]
+
+def tier_mask(table, tier):
+    """Return a boolean mask selecting the words of one tier (name or number)."""
+    if isinstance(tier, str):
+        tier = TIERS.index(tier)
+    return table["tiers"] == tier
+
+def words_in_tier(table, tier):
+    """Return all words of one difficulty tier."""
+    return table["words"][tier_mask(table, tier)]
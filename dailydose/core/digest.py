@@ -0,0 +1,167 @@
+"""
+Multi-word digest emails for subscribers who prefer weekly mail.
+"""
+import time
+from .word_utils import get_word_infos, get_derived_content
+from .storage import get_recent_words
+from .sampling import WORD_LEVEL, WordPicker
+from .pipeline import enrich, persist
+from .email_service import get_digest_artifact, get_digest_subscribers, send_email
+from .log import get_logger
+
+logger = get_logger("digest")
+
+def get_digest_words(count, new_words=False):
+    """
+    Choose the words for a digest.
+
+    New words are picked like the weighted daily word, so seen and
+    blocklisted words are avoided.
+
+    Args:
+        count (int): Number of words
+        new_words (bool): Pick new words instead of the most recent history
+
+    Returns:
+        list: Words to include
+    """
+    if not new_words:
+        return get_recent_words(count)
+
+    picker = WordPicker(level=WORD_LEVEL)
+    words = []
+    for _ in range(count):
+        word = picker.pick(skip=words)
+        # Only the uniform fallback repeats a word, once every word is ruled out
+        if word in words:
+            break
+        words.append(word)
+    return words
+
+def build_digest(word_infos):
+    """
+    Build digest entries for a batch of words.
+
+    Args:
+        word_infos (list): Word data dictionaries from the dictionary API
+
+    Returns:
+        list: One entry per word with its first definition, difficulty,
+            related words and usage examples
+    """
+    entries = []
+    for word_data in word_infos:
+        word = word_data.get("word", "")
+        meanings = word_data.get("meanings", [])
+        derived = get_derived_content(word_data)
+
+        # Lead with the first definition of the first part of speech
+        part_of_speech = ""
+        definition = ""
+        for meaning in meanings:
+            if meaning.get("definitions"):
+                part_of_speech = meaning.get("partOfSpeech", "")
+                definition = meaning["definitions"][0].get("definition", "")
+                break
+
+        phonetic = next((p["text"] for p in word_data.get("phonetics", []) if p.get("text")), "")
+
+        entries.append({
+            "word": word,
+            "phonetic": phonetic,
+            "difficulty": derived["difficulty"],
+            "part_of_speech": part_of_speech,
+            "definition": definition,
+            "synonyms": derived["synonyms"],
+            "antonyms": derived["antonyms"],
+            "examples": derived["examples"]
+        })
+
+    return entries
+
+def prepare_digest(count, new_words=False, max_workers=8, record=True):
+    """
+    Choose, fetch and enrich all words for a digest in one batch.
+
+    New words are saved to history and marked as seen, like the daily word,
+    unless record is False.
+
+    Args:
+        count (int): Number of words
+        new_words (bool): Pick new words instead of the most recent history
+        max_workers (int): Maximum number of concurrent dictionary lookups
+        record (bool): Whether to record new words in history
+
+    Returns:
+        list: Digest entries, in the order the words were chosen
+    """
+    words = get_digest_words(count, new_words)
+    word_infos = get_word_infos(words, max_workers=max_workers)
+
+    missing = [word for word in words if not word_infos.get(word)]
+    if missing:
+        print(f"Couldn't find information for: {', '.join(missing)}. Leaving them out of the digest.")
+
+    found = [word_infos[word] for word in words if word_infos.get(word)]
+    entries = build_digest(found)
+    if new_words and record:
+        for word_data in found:
+            persist(enrich(word_data))
+    return entries
+
+def send_digest(entries, subscribers=None):
+    """
+    Send one digest email to each digest subscriber.
+
+    Args:
+        entries (list): Digest entries from prepare_digest()
+        subscribers (list): Recipients, the digest subscribers if omitted
+
+    Returns:
+        int: Number of emails sent successfully
+    """
+    if subscribers is None:
+        subscribers = get_digest_subscribers()
+    if not subscribers:
+        print("No digest subscribers found. Skipping email sending.")
+        return 0
+    if not entries:
+        print("The digest is empty. Skipping email sending.")
+        return 0
+
+    print(f"Sending digest of {len(entries)} words to {len(subscribers)} subscribers...")
+
+    # Render once; every subscriber gets the same stored artifact
+    artifact = get_digest_artifact(entries)
+
+    # Per-recipient results are logged by send_email
+    started = time.perf_counter()
+    sent = 0
+    for email in subscribers:
+        if send_email(email, artifact):
+            sent += 1
+
+    logger.info("digest_summary", extra={
+        "words": len(entries), "sent": sent, "failed": len(subscribers) - sent,
+        "seconds": round(time.perf_counter() - started, 3)
+    })
+    print(f"Digest sent to {sent} of {len(subscribers)} subscribers ({len(subscribers) - sent} failed).")
+    return sent
+
+def display_digest(entries):
+    """Print a digest to the console."""
+    print("\n" + "="*70)
+    print(f"📚 WORD DIGEST: {len(entries)} WORDS 📚".center(70))
+    print("="*70)
+
+    for i, entry in enumerate(entries, 1):
+        print(f"\n{i}. {entry['word'].upper()} [{entry['part_of_speech']}] - {entry['difficulty']}")
+        if entry["phonetic"]:
+            print(f"   🔊 {entry['phonetic']}")
+        print(f"   📖 {entry['definition']}")
+        if entry["synonyms"]:
+            print(f"   🔤 Synonyms: {', '.join(entry['synonyms'])}")
+        if entry["examples"]:
+            print(f"   💬 \"{entry['examples'][0]}\"")
+
+    print("\n" + "="*70 + "\n")
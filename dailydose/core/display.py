@@ -1,30 +1,42 @@
 """
 Display operations for word data.
 """
-from .word_utils import (
-    get_learning_difficulty,
-    get_etymology,
-    get_memory_tip,
-    get_related_words,
-    get_usage_examples
-)
-from .storage import save_word_history
-from .email_service import send_word_email, get_subscribers, EMAIL_ENABLED
+from .word_utils import get_derived_content
+from .email_service import EMAIL_ENABLED
+from .pipeline import enrich, deliver
 
 def display_word_info(word_data):
-    """Display information about the word in a nicely formatted way"""
+    """Display information about the word, then save it and email it to subscribers"""
     if not word_data:
         print("Sorry, couldn't find information for this word.")
         return
     
-    word = word_data.get("word", "")
-    meanings = word_data.get("meanings", [])
+    # Difficulty, related words, examples and tips, computed once for display, storage and email
+    enrich(word_data)
+    print_word_card(word_data)
     
-    # Save this word to history
-    db_status = save_word_history(word, word_data)
+    # Save the word and send the emails at the same time
+    db_status, emails = deliver(word_data, send=EMAIL_ENABLED)
+    
+    storage_msg = "Word saved to MongoDB and local file storage." if db_status else "Word saved to local file storage."
+    print(f"{storage_msg}".center(70))
+    print("="*70 + "\n")
     
-    # Add difficulty to word_data for email template
-    word_data["difficulty"] = get_learning_difficulty(word)
+    # Email functionality information
+    print(f"Email functionality is {'ENABLED' if EMAIL_ENABLED else 'DISABLED'}.")
+    if not EMAIL_ENABLED:
+        print("To enable email functionality, set EMAIL_ENABLED=true in your .env file.")
+        print("You will also need to configure AWS credentials.")
+    elif not emails["subscribers"]:
+        print("No subscribers found. Skipping email sending.")
+    else:
+        print(f"Emails sent to {emails['sent']} of {emails['subscribers']} subscribers ({emails['failed']} failed).")
+
+def print_word_card(word_data):
+    """Print a word's dictionary entry and derived content in a nicely formatted way"""
+    word = word_data.get("word", "")
+    meanings = word_data.get("meanings", [])
+    derived = get_derived_content(word_data)
     
     print("\n" + "="*70)
     print(f"📚 DAILY WORD: {word.upper()} 📚".center(70))
@@ -41,11 +53,10 @@ def display_word_info(word_data):
                 break
     
     # Word difficulty
-    difficulty = get_learning_difficulty(word)
-    print(f"\n📊 DIFFICULTY LEVEL: {difficulty}")
+    print(f"\n📊 DIFFICULTY LEVEL: {derived['difficulty']}")
     
     # Etymology
-    print(f"\n🔍 ETYMOLOGY: {get_etymology(word)}")
+    print(f"\n🔍 ETYMOLOGY: {derived['etymology']}")
     
     # Meanings
     if meanings:
@@ -65,7 +76,7 @@ def display_word_info(word_data):
                     print(f"       Example: \"{definition['example']}\"")
     
     # Get synonyms and antonyms
-    synonyms, antonyms = get_related_words(meanings)
+    synonyms, antonyms = derived["synonyms"], derived["antonyms"]
     
     # Display synonyms
     if synonyms:
@@ -76,46 +87,16 @@ def display_word_info(word_data):
         print(f"\n🔄 ANTONYMS: {', '.join(antonyms)}")
     
     # Usage examples
-    examples = get_usage_examples(word, meanings)
+    examples = derived["examples"]
     if examples:
         print("\n💬 USAGE EXAMPLES:")
         for i, example in enumerate(examples, 1):
             print(f"  {i}. \"{example}\"")
     
     # Learning tips
-    print(f"\n💡 MEMORY TIP: {get_memory_tip(word)}")
+    print(f"\n💡 MEMORY TIP: {derived['memory_tip']}")
     
     # Practice prompt
     print("\n✏️ PRACTICE: Try to use this word in a sentence of your own!")
     
     print("\n" + "="*70)
-    storage_msg = "Word saved to MongoDB and local file storage." if db_status else "Word saved to local file storage."
-    print(f"{storage_msg}".center(70))
-    print("="*70 + "\n")
-    
-    # Email functionality information
-    print(f"Email functionality is {'ENABLED' if EMAIL_ENABLED else 'DISABLED'}.")
-    
-    # Send email to subscribers if enabled
-    if EMAIL_ENABLED:
-        send_emails_to_subscribers(word_data)
-    else:
-        print("To enable email functionality, set EMAIL_ENABLED=true in your .env file.")
-        print("You will also need to configure AWS credentials.")
-
-def send_emails_to_subscribers(word_data):
-    """Send emails to all subscribers with the word information"""
-    subscribers = get_subscribers()
-    if not subscribers:
-        print("No subscribers found. Skipping email sending.")
-        return
-    
-    print(f"Sending emails to {len(subscribers)} subscribers...")
-    
-    # Send an email to each subscriber
-    for email in subscribers:
-        success = send_word_email(email, word_data)
-        if success:
-            print(f"Email sent successfully to {email}")
-        else:
-            print(f"Failed to send email to {email}") 
\ No newline at end of file
@@ -1,11 +1,25 @@
 """
-Email services for sending daily word emails using AWS SES.
+Email services for sending daily word emails using AWS SES or SMTP.
 """
 import os
+import json
+import time
+import hashlib
+import threading
+import atexit
+import datetime
+from collections import OrderedDict
 import boto3
 from botocore.exceptions import ClientError
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, TemplateNotFound, select_autoescape
 from dotenv import load_dotenv
+from .html_utils import minify_html, dedupe_styles, html_to_text
+from .cache import PROJECT_ROOT, CACHE_DIR
+from .word_utils import get_derived_content
+from . import metrics, suppression
+from .models import dumps
+from .transports import SESTransport, SMTPTransport, TransportError
+from .log import get_logger, EventSampler
 
 # Load environment variables
 load_dotenv()
@@ -16,14 +30,52 @@ AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
 EMAIL_SENDER = os.environ.get("EMAIL_SENDER", "noreply@example.com")
 EMAIL_ENABLED = os.environ.get("EMAIL_ENABLED", "false").lower() == "true"
+# Custom SES endpoint, e.g. a local stand-in for benchmarks (AWS default if unset)
+AWS_SES_ENDPOINT_URL = os.environ.get("AWS_SES_ENDPOINT_URL") or None
+
+# How emails are sent: "ses" (default) or "smtp"
+EMAIL_TRANSPORT = os.environ.get("EMAIL_TRANSPORT", "ses").lower()
+
+# SMTP Configuration
+SMTP_HOST = os.environ.get("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
+SMTP_USERNAME = os.environ.get("SMTP_USERNAME") or None
+SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD") or None
+# starttls, ssl (implicit TLS, usually port 465) or none
+SMTP_SECURITY = os.environ.get("SMTP_SECURITY", "starttls").lower()
+# Connections kept open at once, and messages sent on each before it is replaced
+SMTP_POOL_SIZE = int(os.environ.get("SMTP_POOL_SIZE", "4"))
+SMTP_MAX_MESSAGES = int(os.environ.get("SMTP_MAX_MESSAGES", "100"))
+SMTP_TIMEOUT = float(os.environ.get("SMTP_TIMEOUT", "30"))
+
+# Template locations and caching
+TEMPLATE_DIR = os.path.join(PROJECT_ROOT, "templates")
+TEMPLATE_CACHE_DIR = os.path.join(CACHE_DIR, "templates")
+# Seconds between checks for edited template files
+TEMPLATE_CHECK_INTERVAL = float(os.environ.get("TEMPLATE_CHECK_INTERVAL", "60"))
+
+# Finished email bodies, stored per send date
+ARTIFACT_DIR = os.path.join(CACHE_DIR, "artifacts")
+# Most recently used artifacts kept in memory; a long-running daemon would otherwise keep every one
+ARTIFACT_CACHE_SIZE = 64
+# Move inline styles repeated this many times into a <style> block (0 disables)
+EMAIL_HOIST_STYLES = int(os.environ.get("EMAIL_HOIST_STYLES", "0"))
+
+if EMAIL_TRANSPORT not in ("ses", "smtp"):
+    print(f"Warning: Ignoring unknown EMAIL_TRANSPORT '{EMAIL_TRANSPORT}' (use ses or smtp).")
+    EMAIL_TRANSPORT = "ses"
+if SMTP_SECURITY not in ("starttls", "ssl", "none"):
+    print(f"Warning: Ignoring unknown SMTP_SECURITY '{SMTP_SECURITY}' (use starttls, ssl or none).")
+    SMTP_SECURITY = "starttls"
 
 # Initialize SES client if credentials are available
 ses_client = None
-if EMAIL_ENABLED and AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
+if EMAIL_ENABLED and EMAIL_TRANSPORT == "ses" and AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
     try:
         ses_client = boto3.client(
             'ses',
             region_name=AWS_REGION,
+            endpoint_url=AWS_SES_ENDPOINT_URL,
             aws_access_key_id=AWS_ACCESS_KEY_ID,
             aws_secret_access_key=AWS_SECRET_ACCESS_KEY
         )
@@ -31,105 +83,394 @@ if EMAIL_ENABLED and AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
         print(f"Error initializing AWS SES client: {e}")
         EMAIL_ENABLED = False
 
+# SMTP connection pool, opened on first send (see get_transport)
+_smtp_transport = None
+_smtp_lock = threading.Lock()
+
+# Shared Jinja2 environment and throttled template lookups (see get_template)
+_template_env = None
+_template_cache = {}
+_artifact_cache = OrderedDict()
+_artifact_lock = threading.Lock()
+
+logger = get_logger("email")
+# Per-recipient "email_sent" events are sampled; failures are always logged
+_sent_sampler = EventSampler()
+
 def initialize_templates():
-    """Initialize the Jinja2 template environment."""
-    # Path to templates folder
-    template_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates")
+    """
+    Initialize the Jinja2 template environment.
     
+    The environment compiles templates to bytecode once and keeps it in
+    TEMPLATE_CACHE_DIR, so a fresh process can skip parsing the HTML source.
+    Use get_template_env() to share one environment per process.
+    """
     # Create template directory if it doesn't exist
-    if not os.path.exists(template_dir):
-        os.makedirs(template_dir)
+    if not os.path.exists(TEMPLATE_DIR):
+        os.makedirs(TEMPLATE_DIR)
+    
+    # Persist compiled templates between runs when the cache directory is writable
+    try:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+    except OSError as e:
+        print(f"Warning: Template bytecode cache disabled: {e}")
+        bytecode_cache = None
     
     # Initialize Jinja2 environment
     return Environment(
-        loader=FileSystemLoader(template_dir),
-        autoescape=select_autoescape(['html', 'xml'])
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(['html', 'xml']),
+        bytecode_cache=bytecode_cache,
+        auto_reload=True
     )
 
-# Initialize Jinja2 environment
-template_env = initialize_templates()
+def __getattr__(name):
+    # template_env used to be created at import time; it is now an alias of
+    # the lazily created shared environment
+    if name == "template_env":
+        return get_template_env()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def get_template_env():
+    """Return the process-wide Jinja2 environment, creating it on first use."""
+    global _template_env
+    if _template_env is None:
+        _template_env = initialize_templates()
+    return _template_env
 
-def send_word_email(recipient_email, word_data):
+def get_template(name):
     """
-    Send an email with word information to the specified recipient.
+    Load a template from the shared environment.
+    
+    Jinja2 checks the template file's mtime on every lookup when auto_reload is
+    on; here that check runs at most once per TEMPLATE_CHECK_INTERVAL seconds
+    and the compiled template is reused in between.
     
     Args:
-        recipient_email (str): Email address to send to
-        word_data (dict): Word data to include in the email
+        name (str): Template file name inside TEMPLATE_DIR
         
     Returns:
-        bool: True if email was sent successfully, False otherwise
+        jinja2.Template: The compiled template
     """
-    if not EMAIL_ENABLED or not ses_client:
-        print("Email sending is disabled or not configured.")
-        return False
+    now = time.monotonic()
+    cached = _template_cache.get(name)
+    if cached and now - cached[1] < TEMPLATE_CHECK_INTERVAL:
+        metrics.increment("cache_lookups", cache="template", result="hit")
+        return cached[0]
+    
+    metrics.increment("cache_lookups", cache="template", result="miss")
+    template = get_template_env().get_template(name)
+    _template_cache[name] = (template, now)
+    return template
+
+def invalidate_templates():
+    """Force the next get_template() call to re-check templates on disk."""
+    _template_cache.clear()
+
+@metrics.timed("template_render", template="word_email")
+def render_word_email(word_data):
+    """
+    Render the HTML email for a word from the word_email.html template.
     
+    Args:
+        word_data (dict): Word data to include in the email
+        
+    Returns:
+        str: Rendered HTML, before any post-processing
+    """
+    # Load the template, creating the default one if it's missing
     try:
-        # Check if the template exists, if not, create it
-        template_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                    "templates", "word_email.html")
+        template = get_template("word_email.html")
+    except TemplateNotFound:
+        print("Email template not found. Creating default template...")
+        create_default_template()
+        template = get_template("word_email.html")
+    
+    derived = get_derived_content(word_data)
+    
+    return template.render(
+        word=word_data.get("word", ""),
+        phonetics=word_data.get("phonetics", []),
+        meanings=word_data.get("meanings", []),
+        difficulty=derived["difficulty"],
+        memory_tip=derived["memory_tip"],
+        etymology_url=derived["etymology_url"]
+    )
+
+def finish_email_artifact(word, subject, html_body):
+    """
+    Post-process rendered HTML into the final, send-ready email content.
+    
+    The HTML is minified and its inline styles deduplicated, and a plain-text
+    alternative is derived from it.
+    
+    Args:
+        word (str): Word (or artifact name) the email is about
+        subject (str): Email subject line
+        html_body (str): Rendered HTML
+        
+    Returns:
+        dict: Artifact with "word", "subject", "html" and "text" keys
+    """
+    html_body = dedupe_styles(minify_html(html_body), hoist_min_count=EMAIL_HOIST_STYLES)
+    
+    return {
+        "word": word,
+        "subject": subject,
+        "html": html_body,
+        "text": html_to_text(html_body)
+    }
+
+def build_email_artifact(word_data, html_body=None):
+    """
+    Build the final, send-ready email content for a word.
+    
+    Args:
+        word_data (dict): Word data to include in the email
+        html_body (str): Already rendered HTML to post-process, rendered from
+            word_email.html if omitted
         
-        if not os.path.exists(template_path):
-            print("Email template not found. Creating default template...")
-            create_default_template()
-        else:
-            print("Using existing email template.")
+    Returns:
+        dict: Artifact with "word", "subject", "html" and "text" keys
+    """
+    if html_body is None:
+        html_body = render_word_email(word_data)
+    
+    word = word_data.get("word", "")
+    return finish_email_artifact(word, f"📚 Daily Word: {word.upper()}", html_body)
+
+# The word data render_word_email() reads; other fields (e.g. the "difficulty"
+# copy that pipeline.enrich() adds) don't change the email
+ARTIFACT_KEY_FIELDS = ("word", "phonetics", "meanings", "derived")
+
+def get_artifact_key(word_data):
+    """Return a short hash of the rendered word data, so changed data never reuses an old artifact."""
+    rendered = {field: word_data.get(field) for field in ARTIFACT_KEY_FIELDS}
+    return hashlib.sha1(dumps(rendered)).hexdigest()[:12]
+
+def get_artifact_path(word, date=None, kind="word", key=None):
+    """Return the path of a stored email artifact for a word, date and data key."""
+    date = date or datetime.datetime.now().strftime("%Y-%m-%d")
+    name = f"{kind}-{word}-{key}" if key else f"{kind}-{word}"
+    return os.path.join(ARTIFACT_DIR, date, f"{name}.json")
+
+def _cache_artifact(path, artifact):
+    """Keep an artifact in memory, dropping the least recently used beyond ARTIFACT_CACHE_SIZE."""
+    with _artifact_lock:
+        _artifact_cache[path] = artifact
+        _artifact_cache.move_to_end(path)
+        while len(_artifact_cache) > ARTIFACT_CACHE_SIZE:
+            _artifact_cache.popitem(last=False)
+
+def load_email_artifact(word, date=None, kind="word", key=None):
+    """Load a stored email artifact, or return None if there isn't one."""
+    path = get_artifact_path(word, date, kind, key)
+    with _artifact_lock:
+        artifact = _artifact_cache.get(path)
+        if artifact is not None:
+            _artifact_cache.move_to_end(path)
+    if artifact is not None:
+        metrics.increment("cache_lookups", cache="artifact", result="hit")
+        return artifact
+    
+    if not os.path.exists(path):
+        metrics.increment("cache_lookups", cache="artifact", result="miss")
+        return None
+    
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            artifact = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Ignoring unreadable email artifact {path}: {e}")
+        return None
+    
+    metrics.increment("cache_lookups", cache="artifact", result="hit")
+    _cache_artifact(path, artifact)
+    return artifact
+
+def save_email_artifact(artifact, date=None, kind="word", key=None):
+    """Store an email artifact so later sends of the same day can reuse it."""
+    path = get_artifact_path(artifact["word"], date, kind, key)
+    _cache_artifact(path, artifact)
+    
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not store email artifact: {e}")
+    
+    return path
+
+def get_email_artifact(word_data, date=None):
+    """
+    Return the email artifact for a word, building and storing it on first use.
+    
+    Retries, resends and later runs on the same date reuse the stored
+    artifact byte-for-byte instead of rendering the template again. The
+    artifact is stored under a hash of the word data, so a re-fetched entry
+    or new derived content gets a new email.
+    
+    Args:
+        word_data (dict): Word data to include in the email
+        date (str): Send date as YYYY-MM-DD, today if omitted
         
-        # Reload the template environment to pick up any changes
-        global template_env
-        template_env = initialize_templates()
+    Returns:
+        dict: Artifact with "word", "subject", "html" and "text" keys
+    """
+    word = word_data.get("word", "")
+    # Derived content is part of the email, so it is in the key too
+    get_derived_content(word_data)
+    key = get_artifact_key(word_data)
+    artifact = load_email_artifact(word, date, key=key)
+    if artifact is None:
+        artifact = build_email_artifact(word_data)
+        save_email_artifact(artifact, date, key=key)
+    return artifact
+
+@metrics.timed("template_render", template="digest_email")
+def render_digest_email(entries):
+    """
+    Render the HTML digest email from the digest_email.html template.
+    
+    Args:
+        entries (list): Digest entries as built by dailydose.core.digest.build_digest
         
-        # Load the template
-        template = template_env.get_template("word_email.html")
+    Returns:
+        str: Rendered HTML, before any post-processing
+    """
+    return get_template("digest_email.html").render(entries=entries)
+
+def get_digest_artifact(entries, date=None):
+    """
+    Return the email artifact for a digest, building and storing it on first use.
+    
+    Args:
+        entries (list): Digest entries as built by dailydose.core.digest.build_digest
+        date (str): Send date as YYYY-MM-DD, today if omitted
         
-        # Render HTML body
-        html_body = template.render(
-            word=word_data.get("word", ""),
-            phonetics=word_data.get("phonetics", []),
-            meanings=word_data.get("meanings", []),
-            difficulty=word_data.get("difficulty", "")
-        )
+    Returns:
+        dict: Artifact with "word", "subject", "html" and "text" keys
+    """
+    words = [entry["word"] for entry in entries]
+    name = hashlib.sha1(",".join(words).encode("utf-8")).hexdigest()[:12]
+    # Entries hold exactly what the template renders, so changed data never reuses an old digest
+    key = hashlib.sha1(dumps(entries)).hexdigest()[:12]
+    
+    artifact = load_email_artifact(name, date, kind="digest", key=key)
+    if artifact is None:
+        subject = f"📚 Your Word Digest: {len(words)} words"
+        artifact = finish_email_artifact(name, subject, render_digest_email(entries))
+        save_email_artifact(artifact, date, kind="digest", key=key)
+    return artifact
+
+def get_transport():
+    """
+    Return the configured email transport.
+    
+    Returns:
+        Transport: An SESTransport or the shared SMTPTransport, or None if
+            SES isn't configured
+    """
+    global _smtp_transport
+    if EMAIL_TRANSPORT == "smtp":
+        with _smtp_lock:
+            if _smtp_transport is None:
+                _smtp_transport = SMTPTransport(
+                    SMTP_HOST,
+                    SMTP_PORT,
+                    username=SMTP_USERNAME,
+                    password=SMTP_PASSWORD,
+                    security=SMTP_SECURITY,
+                    pool_size=SMTP_POOL_SIZE,
+                    timeout=SMTP_TIMEOUT,
+                    max_messages=SMTP_MAX_MESSAGES
+                )
+                atexit.register(close_transport)
+            return _smtp_transport
+    return SESTransport(ses_client) if ses_client else None
+
+def close_transport():
+    """Close the SMTP connections, if any are open."""
+    global _smtp_transport
+    with _smtp_lock:
+        if _smtp_transport is not None:
+            _smtp_transport.close()
+            _smtp_transport = None
+
+def send_email(recipient_email, artifact):
+    """
+    Send a prebuilt email artifact to a single recipient via SES or SMTP.
+    
+    Args:
+        recipient_email (str): Email address to send to
+        artifact (dict): Artifact with "subject", "html" and "text" keys
         
-        # Send email via SES
-        response = ses_client.send_email(
-            Source=EMAIL_SENDER,
-            Destination={
-                'ToAddresses': [recipient_email]
-            },
-            Message={
-                'Subject': {
-                    'Data': f"📚 Daily Word: {word_data.get('word', '').upper()}"
-                },
-                'Body': {
-                    'Html': {
-                        'Data': html_body
-                    }
-                }
-            }
-        )
+    Returns:
+        bool: True if email was sent successfully, False otherwise
+    """
+    transport = get_transport() if EMAIL_ENABLED else None
+    if transport is None:
+        logger.warning("email_disabled", extra={"recipient": recipient_email})
+        return False
+    
+    try:
+        with metrics.timer(f"{transport.name}_send"):
+            message_id = transport.send(EMAIL_SENDER, recipient_email, artifact)
         
-        print(f"Email sent! Message ID: {response['MessageId']}")
+        metrics.increment("emails", status="sent")
+        if _sent_sampler.sample():
+            logger.info("email_sent", extra={"recipient": recipient_email, "message_id": message_id})
         return True
     
-    except ClientError as e:
-        print(f"Error sending email via SES: {e}")
+    except (ClientError, TransportError) as e:
+        metrics.increment("emails", status="failed")
+        logger.warning("email_failed", extra={"recipient": recipient_email, "error": str(e)})
+        return False
+    except Exception as e:
+        metrics.increment("emails", status="failed")
+        logger.error("email_failed", extra={"recipient": recipient_email, "error": repr(e)})
+        return False
+
+def send_word_email(recipient_email, word_data, artifact=None):
+    """
+    Send an email with word information to the specified recipient.
+    
+    Args:
+        recipient_email (str): Email address to send to
+        word_data (dict): Word data to include in the email
+        artifact (dict): Prebuilt email artifact, looked up with
+            get_email_artifact() if omitted
+        
+    Returns:
+        bool: True if email was sent successfully, False otherwise
+    """
+    if not EMAIL_ENABLED or get_transport() is None:
+        logger.warning("email_disabled", extra={"recipient": recipient_email})
         return False
+    
+    try:
+        if artifact is None:
+            artifact = get_email_artifact(word_data)
     except Exception as e:
-        print(f"Unexpected error when sending email: {e}")
+        logger.error("email_failed", extra={"recipient": recipient_email, "error": repr(e)})
         return False
+    
+    return send_email(recipient_email, artifact)
 
 def create_default_template():
     """
     Create a default email template if one doesn't exist.
     Note: This function is now mainly a fallback as we're using a manually created template.
     """
-    # Path to templates folder
-    template_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates")
-    template_path = os.path.join(template_dir, "word_email.html")
+    template_path = os.path.join(TEMPLATE_DIR, "word_email.html")
     
     # Create the directory if it doesn't exist
-    if not os.path.exists(template_dir):
-        os.makedirs(template_dir)
+    if not os.path.exists(TEMPLATE_DIR):
+        os.makedirs(TEMPLATE_DIR)
     
     # Simple default HTML template with basic formatting - as a fallback
     default_template = """<!DOCTYPE html>
@@ -208,24 +549,43 @@ def create_default_template():
     with open(template_path, 'w') as f:
         f.write(default_template)
     
-    # Reload the template environment
-    global template_env
-    template_env = initialize_templates()
+    # Make the next lookup pick up the new file
+    invalidate_templates()
 
-def get_subscribers():
-    """Get a list of subscriber email addresses from environment or config file."""
+def iter_subscribers(env_var="EMAIL_SUBSCRIBERS", filename="subscribers.txt"):
+    """
+    Yield subscriber addresses from an environment variable or a file in the project root.
+    
+    The file is read a line at a time, and addresses on the suppression list
+    (bounces and complaints) are left out.
+    """
+    yield from suppression.filter_subscribers(_iter_addresses(env_var, filename))
+
+def _iter_addresses(env_var, filename):
     # Get from environment variable if set (comma-separated list)
-    subscribers_env = os.environ.get("EMAIL_SUBSCRIBERS", "")
+    subscribers_env = os.environ.get(env_var, "")
     if subscribers_env:
-        return [email.strip() for email in subscribers_env.split(",") if email.strip()]
+        yield from (email.strip() for email in subscribers_env.split(",") if email.strip())
+        return
     
     # Otherwise, check if a subscribers file exists
-    subscribers_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                   "subscribers.txt")
+    subscribers_file = os.path.join(PROJECT_ROOT, filename)
     
     if os.path.exists(subscribers_file):
         with open(subscribers_file, "r") as f:
             # Filter out comments and empty lines
-            return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
-    
-    return [] 
\ No newline at end of file
+            for line in f:
+                if line.strip() and not line.strip().startswith('#'):
+                    yield line.strip()
+
+def read_subscribers(env_var, filename):
+    """Read subscriber addresses from an environment variable or a file in the project root, without suppressed ones."""
+    return list(iter_subscribers(env_var, filename))
+
+def get_subscribers():
+    """Get a list of subscriber email addresses from environment or config file."""
+    return read_subscribers("EMAIL_SUBSCRIBERS", "subscribers.txt")
+
+def get_digest_subscribers():
+    """Get the subscribers who prefer a weekly digest over daily emails."""
+    return read_subscribers("EMAIL_DIGEST_SUBSCRIBERS", "digest_subscribers.txt")
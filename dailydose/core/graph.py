@@ -0,0 +1,278 @@
+"""
+Synonym and antonym graph over every cached dictionary entry.
+
+Words are interned as ids: their position in a sorted array of all words
+that appear in an entry, as a headword or as a synonym or antonym of one.
+Edges are stored per relation as CSR adjacency arrays: the neighbours of
+word i are indices[indptr[i]:indptr[i + 1]]. Both relations are treated as
+symmetric. The arrays are saved as .npy files and memory-mapped on load, so
+a query only touches the rows it reads.
+
+The graph is brought up to date with the dictionary cache on use: only
+entries cached since the last build are read, and their edges merged into
+the existing arrays. Which entries were read is recorded by cache key,
+since a headword may be spelled differently from the word it was cached
+under.
+"""
+import os
+import random
+import numpy as np
+from . import cache
+from .storage import get_recent_words
+from .seen_index import SeenIndex
+from .sampling import get_blocklist
+from .word_utils import MIN_WORD_LENGTH
+
+GRAPH_DIR = os.path.join(cache.CACHE_DIR, "graph")
+
+RELATIONS = ("synonyms", "antonyms")
+
+_ARRAYS = ("indexed", "words", "has_entry", *(f"{r}_{part}" for r in RELATIONS for part in ("indptr", "indices")))
+
+# How many synonym steps away from the last word WORD_SELECTION=related may go
+GRAPH_HOPS = int(os.environ.get("WORD_GRAPH_HOPS", "2"))
+
+# Words of recent history treated as seen when there is no saved seen-word index
+GRAPH_RECENT_WORDS = 1000
+
+def collect_edges(entries):
+    """
+    Collect headwords and related-word pairs from dictionary entries.
+
+    Args:
+        entries (iterable): (word, entry) pairs, as from cache.iter_entries()
+
+    Returns:
+        tuple: (headwords, pairs) where pairs maps each relation to a list
+            of (word, related word) tuples
+    """
+    headwords = []
+    pairs = {relation: [] for relation in RELATIONS}
+
+    for word, entry in entries:
+        word = cache.normalize_word(entry.get("word") or word)
+        headwords.append(word)
+        for meaning in entry.get("meanings", []):
+            for source in (meaning, *meaning.get("definitions", [])):
+                for relation in RELATIONS:
+                    pairs[relation].extend((word, cache.normalize_word(other)) for other in source.get(relation, []))
+
+    return headwords, pairs
+
+def _csr_edges(graph, relation):
+    """Return a relation's edges as (source ids, target ids) arrays."""
+    indptr = np.asarray(graph[f"{relation}_indptr"])
+    sources = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    return sources, np.asarray(graph[f"{relation}_indices"], dtype=np.int64)
+
+def _to_csr(sources, targets, size):
+    """Build CSR arrays from edges, dropping self-loops and duplicates."""
+    keep = sources != targets
+    keys = np.unique(sources[keep] * size + targets[keep])
+    sources, targets = keys // size, keys % size
+
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=size), out=indptr[1:])
+    return indptr, targets.astype(np.int32)
+
+def build_graph(entries, graph=None):
+    """
+    Build a graph from dictionary entries, or merge them into an existing graph.
+
+    Args:
+        entries (iterable): (word, entry) pairs
+        graph (dict): Graph to extend, a new one is built if omitted
+
+    Returns:
+        dict: "indexed" (sorted cache keys of the entries read), "words"
+            (sorted), "has_entry" and per-relation "<relation>_indptr" and
+            "<relation>_indices" arrays
+    """
+    entries = list(entries)
+    headwords, pairs = collect_edges(entries)
+
+    names = set(headwords)
+    for relation in RELATIONS:
+        for pair in pairs[relation]:
+            names.update(pair)
+
+    old_words = np.asarray(graph["words"]) if graph is not None else np.array([], dtype=str)
+    words = np.union1d(old_words, np.array(sorted(names), dtype=str))
+    size = len(words)
+    # Old ids shift when new words sort before them
+    remap = np.searchsorted(words, old_words)
+
+    has_entry = np.zeros(size, dtype=bool)
+    if graph is not None:
+        has_entry[remap[np.asarray(graph["has_entry"])]] = True
+    has_entry[np.searchsorted(words, np.array(headwords, dtype=str))] = True
+
+    old_indexed = np.asarray(graph["indexed"]) if graph is not None else np.array([], dtype=str)
+    indexed = np.union1d(old_indexed, np.array([word for word, _ in entries], dtype=str))
+
+    result = {"indexed": indexed, "words": words, "has_entry": has_entry}
+    for relation in RELATIONS:
+        new = np.array(pairs[relation], dtype=str).reshape(-1, 2)
+        new_ids = np.searchsorted(words, new) if len(new) else np.zeros((0, 2), dtype=np.int64)
+        sources = [new_ids[:, 0], new_ids[:, 1]]
+        targets = [new_ids[:, 1], new_ids[:, 0]]
+        if graph is not None:
+            old_sources, old_targets = _csr_edges(graph, relation)
+            sources.append(remap[old_sources])
+            targets.append(remap[old_targets])
+        indptr, indices = _to_csr(np.concatenate(sources), np.concatenate(targets), size)
+        result[f"{relation}_indptr"] = indptr
+        result[f"{relation}_indices"] = indices
+
+    return result
+
+def save_graph(graph, path=None):
+    """Save a graph as a directory of .npy files, replacing any saved graph."""
+    cache.save_arrays({name: graph[name] for name in _ARRAYS}, path or GRAPH_DIR)
+
+def load_graph(path=None):
+    """Memory-map a saved graph, or return None if there isn't one."""
+    return cache.load_arrays(path or GRAPH_DIR, _ARRAYS, "word graph")
+
+def get_graph(rebuild=False):
+    """
+    Return the saved graph, first adding any entries cached since it was built.
+
+    Args:
+        rebuild (bool): Build from the whole cache even if a graph is saved
+
+    Returns:
+        dict: The graph
+    """
+    graph = None if rebuild else load_graph()
+
+    indexed = set(np.asarray(graph["indexed"])) if graph is not None else set()
+    new_words = [word for word in cache.iter_cached_words() if word not in indexed]
+    if graph is not None and not new_words:
+        return graph
+
+    entries = ((word, entry) for word in new_words for entry in [cache.load_entry(word)] if entry is not None)
+    graph = build_graph(entries, graph)
+    save_graph(graph)
+    return graph
+
+def lookup_id(graph, word):
+    """Return a word's id in the graph, or -1 if it isn't in it."""
+    words = graph["words"]
+    word = cache.normalize_word(word)
+    position = int(np.searchsorted(words, word))
+    return position if position < len(words) and words[position] == word else -1
+
+def neighbours(graph, ids, relations=RELATIONS):
+    """
+    Return the ids of every word one step from any of several words.
+
+    Args:
+        graph (dict): The graph
+        ids (np.ndarray): Word ids
+        relations (tuple): Relations to follow
+
+    Returns:
+        np.ndarray: Sorted unique neighbour ids
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    found = []
+    for relation in relations:
+        indptr = graph[f"{relation}_indptr"]
+        starts = indptr[ids]
+        counts = indptr[ids + 1] - starts
+        total = int(counts.sum())
+        if total:
+            # Position of each neighbour in indices, one run of counts[i] per word
+            offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+            found.append(graph[f"{relation}_indices"][offsets])
+    return np.unique(np.concatenate(found)) if found else np.array([], dtype=np.int64)
+
+def related_words(graph, word, hops=1, relation="synonyms"):
+    """
+    Find every word within a number of steps of a word.
+
+    Args:
+        graph (dict): The graph
+        word (str): Word to start from
+        hops (int): Largest number of steps
+        relation (str): "synonyms", "antonyms" or "all"
+
+    Returns:
+        list: (word, steps) pairs, nearest first and alphabetical within a step
+    """
+    start = lookup_id(graph, word)
+    if start < 0:
+        return []
+
+    relations = RELATIONS if relation == "all" else (relation,)
+    distance = np.full(len(graph["words"]), -1, dtype=np.int16)
+    distance[start] = 0
+    frontier = np.array([start])
+
+    for step in range(1, hops + 1):
+        frontier = neighbours(graph, frontier, relations)
+        frontier = frontier[distance[frontier] < 0]
+        if not len(frontier):
+            break
+        distance[frontier] = step
+
+    found = np.flatnonzero(distance > 0)
+    found = found[np.argsort(distance[found], kind="stable")]
+    return [(str(graph["words"][i]), int(distance[i])) for i in found]
+
+def pick_near(graph, word, hops=GRAPH_HOPS, exclude=(), rng=None, keep=None):
+    """
+    Pick a word related to a given word, preferring nearer words and words with a cached entry.
+
+    Args:
+        graph (dict): The graph
+        word (str): Word to stay near, e.g. today's word
+        hops (int): Largest number of synonym steps
+        exclude (set): Words that must not be picked, e.g. already seen ones
+        rng (random.Random): Source of randomness
+        keep (callable): Called with each related word; words it returns
+            False for are not picked
+
+    Returns:
+        str: The chosen word, or None if no related word is left
+    """
+    rng = rng or random.Random()
+    candidates = [(other, steps) for other, steps in related_words(graph, word, hops)
+                  if other not in exclude and (keep is None or keep(other))]
+    if not candidates:
+        return None
+
+    ids = np.searchsorted(graph["words"], np.array([other for other, _ in candidates], dtype=str))
+    weights = np.array([1.0 / steps for _, steps in candidates])
+    weights *= np.where(np.asarray(graph["has_entry"])[ids], 2.0, 1.0)
+    return rng.choices([other for other, _ in candidates], weights=weights)[0]
+
+def pick_next_word(hops=GRAPH_HOPS, skip=(), rng=None):
+    """
+    Pick the next word near the most recent word in history, skipping words already seen.
+
+    Seen words are looked up in the saved seen-word index, or the last
+    GRAPH_RECENT_WORDS words of history if there isn't one yet. Blocklisted
+    and short words are never picked, as with the other selection modes.
+
+    Args:
+        hops (int): Largest number of synonym steps
+        skip (set): More words to leave out, e.g. ones the dictionary didn't have
+        rng (random.Random): Source of randomness
+
+    Returns:
+        str: The chosen word, or None if there is no history or no unseen related word
+    """
+    index = SeenIndex.load()
+    recent = get_recent_words(1 if index is not None else GRAPH_RECENT_WORDS)
+    if not recent:
+        return None
+
+    blocklist = get_blocklist()
+    seen = index.seen if index is not None else set(recent).__contains__
+
+    def keep(word):
+        return len(word) >= MIN_WORD_LENGTH and word not in blocklist and not seen(word)
+
+    return pick_near(get_graph(), recent[0], hops, exclude=set(skip), rng=rng, keep=keep)
@@ -0,0 +1,326 @@
+"""
+Streaming export and import of word history.
+
+History moves as JSON lines, one entry per line, so copying between the
+local history file and MongoDB holds one batch in memory rather than the
+whole history. Progress is checkpointed after every batch; running the same
+command again resumes where an interrupted run stopped.
+"""
+import os
+import json
+import textwrap
+from bson import ObjectId
+from pymongo import UpdateOne
+from . import storage
+from .seen_index import mark_seen
+
+# Records per MongoDB bulk write, per file write and per checkpoint
+BATCH_SIZE = int(os.environ.get("HISTORY_BATCH_SIZE", "1000"))
+
+def get_backend(backend="auto"):
+    """
+    Resolve a history backend name.
+
+    Args:
+        backend (str): "file", "mongo", or "auto" for MongoDB when connected
+
+    Returns:
+        str: "file" or "mongo"
+    """
+    if backend == "auto":
+        return "mongo" if storage.word_collection is not None else "file"
+    if backend == "mongo" and storage.word_collection is None:
+        raise ValueError("MongoDB is not connected. Set MONGODB_URI or use the file backend.")
+    if backend not in ("file", "mongo"):
+        raise ValueError(f"Unknown history backend: {backend}")
+    return backend
+
+def get_checkpoint_path(path):
+    """Return the checkpoint file used while exporting to or importing from path."""
+    return f"{path}.checkpoint"
+
+def load_checkpoint(path, operation):
+    """
+    Load a checkpoint if it belongs to the same operation.
+
+    Returns:
+        dict: The saved progress, or None to start from the beginning
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    return state if state.get("operation") == operation else None
+
+def save_checkpoint(path, state):
+    """Write a checkpoint, replacing the previous one atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def remove_checkpoint(path):
+    """Delete a checkpoint once its operation has finished."""
+    if os.path.exists(path):
+        os.remove(path)
+
+def _sync(f):
+    """Make everything written to f durable before a checkpoint refers to it."""
+    f.flush()
+    os.fsync(f.fileno())
+
+def count_records(backend):
+    """Count the entries held by a history backend."""
+    if backend == "mongo":
+        return storage.word_collection.count_documents({})
+    return sum(1 for _ in storage.iter_history_file())
+
+def count_lines(path):
+    """Count the non-empty lines of a JSON lines file."""
+    with open(path, 'rb') as f:
+        return sum(1 for line in f if line.strip())
+
+def _iter_source(backend, state):
+    """Yield (position, entry) pairs from a backend, after what state says was exported."""
+    if backend == "mongo":
+        query = {"_id": {"$gt": ObjectId(state["last_id"])}} if state.get("last_id") else {}
+        cursor = storage.word_collection.find(query).sort("_id", 1).batch_size(BATCH_SIZE)
+        for doc in cursor:
+            position = str(doc.pop("_id"))
+            yield position, storage.unpack_document(doc)
+    else:
+        skip = state["records"]
+        for i, entry in enumerate(storage.iter_history_file()):
+            if i >= skip:
+                yield None, entry
+
+def export_history(output, backend="auto", resume=True, batch_size=None):
+    """
+    Stream history from a backend to a JSON lines file.
+
+    Args:
+        output (str): File to write
+        backend (str): "file", "mongo" or "auto"
+        resume (bool): Continue from a checkpoint left by an interrupted export
+        batch_size (int): Records per write and checkpoint, BATCH_SIZE if omitted
+
+    Returns:
+        dict: "records" exported, "expected" records in the source and
+            whether the two counts agree ("verified")
+    """
+    backend = get_backend(backend)
+    batch_size = batch_size or BATCH_SIZE
+    operation = f"export:{backend}"
+    checkpoint_path = get_checkpoint_path(output)
+
+    state = load_checkpoint(checkpoint_path, operation) if resume else None
+    if state and os.path.exists(output):
+        print(f"Resuming export: {state['records']} records already written.")
+        f = open(output, 'r+b')
+        f.truncate(state["offset"])
+        f.seek(state["offset"])
+    else:
+        state = {"operation": operation, "records": 0, "offset": 0, "last_id": None}
+        f = open(output, 'wb')
+
+    with f:
+        lines = []
+        for position, entry in _iter_source(backend, state):
+            lines.append(json.dumps(entry, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+            if position is not None:
+                state["last_id"] = position
+
+            if len(lines) >= batch_size:
+                f.writelines(lines)
+                _sync(f)
+                state["records"] += len(lines)
+                state["offset"] = f.tell()
+                save_checkpoint(checkpoint_path, state)
+                lines = []
+
+        f.writelines(lines)
+        _sync(f)
+        state["records"] += len(lines)
+
+    remove_checkpoint(checkpoint_path)
+
+    expected = count_records(backend)
+    return {
+        "records": state["records"],
+        "expected": expected,
+        "verified": count_lines(output) == state["records"] == expected
+    }
+
+def _iter_batches(path, offset, batch_size):
+    """
+    Read a JSON lines file in batches, starting at a byte offset.
+
+    Yields:
+        tuple: (entries, offset just past the batch, lines skipped for having no word)
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        batch = []
+        skipped = 0
+        for line in f:
+            offset += len(line)
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if isinstance(entry, dict) and entry.get("word"):
+                entry.pop("_id", None)
+                batch.append(entry)
+            else:
+                skipped += 1
+
+            if len(batch) >= batch_size:
+                yield batch, offset, skipped
+                batch = []
+                skipped = 0
+
+        if batch or skipped:
+            yield batch, offset, skipped
+
+def _format_entry(entry):
+    """Format an entry the way json.dump(history, indent=2) lays out the history file."""
+    return textwrap.indent(json.dumps(entry, indent=2), "    ")
+
+def import_history(path, backend="auto", resume=True, batch_size=None):
+    """
+    Stream history from a JSON lines file into a backend.
+
+    MongoDB entries are upserted by word. The history file is rewritten
+    through a temporary file: imported entries come first, followed by the
+    existing entries for words the import didn't contain. The imported words
+    are then marked in the seen-word index, so they aren't chosen again.
+
+    Args:
+        path (str): File to read
+        backend (str): "file", "mongo" or "auto"
+        resume (bool): Continue from a checkpoint left by an interrupted import
+        batch_size (int): Records per write and checkpoint, BATCH_SIZE if omitted
+
+    Returns:
+        dict: "records" read, "written" to the backend, "skipped" lines,
+            "total" entries now in the backend and whether the counts agree
+            ("verified")
+    """
+    backend = get_backend(backend)
+    batch_size = batch_size or BATCH_SIZE
+    operation = f"import:{backend}"
+    checkpoint_path = get_checkpoint_path(path)
+
+    state = load_checkpoint(checkpoint_path, operation) if resume else None
+    if state:
+        print(f"Resuming import: {state['records']} records already imported.")
+    else:
+        state = {"operation": operation, "offset": 0, "records": 0, "written": 0, "skipped": 0}
+
+    if backend == "mongo":
+        result = _import_to_mongodb(path, state, checkpoint_path, batch_size)
+    else:
+        result = _import_to_file(path, state, checkpoint_path, batch_size)
+
+    # Read the file again rather than collecting words: a resumed import only
+    # sees the batches after its checkpoint
+    mark_seen((entry["word"], None) for batch, _, _ in _iter_batches(path, 0, batch_size) for entry in batch)
+    remove_checkpoint(checkpoint_path)
+    return result
+
+def _upsert(entry):
+    """Update for one imported entry, compressing its dictionary fields."""
+    doc = storage.pack_document(entry)
+    update = {"$set": doc}
+    if "payload" in doc:
+        # Replaces the uncompressed fields of an existing document
+        update["$unset"] = {key: "" for key in entry if key not in doc}
+    return update
+
+def _import_to_mongodb(path, state, checkpoint_path, batch_size):
+    """Upsert entries by word with one unordered bulk write per batch."""
+    for batch, offset, skipped in _iter_batches(path, state["offset"], batch_size):
+        if batch:
+            requests = [UpdateOne({"word": entry["word"]}, _upsert(entry), upsert=True) for entry in batch]
+            result = storage.word_collection.bulk_write(requests, ordered=False)
+            state["written"] += result.matched_count + result.upserted_count
+
+        state["records"] += len(batch)
+        state["skipped"] += skipped
+        state["offset"] = offset
+        save_checkpoint(checkpoint_path, state)
+
+    return {
+        "records": state["records"],
+        "written": state["written"],
+        "skipped": state["skipped"],
+        "total": count_records("mongo"),
+        "verified": state["written"] == state["records"]
+    }
+
+def _import_to_file(path, state, checkpoint_path, batch_size):
+    """Rewrite the history file with the imported entries, streaming both sides."""
+    tmp_path = f"{storage.HISTORY_FILE}.import"
+
+    if state["records"] and os.path.exists(tmp_path):
+        # Drop anything written after the last checkpoint, then recover the imported words
+        with open(tmp_path, 'r+b') as f:
+            f.truncate(state["tmp_offset"])
+        imported = {entry["word"] for entry in storage.iter_history_file(tmp_path)}
+        f = open(tmp_path, 'ab')
+    else:
+        state.update(offset=0, records=0, written=0, skipped=0)
+        imported = set()
+        f = open(tmp_path, 'wb')
+        f.write(b'{\n  "words": [')
+
+    with f:
+        for batch, offset, skipped in _iter_batches(path, state["offset"], batch_size):
+            chunks = []
+            for entry in batch:
+                # Keep the first entry for each word
+                if entry["word"] in imported:
+                    skipped += 1
+                    continue
+                imported.add(entry["word"])
+                separator = ",\n" if state["written"] or chunks else "\n"
+                chunks.append((separator + _format_entry(entry)).encode("utf-8"))
+
+            f.writelines(chunks)
+            _sync(f)
+            state["records"] += len(batch)
+            state["written"] += len(chunks)
+            state["skipped"] += skipped
+            state["offset"] = offset
+            state["tmp_offset"] = f.tell()
+            save_checkpoint(checkpoint_path, state)
+
+        # Keep the existing entries for words the import didn't replace. Words
+        # saved meanwhile by another process must not be lost, so the history
+        # lock is held until the new file is in place.
+        with storage.history_lock():
+            kept = 0
+            for entry in storage.iter_history_file():
+                if entry.get("word") in imported:
+                    continue
+                separator = ",\n" if state["written"] or kept else "\n"
+                f.write((separator + _format_entry(entry)).encode("utf-8"))
+                kept += 1
+
+            f.write(b'\n  ]\n}')
+            _sync(f)
+            f.close()
+            os.replace(tmp_path, storage.HISTORY_FILE)
+
+    total = count_records("file")
+    return {
+        "records": state["records"],
+        "written": state["written"],
+        "skipped": state["skipped"],
+        "total": total,
+        "verified": total == state["written"] + kept
+    }
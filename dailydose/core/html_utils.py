@@ -0,0 +1,162 @@
+"""
+Post-render processing for HTML emails: minification, style cleanup and
+plain-text conversion.
+"""
+import re
+from html.parser import HTMLParser
+
+# Tags whose surrounding whitespace never affects how an email renders
+BLOCK_TAGS = {
+    "html", "head", "body", "title", "meta", "style", "table", "thead", "tbody",
+    "tr", "td", "th", "div", "p", "h1", "h2", "h3", "ul", "ol", "li", "br", "hr"
+}
+
+COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+WHITESPACE_RE = re.compile(r"\s+")
+BLOCK_GAP_RE = re.compile(r"\s*(</?(?:%s)\b[^>]*>)\s*" % "|".join(sorted(BLOCK_TAGS)), re.IGNORECASE)
+STYLE_ATTR_RE = re.compile(r'\sstyle="([^"]*)"', re.IGNORECASE)
+STYLED_TAG_RE = re.compile(r'<(\w+)((?:(?!\sclass=)[^>])*?)\sstyle="([^"]*)"((?:(?!\sclass=)[^>])*)>', re.IGNORECASE)
+
+def minify_html(html):
+    """
+    Strip comments and collapse insignificant whitespace in an HTML document.
+
+    Conditional comments (<!--[if mso]>) are kept since Outlook relies on them.
+    Whitespace between inline elements is collapsed to a single space rather
+    than removed so that words don't run together.
+
+    Args:
+        html (str): Rendered HTML
+
+    Returns:
+        str: Minified HTML
+    """
+    html = COMMENT_RE.sub("", html)
+    html = WHITESPACE_RE.sub(" ", html)
+    html = BLOCK_GAP_RE.sub(r"\1", html)
+    return html.strip()
+
+def normalize_style(style):
+    """
+    Normalize an inline style declaration.
+
+    Properties are lower-cased, whitespace is collapsed and repeated
+    properties are reduced to the last value, which is the one clients apply.
+    """
+    declarations = {}
+    for declaration in style.split(";"):
+        if ":" not in declaration:
+            continue
+        name, value = declaration.split(":", 1)
+        name = name.strip().lower()
+        value = WHITESPACE_RE.sub(" ", value).strip()
+        if name and value:
+            # Re-insert so the surviving declaration keeps its final position
+            declarations.pop(name, None)
+            declarations[name] = value
+    return ";".join(f"{name}:{value}" for name, value in declarations.items())
+
+def dedupe_styles(html, hoist_min_count=0):
+    """
+    Clean up inline style attributes and optionally hoist repeated ones.
+
+    Every style attribute is normalized with normalize_style(). When
+    hoist_min_count is set, styles used at least that many times are moved
+    into a <style> block in the document head and replaced by a short class
+    name. Hoisting is opt-in because some webmail clients drop <style> blocks;
+    elements that already carry a class attribute are left untouched.
+
+    Args:
+        html (str): Rendered HTML
+        hoist_min_count (int): Minimum repeats before a style is hoisted, 0 to disable
+
+    Returns:
+        str: HTML with deduplicated styles
+    """
+    html = STYLE_ATTR_RE.sub(lambda m: f' style="{normalize_style(m.group(1))}"', html)
+
+    if not hoist_min_count or "</head>" not in html:
+        return html
+
+    counts = {}
+    for match in STYLED_TAG_RE.finditer(html):
+        counts[match.group(3)] = counts.get(match.group(3), 0) + 1
+
+    class_names = {}
+    for style, count in counts.items():
+        if count >= hoist_min_count:
+            class_names[style] = f"s{len(class_names)}"
+
+    if not class_names:
+        return html
+
+    def hoist(match):
+        tag, before, style, after = match.groups()
+        if style not in class_names:
+            return match.group(0)
+        return f'<{tag}{before} class="{class_names[style]}"{after}>'
+
+    html = STYLED_TAG_RE.sub(hoist, html)
+    rules = "".join(f".{name}{{{style}}}" for style, name in class_names.items())
+    return html.replace("</head>", f"<style>{rules}</style></head>", 1)
+
+class _TextExtractor(HTMLParser):
+    """Collect the readable text of an HTML document."""
+
+    SKIP_TAGS = {"head", "style", "script", "title"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag == "br":
+            self.parts.append("\n")
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+        if tag == "a":
+            self.links.append(dict(attrs).get("href"))
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == "a" and self.links:
+            href = self.links.pop()
+            if href:
+                self.parts.append(f" ({href})")
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+def html_to_text(html):
+    """
+    Convert an HTML email into a plain-text alternative.
+
+    Args:
+        html (str): HTML document
+
+    Returns:
+        str: Plain text with one block per line and link targets inlined
+    """
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+
+    lines = []
+    # convert_charrefs has already decoded character references; decoding
+    # again would turn an escaped "&amp;lt;" into "<"
+    for line in "".join(parser.parts).splitlines():
+        line = WHITESPACE_RE.sub(" ", line).strip()
+        # Keep at most one blank line between blocks
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip() + "\n"
@@ -0,0 +1,130 @@
+"""
+Structured logging for the send loops and other per-recipient work.
+
+Events are JSON lines ({"time", "level", "logger", "event", ...fields})
+written to stderr or DAILYDOSE_LOG_FILE. Callers only put records on an
+in-memory queue; a QueueListener thread does the formatting and writing,
+so a send loop never waits on log I/O. The listener is flushed and
+stopped when the process exits.
+
+Per-recipient events go through an EventSampler, which keeps 1 in every
+1 / DAILYDOSE_LOG_SAMPLE_RATE of them; failures are always logged, and
+each loop logs one summary event with its totals.
+"""
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import datetime
+import threading
+import logging.handlers
+
+# Minimum level written, by name (DEBUG, INFO, WARNING, ERROR)
+LOG_LEVEL = os.environ.get("DAILYDOSE_LOG_LEVEL", "INFO").upper()
+# JSON lines file; stderr if unset
+LOG_FILE = os.environ.get("DAILYDOSE_LOG_FILE") or None
+# Share of per-recipient success events that are logged (0 logs none, 1 logs all)
+LOG_SAMPLE_RATE = float(os.environ.get("DAILYDOSE_LOG_SAMPLE_RATE", "0.01"))
+
+LOGGER_NAME = "dailydose"
+
+_listener = None
+_lock = threading.Lock()
+
+# Standard LogRecord attributes, everything else passed in extra= is an event field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class EventSampler:
+    """
+    Keep a fixed share of a stream of events.
+
+    Sampling is by count rather than at random, so a rate of 0.01 logs the
+    1st, 101st, 201st, ... event and runs are reproducible.
+
+    Args:
+        rate (float): Share of events kept, from 0 (none) to 1 (all);
+            rates outside that range are clamped to it
+    """
+
+    def __init__(self, rate=None):
+        rate = min(max(LOG_SAMPLE_RATE if rate is None else rate, 0.0), 1.0)
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self.seen = 0
+
+    def sample(self):
+        """Count one event and return True if it should be logged."""
+        self.seen += 1
+        return self.every > 0 and (self.seen - 1) % self.every == 0
+
+def _build_handler(path):
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        handler = logging.FileHandler(path, encoding="utf-8")
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+def setup(level=None, path=None):
+    """
+    Route dailydose log records through a queue to a background writer.
+
+    Calling it again replaces the previous configuration.
+
+    Args:
+        level (str): Minimum level name, LOG_LEVEL if omitted
+        path (str): JSON lines file, LOG_FILE (or stderr) if omitted
+    """
+    global _listener
+    level = (level or LOG_LEVEL).upper()
+    if not isinstance(logging.getLevelName(level), int):
+        print(f"Warning: Ignoring unknown log level '{level}', using INFO.")
+        level = "INFO"
+
+    with _lock:
+        shutdown()
+        records = queue.SimpleQueue()
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.handlers = [logging.handlers.QueueHandler(records)]
+        logger.setLevel(level)
+        logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(records, _build_handler(path or LOG_FILE))
+        _listener.start()
+        atexit.register(shutdown)
+
+def shutdown():
+    """Write any queued records and stop the background writer."""
+    global _listener
+    if _listener is None:
+        return
+    atexit.unregister(shutdown)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+def get_logger(name):
+    """Return the logger for a module, setting up logging on first use."""
+    if _listener is None:
+        setup()
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
@@ -0,0 +1,249 @@
+"""
+Timers and counters for the stages of a run.
+
+Metrics are off unless DAILYDOSE_METRICS is "json" or "prometheus" (or the
+--metrics option is used). While off, timers and counters return
+immediately. While on, totals are kept in memory and written to
+METRICS_FILE when the process exits: as JSON, or as a Prometheus textfile
+for node_exporter's textfile collector.
+"""
+import os
+import re
+import json
+import time
+import atexit
+import datetime
+import functools
+import threading
+import contextlib
+from .cache import CACHE_DIR
+
+EXPORT_FORMATS = ("json", "prometheus")
+
+# Export format (None disables metrics) and file, defaulting to .cache/metrics.json or .prom
+METRICS_FORMAT = os.environ.get("DAILYDOSE_METRICS", "").lower() or None
+METRICS_FILE = os.environ.get("DAILYDOSE_METRICS_FILE") or None
+
+# Prefix of every exported Prometheus metric name
+PROMETHEUS_PREFIX = "dailydose"
+
+_enabled = False
+_format = None
+_path = None
+_exporting = False
+_lock = threading.Lock()
+
+# Objects with on_enter(name, tags) and on_exit(name, tags), told about every timed stage
+_listeners = []
+
+# Keyed by (name, sorted tag items); timers hold [count, total seconds, max seconds]
+_counters = {}
+_timers = {}
+
+# Returned by timer() while disabled, so a disabled timer allocates nothing
+_NULL_TIMER = contextlib.nullcontext()
+
+def _key(name, tags):
+    return (name, tuple(sorted(tags.items())) if tags else ())
+
+def get_default_path(fmt):
+    """Return the default export file for a format."""
+    return os.path.join(CACHE_DIR, "metrics.prom" if fmt == "prometheus" else "metrics.json")
+
+def is_enabled():
+    return _enabled
+
+def enable(fmt="json", path=None):
+    """
+    Start collecting metrics and export them when the process exits.
+
+    Args:
+        fmt (str): "json" or "prometheus", or None to collect without exporting
+        path (str): Export file, METRICS_FILE or the format's default if omitted
+    """
+    global _enabled, _format, _path, _exporting
+    if fmt is not None and fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown metrics format: {fmt}")
+
+    _enabled = True
+    if fmt is None:
+        return
+
+    _format = fmt
+    _path = path or METRICS_FILE or get_default_path(fmt)
+    if not _exporting:
+        atexit.register(export)
+        _exporting = True
+
+def disable():
+    """Stop collecting metrics; nothing is exported at exit."""
+    global _enabled, _exporting
+    if _exporting:
+        atexit.unregister(export)
+    _enabled = False
+    _exporting = False
+
+def add_listener(listener):
+    """Call listener.on_enter/on_exit(name, tags) around every timed stage."""
+    _listeners.append(listener)
+
+def remove_listener(listener):
+    _listeners.remove(listener)
+
+def reset():
+    """Forget everything collected so far."""
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+
+def increment(name, value=1, **tags):
+    """Add to a counter, e.g. increment("cache_lookups", cache="dictionary", result="hit")."""
+    if not _enabled:
+        return
+    key = _key(name, tags)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, seconds, **tags):
+    """Record one duration for a timer."""
+    if not _enabled:
+        return
+    key = _key(name, tags)
+    with _lock:
+        stats = _timers.get(key)
+        if stats is None:
+            _timers[key] = [1, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+class _Timer:
+    __slots__ = ("name", "tags", "start")
+
+    def __init__(self, name, tags):
+        self.name = name
+        self.tags = tags
+
+    def __enter__(self):
+        for listener in _listeners:
+            listener.on_enter(self.name, self.tags)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.name, time.perf_counter() - self.start, **self.tags)
+        for listener in reversed(_listeners):
+            listener.on_exit(self.name, self.tags)
+        return False
+
+def timer(name, **tags):
+    """Time a block: with metrics.timer("dictionary_lookup"): ..."""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name, tags)
+
+def timed(name, **tags):
+    """Decorator that times every call of a function."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Timer(name, tags):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def snapshot():
+    """
+    Return everything collected so far.
+
+    Returns:
+        dict: "counters" and "timers" lists with name, tags and values; timer
+            values are count, sum and max in seconds
+    """
+    with _lock:
+        counters = [
+            {"name": name, "tags": dict(tags), "value": value}
+            for (name, tags), value in sorted(_counters.items())
+        ]
+        timers = [
+            {"name": name, "tags": dict(tags), "count": count, "sum": total, "max": longest}
+            for (name, tags), (count, total, longest) in sorted(_timers.items())
+        ]
+    return {
+        "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "counters": counters,
+        "timers": timers
+    }
+
+def _metric_name(*parts):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", "_".join((PROMETHEUS_PREFIX,) + parts))
+
+def _labels(tags):
+    if not tags:
+        return ""
+    escaped = (
+        f'{re.sub(r"[^a-zA-Z0-9_]", "_", key)}="'
+        + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for key, value in sorted(tags.items())
+    )
+    return "{" + ",".join(escaped) + "}"
+
+def format_prometheus(data):
+    """Format a snapshot in the Prometheus text exposition format."""
+    lines = []
+    declared = set()
+
+    def declare(name, kind):
+        if name not in declared:
+            declared.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for counter in data["counters"]:
+        name = _metric_name(counter["name"], "total")
+        declare(name, "counter")
+        lines.append(f"{name}{_labels(counter['tags'])} {counter['value']}")
+
+    for timer_data in data["timers"]:
+        name = _metric_name(timer_data["name"], "seconds")
+        labels = _labels(timer_data["tags"])
+        declare(name, "summary")
+        lines.append(f"{name}_count{labels} {timer_data['count']}")
+        lines.append(f"{name}_sum{labels} {timer_data['sum']:.6f}")
+
+    for timer_data in data["timers"]:
+        name = _metric_name(timer_data["name"], "seconds", "max")
+        declare(name, "gauge")
+        lines.append(f"{name}{_labels(timer_data['tags'])} {timer_data['max']:.6f}")
+
+    return "\n".join(lines) + "\n"
+
+def export(path=None, fmt=None):
+    """
+    Write the collected metrics, replacing the file atomically.
+
+    Args:
+        path (str): Export file, the enabled path if omitted
+        fmt (str): "json" or "prometheus", the enabled format if omitted
+
+    Returns:
+        str: The file written
+    """
+    fmt = fmt or _format or "json"
+    path = path or _path or get_default_path(fmt)
+    data = snapshot()
+    content = format_prometheus(data) if fmt == "prometheus" else json.dumps(data, indent=2)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
+
+if METRICS_FORMAT in EXPORT_FORMATS:
+    enable(METRICS_FORMAT)
+elif METRICS_FORMAT:
+    print(f"Warning: Ignoring unknown DAILYDOSE_METRICS format '{METRICS_FORMAT}' (use json or prometheus).")
@@ -0,0 +1,208 @@
+"""
+Compact model of a Free Dictionary API entry.
+
+The API returns a lot we never use (license, sourceUrls, audio metadata per
+phonetic). WordEntry keeps only the fields that display, storage and email
+read, in __slots__ classes with tuples instead of lists, and with
+part-of-speech labels interned. It decodes straight from the response bytes
+and serializes to compact JSON for the caches and storage. orjson is used
+for both when it is installed.
+
+The models also behave like the read-only dicts they replace: get(),
+["key"] and "key" in entry use the API's JSON keys, so code (and Jinja
+templates) written against raw dictionary entries keeps working.
+"""
+import sys
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard json module is used instead
+    orjson = None
+
+class _Record:
+    """Dict-style access to slots by their JSON keys."""
+
+    __slots__ = ()
+
+    # JSON key -> attribute name, in serialization order
+    _keys = {}
+
+    def get(self, key, default=None):
+        attribute = self._keys.get(key)
+        value = None if attribute is None else getattr(self, attribute)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        return (key for key in self._keys if key in self)
+
+    def keys(self):
+        return list(self)
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, attribute) == getattr(other, attribute) for attribute in self._keys.values())
+
+    def __repr__(self):
+        fields = ", ".join(f"{attribute}={getattr(self, attribute)!r}" for attribute in self._keys.values())
+        return f"{type(self).__name__}({fields})"
+
+    def to_dict(self):
+        """Return the record as plain JSON data, leaving out empty fields."""
+        data = {}
+        for key, attribute in self._keys.items():
+            value = getattr(self, attribute)
+            if value is None or value == ():
+                continue
+            if isinstance(value, tuple):
+                value = [item.to_dict() if isinstance(item, _Record) else item for item in value]
+            data[key] = value
+        return data
+
+def _strings(values):
+    return tuple(values) if values else ()
+
+class Phonetic(_Record):
+    """A pronunciation: IPA text and/or an audio URL."""
+
+    __slots__ = ("text", "audio")
+    _keys = {"text": "text", "audio": "audio"}
+
+    def __init__(self, text=None, audio=None):
+        self.text = text or None
+        self.audio = audio or None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("text"), data.get("audio"))
+
+class Definition(_Record):
+    """One definition with its optional example and related words."""
+
+    __slots__ = ("definition", "example", "synonyms", "antonyms")
+    _keys = {"definition": "definition", "example": "example", "synonyms": "synonyms", "antonyms": "antonyms"}
+
+    def __init__(self, definition="", example=None, synonyms=(), antonyms=()):
+        self.definition = definition
+        self.example = example
+        self.synonyms = _strings(synonyms)
+        self.antonyms = _strings(antonyms)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("definition", ""), data.get("example"), data.get("synonyms"), data.get("antonyms"))
+
+class Meaning(_Record):
+    """The definitions of a word for one part of speech."""
+
+    __slots__ = ("part_of_speech", "definitions", "synonyms", "antonyms")
+    _keys = {"partOfSpeech": "part_of_speech", "definitions": "definitions", "synonyms": "synonyms", "antonyms": "antonyms"}
+
+    def __init__(self, part_of_speech="", definitions=(), synonyms=(), antonyms=()):
+        # A handful of labels repeat across every entry; share one string each
+        self.part_of_speech = sys.intern(part_of_speech)
+        self.definitions = tuple(definitions)
+        self.synonyms = _strings(synonyms)
+        self.antonyms = _strings(antonyms)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get("partOfSpeech") or "",
+            (Definition.from_dict(definition) for definition in data.get("definitions") or ()),
+            data.get("synonyms"),
+            data.get("antonyms")
+        )
+
+class WordEntry(_Record):
+    """
+    A dictionary entry trimmed to what DailyDose uses.
+
+    Besides the API fields, an entry carries its "derived" content (see
+    word_utils.get_derived_content) and "difficulty", which can be set with
+    entry["derived"] = ... like on a dict.
+    """
+
+    __slots__ = ("word", "phonetics", "meanings", "derived", "difficulty")
+    _keys = {"word": "word", "phonetics": "phonetics", "meanings": "meanings",
+             "derived": "derived", "difficulty": "difficulty"}
+
+    def __init__(self, word, phonetics=(), meanings=(), derived=None, difficulty=None):
+        self.word = word
+        self.phonetics = tuple(phonetics)
+        self.meanings = tuple(meanings)
+        self.derived = derived
+        self.difficulty = difficulty
+
+    def __setitem__(self, key, value):
+        if key not in ("derived", "difficulty"):
+            raise KeyError(f"WordEntry field '{key}' can't be set")
+        setattr(self, key, value)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an entry from a decoded API entry (or a cached one), dropping unused fields."""
+        return cls(
+            data.get("word", ""),
+            # Phonetics without text or audio carry only metadata
+            (Phonetic.from_dict(p) for p in data.get("phonetics") or () if p.get("text") or p.get("audio")),
+            (Meaning.from_dict(meaning) for meaning in data.get("meanings") or ()),
+            data.get("derived"),
+            data.get("difficulty")
+        )
+
+    @classmethod
+    def from_json(cls, payload):
+        """
+        Decode an entry from JSON bytes or text.
+
+        Accepts a single entry or the API's list of entries, of which the
+        first is used.
+        """
+        data = loads(payload)
+        if isinstance(data, list):
+            data = data[0]
+        return cls.from_dict(data)
+
+    @classmethod
+    def coerce(cls, entry):
+        """Return entry as a WordEntry, converting a raw dict."""
+        return entry if isinstance(entry, cls) else cls.from_dict(entry)
+
+    def to_json(self):
+        """Serialize to compact JSON bytes."""
+        return dumps(self)
+
+def _default(value):
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def loads(payload):
+    """Decode JSON bytes or text, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+def dumps(value):
+    """Encode dicts, lists and models as compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
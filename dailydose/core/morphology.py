@@ -0,0 +1,253 @@
+"""
+Word structure analysis: prefixes, suffixes and Greek/Latin roots.
+
+Affixes are stored in tries so the longest match is found in a single walk
+over the word, however many affixes are loaded.
+
+An affix is only split off when what is left is a known root or a word of
+the word list ("reader" isn't re- + ader, "insist" isn't ins + -ist). The
+word list is remembered in KNOWN_WORDS_FILE whenever it is fetched; until
+then, only known roots count.
+"""
+import os
+from .cache import CACHE_DIR
+
+MORPHOLOGY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "morphology.tsv")
+
+# The word list stems are checked against, one word per line
+KNOWN_WORDS_FILE = os.path.join(CACHE_DIR, "known_words.txt")
+
+# Shortest stem left over before an affix match is trusted ("unit" isn't un- + it)
+MIN_STEM_LENGTH = 3
+
+# Shortest stem that may be found in the word list rather than the roots,
+# which matches the shortest words the word list keeps
+MIN_FREE_STEM_LENGTH = 4
+
+class AffixTrie:
+    """A character trie mapping affixes to their meanings."""
+
+    __slots__ = ("root", "size")
+
+    def __init__(self):
+        self.root = {}
+        self.size = 0
+
+    def insert(self, key, value):
+        """Add an affix and its meaning to the trie."""
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        if None not in node:
+            self.size += 1
+        # The None key holds the value of the affix ending at this node
+        node[None] = value
+
+    def longest_match(self, text, start=0, end=None, step=1):
+        """
+        Find the longest key that matches text starting at position start.
+
+        Args:
+            text (str): Text to match against
+            start (int): Index of the first character to match
+            end (int): Index the match may not reach; len(text) (or -1 when
+                walking backwards) if omitted
+            step (int): 1 to walk forwards, -1 to walk backwards
+
+        Returns:
+            tuple: (match length, value), or (0, None) if nothing matches
+        """
+        if end is None:
+            end = len(text) if step > 0 else -1
+
+        node = self.root
+        best = (0, None)
+        length = 0
+        for i in range(start, end, step):
+            node = node.get(text[i])
+            if node is None:
+                break
+            length += 1
+            if None in node:
+                best = (length, node[None])
+        return best
+
+    def __len__(self):
+        return self.size
+
+class MorphologyAnalyzer:
+    """
+    Splits words into a known prefix, Greek/Latin roots and a known suffix.
+
+    Args:
+        prefixes (dict): Prefix -> meaning
+        suffixes (dict): Suffix -> meaning
+        roots (dict): Root -> meaning
+        words (iterable): Known words that stems are checked against; without
+            them, only stems starting with a known root count
+    """
+
+    def __init__(self, prefixes=None, suffixes=None, roots=None, words=None):
+        self.prefixes = AffixTrie()
+        self.suffixes = AffixTrie()
+        self.roots = AffixTrie()
+        self.words = None
+        if words is not None:
+            self.set_words(words)
+
+        for text, meaning in (prefixes or {}).items():
+            self.prefixes.insert(text, meaning)
+        for text, meaning in (suffixes or {}).items():
+            # Suffixes are stored reversed and matched from the end of the word
+            self.suffixes.insert(text[::-1], meaning)
+        for text, meaning in (roots or {}).items():
+            self.roots.insert(text, meaning)
+
+    def set_words(self, words):
+        """Replace the known words that stems are checked against."""
+        self.words = {word.lower() for word in words}
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load an analyzer from a tab-separated file of "kind, text, meaning" rows.
+
+        Args:
+            path (str): Path to the data file; lines starting with '#' are ignored
+
+        Returns:
+            MorphologyAnalyzer: The loaded analyzer
+        """
+        tables = {"prefix": {}, "suffix": {}, "root": {}}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line or line.startswith("#"):
+                    continue
+                kind, text, meaning = line.split("\t", 2)
+                tables[kind][text] = meaning
+        return cls(tables["prefix"], tables["suffix"], tables["root"])
+
+    def _is_stem(self, word, start, end):
+        """Check whether word[start:end] can stand on its own once an affix is split off."""
+        if end - start < MIN_STEM_LENGTH:
+            return False
+        if self.roots.longest_match(word, start, end)[0]:
+            return True
+        if self.words is None or end - start < MIN_FREE_STEM_LENGTH:
+            return False
+
+        # A suffix often changes the end of its stem: "writer" (write), "happiness" (happy)
+        stem = word[start:end]
+        return (stem in self.words or stem + "e" in self.words
+                or stem.endswith("i") and stem[:-1] + "y" in self.words)
+
+    def _match_suffix(self, word, start, end):
+        """Return (length, meaning) of the suffix that would be stripped from word[start:end], (0, None) if none."""
+        length, meaning = self.suffixes.longest_match(word, end - 1, start - 1, step=-1)
+        return (length, meaning) if length and self._is_stem(word, start, end - length) else (0, None)
+
+    def analyze(self, word):
+        """
+        Find the longest known prefix and suffix of a word and the roots between them.
+
+        An affix only counts when the stem left between the prefix and the
+        suffix is a known root or word, so "interesting", "reader" and
+        "insist" are left whole.
+
+        Args:
+            word (str): The word to analyze
+
+        Returns:
+            dict: "prefix" and "suffix" as {"text", "meaning"} dicts or None,
+                and "roots" as a list of {"text", "meaning"} dicts
+        """
+        word = word.lower()
+        end = len(word)
+
+        prefix = None
+        start = 0
+        length, meaning = self.prefixes.longest_match(word)
+        # A root at least as long as the prefix wins ("biology" is bio-, not bi-)
+        if length and self.roots.longest_match(word)[0] < length:
+            # The stem is either the rest of the word or what a suffix leaves of it
+            suffix_length = self.suffixes.longest_match(word, end - 1, length - 1, step=-1)[0]
+            if self._is_stem(word, length, end) or self._is_stem(word, length, end - suffix_length):
+                prefix = {"text": word[:length], "meaning": meaning}
+                start = length
+
+        suffix = None
+        length, meaning = self._match_suffix(word, start, end)
+        if length:
+            suffix = {"text": word[end - length:], "meaning": meaning}
+            end -= length
+
+        # Greedy, non-overlapping longest matches inside the stem
+        roots = []
+        i = start
+        while i < end:
+            length, meaning = self.roots.longest_match(word, i, end)
+            if length:
+                roots.append({"text": word[i:i + length], "meaning": meaning})
+                i += length
+            else:
+                i += 1
+
+        return {"prefix": prefix, "roots": roots, "suffix": suffix}
+
+# Shared analyzer, loaded from MORPHOLOGY_FILE on first use
+_analyzer = None
+
+def load_known_words(path=None):
+    """Return the remembered word list, or None if it was never fetched."""
+    path = path or KNOWN_WORDS_FILE
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().split()
+    except OSError as e:
+        print(f"Warning: Ignoring unreadable word list {path}: {e}")
+        return None
+
+def set_known_words(words):
+    """
+    Remember a freshly fetched word list for checking stems.
+
+    The file is only rewritten when the list has changed.
+    """
+    words = list(words)
+    analyzer = get_analyzer()
+    if analyzer.words == {word.lower() for word in words}:
+        return
+
+    analyzer.set_words(words)
+    try:
+        os.makedirs(os.path.dirname(KNOWN_WORDS_FILE), exist_ok=True)
+        tmp_path = f"{KNOWN_WORDS_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(words))
+        os.replace(tmp_path, KNOWN_WORDS_FILE)
+    except OSError as e:
+        print(f"Warning: Could not save the word list: {e}")
+
+def get_analyzer():
+    """Return the shared analyzer, loading it on first use."""
+    global _analyzer
+    if _analyzer is None:
+        analyzer = MorphologyAnalyzer.from_file(MORPHOLOGY_FILE)
+        words = load_known_words()
+        if words is not None:
+            analyzer.set_words(words)
+        _analyzer = analyzer
+    return _analyzer
+
+def analyze_word(word):
+    """Split a word into its known prefix, roots and suffix."""
+    return get_analyzer().analyze(word)
+
+def count_morphemes(word):
+    """Count the known prefixes, roots and suffixes in a word."""
+    parts = analyze_word(word)
+    return len(parts["roots"]) + (parts["prefix"] is not None) + (parts["suffix"] is not None)
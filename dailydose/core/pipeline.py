@@ -0,0 +1,282 @@
+"""
+The daily word as a pipeline of independent stages:
+
+    fetch -> enrich -> persist
+                    -> notify
+
+Each stage is a plain function with explicit inputs and outputs, so it can
+be called on its own (e.g. re-sending a stored word, or saving a batch of
+imported words without emailing them). deliver() runs persist and notify
+for one word concurrently, so a slow MongoDB write doesn't hold up email.
+run_pipeline() streams any number of words through all stages on worker
+threads joined by bounded queues, for batch runs or a long-lived daemon
+that feeds it from a generator.
+"""
+import os
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .word_utils import get_word_info, get_derived_content
+from .storage import save_word_history
+from .seen_index import mark_seen
+from .email_service import send_word_email, get_email_artifact, iter_subscribers
+from .log import get_logger
+from . import quiz
+
+# Words waiting between two stages of run_pipeline()
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", "8"))
+
+logger = get_logger("pipeline")
+
+# Seconds close() waits for the fetch thread to notice the pipeline was stopped
+FETCH_JOIN_TIMEOUT = 1.0
+
+# Marks the end of the words in a stage queue
+_DONE = object()
+
+def fetch(word):
+    """
+    Fetch stage: look a word up in the dictionary.
+
+    Returns:
+        dict: The dictionary entry, or None if the word wasn't found
+    """
+    return get_word_info(word)
+
+def enrich(word_data):
+    """
+    Enrich stage: add difficulty, related words, examples and tips.
+
+    The derived content is stored in word_data["derived"] (see
+    get_derived_content) and the difficulty is copied to
+    word_data["difficulty"] for the email template.
+
+    Returns:
+        dict: The same word_data, enriched
+    """
+    derived = get_derived_content(word_data)
+    word_data["difficulty"] = derived["difficulty"]
+    return word_data
+
+def persist(word_data):
+    """
+    Persist stage: save the word to history and mark it as seen.
+
+    Returns:
+        bool: True if the word was also saved to MongoDB
+    """
+    word = word_data.get("word", "")
+    db_status = save_word_history(word, word_data)
+    mark_seen([(word, None)])
+    return db_status
+
+def notify(word_data, subscribers=None):
+    """
+    Notify stage: email the word to every subscriber.
+
+    The email is rendered once and every subscriber gets the same stored
+    artifact, plus a quiz of their own when QUIZ_IN_EMAIL is set.
+    Per-recipient results are logged by send_email.
+
+    Args:
+        word_data (dict): Enriched word data
+        subscribers (iterable): Recipients, the daily subscribers (without
+            suppressed addresses) if omitted; read lazily
+
+    Returns:
+        dict: "subscribers", "sent" and "failed" counts
+    """
+    if subscribers is None:
+        subscribers = iter_subscribers()
+
+    if quiz.QUIZ_IN_EMAIL:
+        recipients = quiz.iter_subscriber_quizzes(word_data, subscribers)
+    else:
+        recipients = ((email, None) for email in subscribers)
+
+    artifact = None
+    started = time.perf_counter()
+    total = 0
+    delivered = []
+    for email, subscriber_quiz in recipients:
+        # Render only once there is someone to send to
+        if artifact is None:
+            artifact = get_email_artifact(word_data)
+        total += 1
+        message = quiz.attach_quiz(artifact, subscriber_quiz) if subscriber_quiz else artifact
+        if send_word_email(email, word_data, message):
+            delivered.append(email)
+    if not total:
+        return {"subscribers": 0, "sent": 0, "failed": 0}
+
+    word = word_data.get("word", "")
+    failed = total - len(delivered)
+    logger.info("emails_summary", extra={
+        "word": word, "sent": len(delivered), "failed": failed,
+        "seconds": round(time.perf_counter() - started, 3)
+    })
+
+    # Remember who has seen this word
+    mark_seen((word, email) for email in delivered)
+    return {"subscribers": total, "sent": len(delivered), "failed": failed}
+
+def deliver(word_data, send=True, subscribers=None):
+    """
+    Run the persist and notify stages for one word concurrently.
+
+    Args:
+        word_data (dict): Enriched word data
+        send (bool): Run the notify stage
+        subscribers (list): Recipients, the daily subscribers if omitted
+
+    Returns:
+        tuple: (persist result, notify result or None)
+    """
+    if not send:
+        return persist(word_data), None
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="dailydose-persist") as executor:
+        saved = executor.submit(persist, word_data)
+        emails = notify(word_data, subscribers)
+        return saved.result(), emails
+
+def _put(stage_queue, item, stop):
+    # Block while the next stage is behind, but give up once the pipeline is stopped
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+def _get(stage_queue, stop):
+    while not stop.is_set():
+        try:
+            return stage_queue.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return _DONE
+
+def run_pipeline(words, send=True, subscribers=None, on_enriched=None, queue_size=None):
+    """
+    Stream words through fetch, enrich, and persist alongside notify.
+
+    Every stage runs on its own thread. Stages are joined by queues of
+    queue_size words, so a slow stage holds back the ones before it rather
+    than letting work pile up. words may be endless, e.g. a generator that
+    waits for the next scheduled word; results are yielded as words finish.
+
+    Args:
+        words (iterable): Words to process
+        send (bool): Run the notify stage
+        subscribers (list): Recipients, the daily subscribers if omitted
+        on_enriched (callable): Called with each enriched word, e.g. to display it
+        queue_size (int): Capacity of each queue, PIPELINE_QUEUE_SIZE if omitted
+
+    Yields:
+        dict: Per word: "word", "word_data" (None if not found), "saved_to_db",
+            "emails" (notify result, None when not sending) and "error"
+            (None, or the exception that stopped the word)
+    """
+    size = queue_size or PIPELINE_QUEUE_SIZE
+    enrich_queue, persist_queue, notify_queue = (queue.Queue(size) for _ in range(3))
+    results = queue.Queue()
+    stop = threading.Event()
+
+    def fetch_worker():
+        try:
+            for word in words:
+                if stop.is_set():
+                    return
+                try:
+                    word_data = fetch(word)
+                except Exception as e:
+                    word_data = e
+                # Entries may be plain dicts or WordEntry records
+                if word_data is not None and not isinstance(word_data, Exception):
+                    _put(enrich_queue, word_data, stop)
+                else:
+                    error = word_data if isinstance(word_data, Exception) else None
+                    results.put({"word": word, "word_data": None, "saved_to_db": False, "emails": None, "error": error})
+        finally:
+            _put(enrich_queue, _DONE, stop)
+
+    def enrich_worker():
+        while True:
+            word_data = _get(enrich_queue, stop)
+            if word_data is _DONE:
+                break
+            try:
+                enrich(word_data)
+                if on_enriched:
+                    on_enriched(word_data)
+            except Exception as e:
+                results.put({"word": word_data.get("word"), "word_data": word_data,
+                             "saved_to_db": False, "emails": None, "error": e})
+                continue
+            _put(persist_queue, word_data, stop)
+            if send:
+                _put(notify_queue, word_data, stop)
+        _put(persist_queue, _DONE, stop)
+        _put(notify_queue, _DONE, stop)
+
+    def stage_worker(stage_queue, stage, field):
+        while True:
+            word_data = _get(stage_queue, stop)
+            if word_data is _DONE:
+                break
+            try:
+                results.put((field, word_data, stage(word_data), None))
+            except Exception as e:
+                results.put((field, word_data, None, e))
+        results.put(_DONE)
+
+    workers = [
+        threading.Thread(target=fetch_worker, name="dailydose-fetch", daemon=True),
+        threading.Thread(target=enrich_worker, name="dailydose-enrich", daemon=True),
+        threading.Thread(target=stage_worker, args=(persist_queue, persist, "saved_to_db"),
+                         name="dailydose-persist", daemon=True),
+        threading.Thread(target=stage_worker, args=(notify_queue, lambda data: notify(data, subscribers), "emails"),
+                         name="dailydose-notify", daemon=True)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Words waiting for persist and/or notify, by id(word_data)
+    pending = {}
+    stages_left = 2
+    try:
+        while stages_left:
+            item = results.get()
+            if item is _DONE:
+                stages_left -= 1
+                continue
+            if isinstance(item, dict):
+                yield item
+                continue
+
+            field, word_data, value, error = item
+            key = id(word_data)
+            if key not in pending:
+                pending[key] = ({"word": word_data.get("word"), "word_data": word_data,
+                                 "saved_to_db": False, "emails": None, "error": None}, [2 if send else 1])
+            result, waiting = pending[key]
+            if error is None:
+                result[field] = value
+            else:
+                result["error"] = result["error"] or error
+            waiting[0] -= 1
+            if not waiting[0]:
+                del pending[key]
+                yield result
+    finally:
+        # Stop the workers if the caller stops early and wait for the stage
+        # in progress, so nothing is saved or sent after close() returns
+        stop.set()
+        for worker in workers[1:]:
+            worker.join()
+        # The fetch thread may be blocked in a source waiting for its next
+        # word; it checks stop before fetching again, and it is a daemon
+        # thread, so it can't hang exit
+        workers[0].join(FETCH_JOIN_TIMEOUT)
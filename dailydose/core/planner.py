@@ -0,0 +1,182 @@
+"""
+Plan the words of the coming days ahead of time.
+
+Planning chooses a word for each day, fetches and checks its dictionary
+entry, and renders its email into the dated artifact store
+(.cache/artifacts/<date>/). The daily run then reads the planned word, its
+cached entry and its finished email, so it needs neither the word list nor
+the dictionary API.
+
+Words are chosen as by WORD_SELECTION=weighted: never a word already in
+history or already planned, and near the day's difficulty level. With the
+weekly progression, each week moves from Basic (Monday to Wednesday) to
+Intermediate (Thursday, Friday) to Advanced (the weekend).
+"""
+import os
+import json
+import random
+import datetime
+from . import cache
+from .difficulty import TIERS, get_difficulty_table
+from .email_service import get_email_artifact, get_artifact_key, get_artifact_path
+from .sampling import ALLOW_REPEATS, WORD_LEVEL, WeightedSampler, compute_word_weights, get_blocklist
+from .seen_index import get_seen_index
+from .storage import get_word_history_dates
+from .word_utils import get_word_list, get_cached_word_info
+
+PLAN_FILE = os.path.join(cache.CACHE_DIR, "plan.json")
+
+# "weekly" raises the level from Basic to Advanced over each week; "none" uses WORD_LEVEL every day
+PLAN_PROGRESSION = os.environ.get("PLAN_PROGRESSION", "weekly").lower()
+
+# Words tried per day before giving up on a day, e.g. during a dictionary API outage
+MAX_ATTEMPTS = 10
+
+def level_for_date(date, level=None):
+    """
+    Return the difficulty level to plan for a date.
+
+    Args:
+        date (datetime.date): The day
+        level (str): Fixed level that overrides the progression
+
+    Returns:
+        str: Tier name, or None for any level
+    """
+    if level:
+        return level
+    if PLAN_PROGRESSION != "weekly":
+        return WORD_LEVEL
+    return TIERS[date.weekday() * len(TIERS) // 7]
+
+def load_plan(path=None):
+    """Return the saved plan: {"YYYY-MM-DD": {"word", "level", "difficulty"}}, empty if there is none."""
+    path = path or PLAN_FILE
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Ignoring unreadable plan: {e}")
+        return {}
+
+def save_plan(plan, path=None):
+    """Save a plan, dropping days before today."""
+    path = path or PLAN_FILE
+    today = datetime.date.today().isoformat()
+    plan = {day: entry for day, entry in sorted(plan.items()) if day >= today}
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2)
+    os.replace(tmp_path, path)
+
+def validate_entry(word_info):
+    """Check that a dictionary entry has at least one definition to show and send."""
+    if not word_info or not word_info.get("word"):
+        return False
+    return any(definition.get("definition")
+               for meaning in word_info.get("meanings", [])
+               for definition in meaning.get("definitions", []))
+
+def plan_days(days, start=None, level=None, replan=False, rng=None):
+    """
+    Plan words for a number of days, skipping days that are already planned.
+
+    Args:
+        days (int): Number of days to cover
+        start (datetime.date): First day, tomorrow if omitted
+        level (str): Fixed difficulty level instead of the progression
+        replan (bool): Choose new words for days that are already planned
+        rng (random.Random): Source of randomness
+
+    Returns:
+        list: One dict per day with "date", "word" (None if no word could be
+            prepared), "level" and "planned" (False for days already planned)
+    """
+    start = start or datetime.date.today() + datetime.timedelta(days=1)
+    rng = rng or random.Random()
+    plan = load_plan()
+    dates = [(start + datetime.timedelta(days=i)).isoformat() for i in range(days)]
+
+    words = get_word_list()
+    index = {word: i for i, word in enumerate(words)}
+    table = get_difficulty_table(words)
+    history = get_word_history_dates()
+    blocklist = get_blocklist()
+
+    # Never plan a word already seen or planned for another day
+    excluded = set() if ALLOW_REPEATS else {int(i) for i in get_seen_index(words).seen_mask().nonzero()[0]}
+    excluded.update(index[entry["word"]] for day, entry in plan.items()
+                    if entry["word"] in index and not (replan and day in dates))
+
+    samplers = {}
+
+    def get_sampler(day_level):
+        if day_level not in samplers:
+            weights = compute_word_weights(words, difficulty_table=table, history=history,
+                                           blocklist=blocklist, level=day_level)
+            weights[list(excluded)] = 0.0
+            samplers[day_level] = WeightedSampler(weights, rng=rng)
+        return samplers[day_level]
+
+    def exclude(i):
+        excluded.add(i)
+        for sampler in samplers.values():
+            sampler.update([i], 0.0)
+
+    results = []
+    for day in dates:
+        day_level = level_for_date(datetime.date.fromisoformat(day), level)
+        if day in plan and not replan:
+            results.append({"date": day, "word": plan[day]["word"], "level": plan[day].get("level"), "planned": False})
+            continue
+
+        plan.pop(day, None)
+        chosen = None
+        sampler = get_sampler(day_level)
+        for _ in range(MAX_ATTEMPTS):
+            if sampler.total <= 0:
+                break
+            i = sampler.draw()
+            exclude(i)
+            word_info = get_cached_word_info(words[i])
+            if validate_entry(word_info):
+                # Render the email now; the daily run reads it from the dated store
+                get_email_artifact(word_info, date=day)
+                chosen = word_info
+                break
+
+        if chosen is not None:
+            plan[day] = {"word": chosen["word"], "level": day_level, "difficulty": chosen["derived"]["difficulty"]}
+        results.append({"date": day, "word": chosen["word"] if chosen else None, "level": day_level, "planned": True})
+        # Keep what is done so far if a later day fails hard
+        save_plan(plan)
+
+    return results
+
+def get_planned_word_info(date=None):
+    """
+    Return the cached entry of the word planned for a day, if it is ready to send.
+
+    Args:
+        date (str): Day as YYYY-MM-DD, today if omitted
+
+    Returns:
+        WordEntry: The planned word's entry, or None if the day isn't planned
+            or its entry or email is missing
+    """
+    date = date or datetime.date.today().isoformat()
+    entry = load_plan().get(date)
+    if not entry:
+        return None
+
+    word_info = cache.load_entry(entry["word"])
+    if not validate_entry(word_info):
+        return None
+    if not os.path.exists(get_artifact_path(word_info["word"], date, key=get_artifact_key(word_info))):
+        return None
+    return word_info
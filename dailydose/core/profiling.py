@@ -0,0 +1,215 @@
+"""
+Opt-in profiling of a whole command.
+
+Two profilers are available:
+
+- "cprofile": deterministic cProfile; the artifact is a .prof file for
+  pstats, snakeviz and similar tools
+- "sample": a lightweight sampling profiler that records the main thread's
+  stack at a fixed interval; the artifact is a collapsed-stack .txt file
+  that flamegraph.pl and speedscope read directly
+
+Either can be combined with per-stage tracemalloc peaks, which use the
+stage timers from dailydose.core.metrics.
+"""
+import os
+import sys
+import time
+import pstats
+import cProfile
+import datetime
+import threading
+import tracemalloc
+from collections import Counter
+from . import metrics
+from .cache import CACHE_DIR
+
+PROFILE_DIR = os.path.join(CACHE_DIR, "profiles")
+PROFILE_MODES = ("cprofile", "sample")
+
+# Seconds between stack samples in "sample" mode
+SAMPLE_INTERVAL = 0.005
+
+def get_profile_path(mode):
+    """Return a new timestamped artifact path for a profiler mode."""
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    extension = "prof" if mode == "cprofile" else "txt"
+    return os.path.join(PROFILE_DIR, f"{stamp}-{mode}.{extension}")
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """
+    Sample one thread's stack on a background thread.
+
+    Args:
+        interval (float): Seconds between samples
+        thread_id (int): Thread to sample, the calling thread if omitted
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dailydose-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def total(self):
+        return sum(self.stacks.values())
+
+    def write_collapsed(self, path):
+        """Write stacks in the collapsed format: "outer;...;inner count" per line."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def top_functions(self, count):
+        """
+        Return the functions that were on the stack most often.
+
+        Returns:
+            list: (function, self samples, total samples) tuples, by self samples
+        """
+        own = Counter()
+        inclusive = Counter()
+        for stack, samples in self.stacks.items():
+            own[stack[-1]] += samples
+            for function in set(stack):
+                inclusive[function] += samples
+        return [(function, samples, inclusive[function]) for function, samples in own.most_common(count)]
+
+class StageMemoryTracker:
+    """
+    Record the tracemalloc peak of each timed stage.
+
+    A stage's peak is the highest traced memory while it ran, relative to
+    the memory in use when it started, including nested stages. Only stages
+    on the main thread are tracked, since tracemalloc's peak is global.
+    """
+
+    def __init__(self):
+        self.peaks = {}
+        self._stack = []
+
+    @staticmethod
+    def _label(name, tags):
+        return name + "".join(f" {key}={value}" for key, value in sorted(tags.items()))
+
+    def on_enter(self, name, tags):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # The parent's peak so far, before the reset below forgets it
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._stack.append([current, 0])
+
+    def on_exit(self, name, tags):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        start, nested_peak = self._stack.pop()
+        peak = max(peak, nested_peak)
+
+        label = self._label(name, tags)
+        self.peaks[label] = max(self.peaks.get(label, 0), peak - start)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+
+def print_cprofile_summary(profiler, top):
+    print(f"\nTop {top} functions by own time:")
+    pstats.Stats(profiler).sort_stats("tottime").print_stats(top)
+
+def print_sample_summary(sampler, top, interval):
+    print(f"\nTop {top} functions by own samples ({sampler.total} samples, {interval * 1000:.0f} ms apart):")
+    print(f"{'own %':>7} {'total %':>8}  function")
+    total = max(sampler.total, 1)
+    for function, own, inclusive in sampler.top_functions(top):
+        print(f"{own / total:>7.1%} {inclusive / total:>8.1%}  {function}")
+
+def print_memory_summary(tracker):
+    print("\nPeak traced memory per stage:")
+    for label, peak in sorted(tracker.peaks.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {peak / 1024:>12,.1f} KiB  {label}")
+
+def run_profiled(func, mode=None, output=None, top=20, trace_memory=False, interval=SAMPLE_INTERVAL):
+    """
+    Run a function under a profiler and/or per-stage memory tracing.
+
+    Args:
+        func (callable): The work to profile, called without arguments
+        mode (str): "cprofile", "sample", or None for no CPU profile
+        output (str): Profile artifact path, a timestamped file in PROFILE_DIR if omitted
+        top (int): Number of functions in the printed summary
+        trace_memory (bool): Record the tracemalloc peak of each stage
+        interval (float): Seconds between samples in "sample" mode
+
+    Returns:
+        The function's return value
+    """
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profiler: {mode}")
+
+    tracker = None
+    if trace_memory:
+        # Stages are only timed while metrics are collected
+        if not metrics.is_enabled():
+            metrics.enable(None)
+        tracker = StageMemoryTracker()
+        metrics.add_listener(tracker)
+        tracemalloc.start()
+
+    profiler = sampler = None
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif mode == "sample":
+        sampler = SamplingProfiler(interval)
+        sampler.start()
+
+    started = time.perf_counter()
+    try:
+        return func()
+    finally:
+        elapsed = time.perf_counter() - started
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.stop()
+        if tracker:
+            metrics.remove_listener(tracker)
+            tracemalloc.stop()
+
+        if mode:
+            path = output or get_profile_path(mode)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            if profiler:
+                profiler.dump_stats(path)
+                print_cprofile_summary(profiler, top)
+            else:
+                sampler.write_collapsed(path)
+                print_sample_summary(sampler, top, interval)
+            print(f"Profile of {elapsed:.2f}s run written to {path}")
+        if tracker:
+            print_memory_summary(tracker)
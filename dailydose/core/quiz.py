@@ -0,0 +1,355 @@
+"""
+Multiple-choice quizzes: "Which definition matches WORD?"
+
+The wrong answers (distractors) are definitions of other cached words from
+the same part of speech and learning difficulty, so they are plausible.
+They come from an index of the first definition of every meaning in the
+dictionary cache. Its rows are grouped into buckets by part of speech and
+difficulty, so a bucket is one contiguous slice (CSR style). The definition
+texts are stored as UTF-8 bytes back to back, with the offsets of each row.
+Picking distractors is a slice, a few comparisons and random draws; no
+entries are read. A bucket holds each definition text once.
+
+Like the search index, the index is saved as .npy files, memory-mapped on
+load and brought up to date with the dictionary cache on use.
+
+With QUIZ_IN_EMAIL=true, every daily email gets a quiz, and each
+subscriber's quiz has its own distractors and answer order. They are drawn
+in batches of array operations.
+"""
+import os
+import html
+import hashlib
+import numpy as np
+from . import cache
+from .difficulty import TIERS
+from .word_utils import get_learning_difficulty
+
+QUIZ_INDEX_DIR = os.path.join(cache.CACHE_DIR, "quiz")
+
+# Add a quiz to the daily email
+QUIZ_IN_EMAIL = os.environ.get("QUIZ_IN_EMAIL", "false").lower() == "true"
+# Answers per question, the correct one included
+QUIZ_CHOICES = int(os.environ.get("QUIZ_CHOICES", "4"))
+
+# Anything else (e.g. "interjection") shares the last bucket
+PARTS_OF_SPEECH = ("noun", "verb", "adjective", "adverb", "other")
+
+BUCKETS = len(PARTS_OF_SPEECH) * len(TIERS)
+
+_ARRAYS = ("indexed", "words", "hashes", "indptr", "offsets", "text")
+
+# Quizzes drawn per batch of subscribers
+BATCH_SIZE = 1000
+
+def bucket_of(part_of_speech, difficulty):
+    """Return the bucket number of a part of speech and difficulty tier."""
+    part = (part_of_speech or "").lower()
+    part_id = PARTS_OF_SPEECH.index(part) if part in PARTS_OF_SPEECH else len(PARTS_OF_SPEECH) - 1
+    tier_id = TIERS.index(difficulty) if difficulty in TIERS else 0
+    return part_id * len(TIERS) + tier_id
+
+def hash_definition(text):
+    """Return the 64-bit hash of a definition, ignoring case and the final full stop."""
+    normalized = " ".join(text.lower().split()).rstrip(".")
+    return int.from_bytes(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "little")
+
+def _difficulty(word, entry):
+    return entry.get("derived", {}).get("difficulty") or get_learning_difficulty(word)
+
+def entry_definitions(word, entry):
+    """
+    Return the (bucket, definition) pairs of an entry: the first definition of each meaning.
+    """
+    difficulty = _difficulty(word, entry)
+    pairs = []
+    for meaning in entry.get("meanings", []):
+        for definition in meaning.get("definitions", [])[:1]:
+            text = (definition.get("definition") or "").strip()
+            if text:
+                pairs.append((bucket_of(meaning.get("partOfSpeech"), difficulty), text))
+    return pairs
+
+def get_definition(index, row):
+    """Return the definition text of an index row."""
+    offsets = index["offsets"]
+    return bytes(index["text"][offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+def build_index(entries, index=None):
+    """
+    Build a distractor index from dictionary entries, or merge them into an existing index.
+
+    Args:
+        entries (iterable): (word, entry) pairs, as from cache.iter_entries()
+        index (dict): Index to extend, a new one is built if omitted
+
+    Returns:
+        dict: "indexed" (sorted words with an entry), and per row "words"
+            (normalized cache keys) and definition "hashes". Rows of bucket b are indptr[b]:indptr[b + 1];
+            the text of row i is text[offsets[i]:offsets[i + 1]]
+    """
+    new_words = []
+    buckets, words, texts = [], [], []
+    for word, entry in entries:
+        new_words.append(word)
+        key = cache.normalize_word(word)
+        for bucket, text in entry_definitions(word, entry):
+            buckets.append(bucket)
+            words.append(key)
+            texts.append(text)
+
+    old_indexed = np.asarray(index["indexed"]) if index is not None else np.array([], dtype=str)
+    if index is not None:
+        rows = len(index["words"])
+        buckets.extend(np.repeat(np.arange(BUCKETS), np.diff(np.asarray(index["indptr"]))).tolist())
+        words.extend(np.asarray(index["words"]).tolist())
+        texts.extend(get_definition(index, row) for row in range(rows))
+
+    buckets = np.array(buckets, dtype=np.int64)
+    words = np.array(words, dtype=str)
+    hashes = np.fromiter((hash_definition(text) for text in texts), dtype=np.uint64, count=len(texts))
+
+    # Group rows by bucket, keeping one row per definition text in each bucket
+    order = np.lexsort((words, hashes, buckets))
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = (np.diff(buckets[order]) != 0) | (np.diff(hashes[order]) != 0)
+    order = order[keep]
+
+    encoded = [texts[i].encode("utf-8") for i in order.tolist()]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in encoded], out=offsets[1:])
+    indptr = np.zeros(BUCKETS + 1, dtype=np.int64)
+    np.cumsum(np.bincount(buckets[order], minlength=BUCKETS), out=indptr[1:])
+
+    return {
+        "indexed": np.union1d(old_indexed, np.array(new_words, dtype=str)),
+        "words": words[order],
+        "hashes": hashes[order],
+        "indptr": indptr,
+        "offsets": offsets,
+        "text": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    }
+
+def save_index(index, path=None):
+    """Save an index as a directory of .npy files, replacing any saved index."""
+    cache.save_arrays({name: index[name] for name in _ARRAYS}, path or QUIZ_INDEX_DIR)
+
+def load_index(path=None):
+    """Memory-map a saved index, or return None if there isn't one."""
+    return cache.load_arrays(path or QUIZ_INDEX_DIR, _ARRAYS, "quiz index")
+
+def get_index(rebuild=False):
+    """
+    Return the saved index, first adding any entries cached since it was built.
+
+    Args:
+        rebuild (bool): Build from the whole cache even if an index is saved
+
+    Returns:
+        dict: The index
+    """
+    index = None if rebuild else load_index()
+
+    indexed = set(np.asarray(index["indexed"])) if index is not None else set()
+    new_words = [word for word in cache.iter_cached_words() if word not in indexed]
+    if index is not None and not new_words:
+        return index
+
+    entries = ((word, entry) for word in new_words for entry in [cache.load_entry(word)] if entry is not None)
+    index = build_index(entries, index)
+    save_index(index)
+    return index
+
+def get_question(word_data, key=None):
+    """
+    Return what a quiz on a word asks about: its first definition.
+
+    Args:
+        word_data (dict): Dictionary entry of the word
+        key (str): Word the entry is cached under, if it differs from the headword
+
+    Returns:
+        dict: "word", "key" (normalized cache key), "part_of_speech",
+            "difficulty" and "definition", or None if the entry has no definition
+    """
+    word = word_data.get("word", "")
+    for meaning in word_data.get("meanings", []):
+        for definition in meaning.get("definitions", [])[:1]:
+            text = (definition.get("definition") or "").strip()
+            if text:
+                return {"word": word, "key": cache.normalize_word(key or word),
+                        "part_of_speech": meaning.get("partOfSpeech") or "",
+                        "difficulty": _difficulty(word, word_data), "definition": text}
+    return None
+
+def get_candidates(index, question, needed):
+    """
+    Return the rows that can be distractors for a question.
+
+    Rows from the question's bucket are used when there are enough of them,
+    then rows of the same part of speech at any difficulty, then any rows.
+    Definitions of the word itself, or identical to the answer, are left out.
+
+    Args:
+        index (dict): The index
+        question (dict): Question from get_question()
+        needed (int): Distractors per quiz
+
+    Returns:
+        numpy.ndarray: Rows, each with a different definition
+    """
+    bucket = bucket_of(question["part_of_speech"], question["difficulty"])
+    part_start = bucket - bucket % len(TIERS)
+    indptr = index["indptr"]
+    answer_hash = np.uint64(hash_definition(question["definition"]))
+
+    candidates = np.array([], dtype=np.int64)
+    for start, end in ((indptr[bucket], indptr[bucket + 1]),
+                       (indptr[part_start], indptr[part_start + len(TIERS)]),
+                       (0, len(index["words"]))):
+        hashes = index["hashes"][start:end]
+        valid = (index["words"][start:end] != question["key"]) & (hashes != answer_hash)
+        # The same text can be in two buckets of a wider range
+        _, first = np.unique(hashes[valid], return_index=True)
+        candidates = np.flatnonzero(valid)[np.sort(first)] + start
+        if len(candidates) >= needed:
+            break
+    return candidates
+
+def _draw_distinct(count, size, k, rng):
+    """Draw count rows of k distinct numbers below size."""
+    if size <= 8 * k:
+        return np.argsort(rng.random((count, size)), axis=1)[:, :k]
+
+    picks = rng.integers(0, size, size=(count, k))
+    while True:
+        sorted_picks = np.sort(picks, axis=1)
+        repeated = (sorted_picks[:, 1:] == sorted_picks[:, :-1]).any(axis=1)
+        if not repeated.any():
+            return picks
+        picks[repeated] = rng.integers(0, size, size=(int(repeated.sum()), k))
+
+def make_quizzes(word_data, count=1, index=None, choices=None, rng=None, key=None):
+    """
+    Make quizzes on a word, each with its own distractors and answer position.
+
+    Args:
+        word_data (dict): Dictionary entry of the word
+        count (int): Number of quizzes
+        index (dict): Distractor index, the saved index if omitted
+        choices (int): Answers per quiz, QUIZ_CHOICES if omitted
+        rng (numpy.random.Generator): Source of randomness
+        key (str): Word the entry is cached under, if it differs from the headword
+
+    Returns:
+        list: Quizzes with "word", "part_of_speech", "difficulty", "question",
+            "options" and "answer" (position of the correct option); empty
+            if the word has no definition. With too few cached entries,
+            quizzes have fewer options.
+    """
+    question = get_question(word_data, key=key)
+    if question is None or count <= 0:
+        return []
+    index = get_index() if index is None else index
+    choices = choices or QUIZ_CHOICES
+    rng = rng or np.random.default_rng()
+
+    candidates = get_candidates(index, question, choices - 1)
+    k = min(choices - 1, len(candidates))
+    rows = candidates[_draw_distinct(count, len(candidates), k, rng)] if k else np.zeros((count, 0), dtype=np.int64)
+    answers = rng.integers(0, k + 1, size=count)
+
+    # Decode each definition once however many quizzes use it
+    texts = {row: get_definition(index, row) for row in np.unique(rows).tolist()}
+    quizzes = []
+    for quiz_rows, answer in zip(rows.tolist(), answers.tolist()):
+        options = [texts[row] for row in quiz_rows]
+        options.insert(answer, question["definition"])
+        quizzes.append({
+            "word": question["word"],
+            "part_of_speech": question["part_of_speech"],
+            "difficulty": question["difficulty"],
+            "question": f'Which definition matches "{question["word"]}"?',
+            "options": options,
+            "answer": answer
+        })
+    return quizzes
+
+def make_quiz(word_data, index=None, choices=None, rng=None, key=None):
+    """Make one quiz on a word, or return None if the word has no definition."""
+    quizzes = make_quizzes(word_data, 1, index=index, choices=choices, rng=rng, key=key)
+    return quizzes[0] if quizzes else None
+
+def iter_subscriber_quizzes(word_data, subscribers, index=None, choices=None, rng=None):
+    """
+    Yield (subscriber, quiz) pairs, making the quizzes in batches.
+
+    Args:
+        word_data (dict): Dictionary entry of the word
+        subscribers (iterable): Email addresses, read lazily
+        index (dict): Distractor index, loaded on the first subscriber if omitted
+        choices (int): Answers per quiz
+        rng (numpy.random.Generator): Source of randomness
+
+    Yields:
+        tuple: Address and its quiz (None if the word has no definition)
+    """
+    rng = rng or np.random.default_rng()
+    batch = []
+    for email in subscribers:
+        batch.append(email)
+        if len(batch) == BATCH_SIZE:
+            index = get_index() if index is None else index
+            quizzes = make_quizzes(word_data, len(batch), index=index, choices=choices, rng=rng)
+            yield from zip(batch, quizzes or [None] * len(batch))
+            batch = []
+    if batch:
+        index = get_index() if index is None else index
+        quizzes = make_quizzes(word_data, len(batch), index=index, choices=choices, rng=rng)
+        yield from zip(batch, quizzes or [None] * len(batch))
+
+def option_label(position):
+    """Return the letter of an option: A, B, C..."""
+    return chr(ord("A") + position)
+
+def render_quiz_text(quiz):
+    """Render a quiz as plain text, with the answer at the end."""
+    lines = ["Quiz", quiz["question"], ""]
+    lines.extend(f"{option_label(i)}. {option}" for i, option in enumerate(quiz["options"]))
+    lines.extend(["", f"Answer: {option_label(quiz['answer'])}"])
+    return "\n".join(lines)
+
+def render_quiz_html(quiz):
+    """Render a quiz as an HTML block for the daily email."""
+    # Formatted directly rather than with a template: this runs once per subscriber
+    options = "".join(f'<li style="margin-bottom:8px;"><strong>{option_label(i)}.</strong> {html.escape(option)}</li>'
+                      for i, option in enumerate(quiz["options"]))
+    return (
+        '<div style="max-width:600px; margin:0 auto; padding:16px 32px; background:#fefce8; border-radius:10px;">'
+        f'<p style="margin:0 0 8px; font-weight:600;">🧩 Quiz: {html.escape(quiz["question"])}</p>'
+        f'<ul style="list-style:none; padding-left:0; margin:0;">{options}</ul>'
+        # Folded away so it doesn't give the quiz away; clients without <details> show it unfolded
+        '<details style="margin:12px 0 0; color:#6b7280; font-size:12px;"><summary>Show the answer</summary>'
+        f'<p style="margin:4px 0 0;">{option_label(quiz["answer"])}</p></details>'
+        '</div>'
+    )
+
+def attach_quiz(artifact, quiz):
+    """
+    Return a copy of an email artifact with a quiz added at the end.
+
+    Args:
+        artifact (dict): Email artifact with "html" and "text" keys
+        quiz (dict): Quiz from make_quiz()
+
+    Returns:
+        dict: The artifact with the quiz in its HTML and text
+    """
+    block = render_quiz_html(quiz)
+    body = artifact["html"]
+    position = body.rfind("</body>")
+    return dict(
+        artifact,
+        html=body[:position] + block + body[position:] if position != -1 else body + block,
+        text=f"{artifact['text']}\n\n{render_quiz_text(quiz)}"
+    )
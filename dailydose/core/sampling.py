@@ -0,0 +1,305 @@
+"""
+Weighted word selection.
+
+Words are drawn with an alias table, so each draw takes constant time no
+matter how large the vocabulary is. Weights are split into blocks that each
+have their own alias table; changing a few weights only rebuilds the
+affected blocks and the small table over block totals.
+"""
+import os
+import sys
+import math
+import random
+import datetime
+import requests
+import numpy as np
+from .cache import PROJECT_ROOT
+from .difficulty import TIERS, get_difficulty_table, lookup_indices
+from .storage import get_word_history_dates
+from .seen_index import get_seen_index
+from .word_utils import get_word_list, get_random_word
+
+# Optional list of words that should never be chosen, one per line
+WORD_BLOCKLIST_FILE = os.environ.get("WORD_BLOCKLIST_FILE", os.path.join(PROJECT_ROOT, "blocklist.txt"))
+
+# Weight multipliers for words one tier away from, or further from, the target level
+LEVEL_NEIGHBOUR_WEIGHT = 0.3
+LEVEL_FAR_WEIGHT = 0.05
+
+# Days until a seen word is back to about two thirds of its full weight
+RECENCY_DAYS = float(os.environ.get("WORD_RECENCY_DAYS", "90"))
+
+# How strongly common words are preferred over rare ones (0 disables)
+FREQUENCY_BIAS = 1.0
+
+# Whether weighted selection may pick a word that is already in history
+ALLOW_REPEATS = os.environ.get("WORD_ALLOW_REPEATS", "false").lower() == "true"
+
+# Weight multiplier for words in the seen index when repeats aren't allowed.
+# Seen words are weighted down rather than excluded, so the recency decay still
+# decides which of them comes back first once few unseen words are left; 0
+# never repeats a word while an unseen one has weight
+SEEN_WEIGHT = float(os.environ.get("WORD_SEEN_WEIGHT", "0.01"))
+
+def parse_level(value):
+    """Return the tier name for a WORD_LEVEL setting, warning about and ignoring unknown levels."""
+    if not value:
+        return None
+    if value.capitalize() not in TIERS:
+        print(f"Warning: Ignoring unknown WORD_LEVEL '{value}' (use {', '.join(TIERS)}).")
+        return None
+    return value.capitalize()
+
+# Target difficulty level for weighted selection and planning: Basic, Intermediate or Advanced
+WORD_LEVEL = parse_level(os.environ.get("WORD_LEVEL"))
+
+class AliasTable:
+    """Walker/Vose alias table for drawing from a fixed discrete distribution."""
+
+    __slots__ = ("prob", "alias", "total")
+
+    def __init__(self, weights):
+        weights = [float(w) for w in weights]
+        n = len(weights)
+        self.total = sum(weights)
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        if n == 0 or self.total <= 0:
+            return
+
+        scaled = [w * n / self.total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large[-1]
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(large.pop())
+
+        # Whatever is left is 1 up to rounding error
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def draw(self, rng):
+        """Draw one index using the given random.Random instance."""
+        r = rng.random() * len(self.prob)
+        i = int(r)
+        return i if r - i < self.prob[i] else self.alias[i]
+
+class WeightedSampler:
+    """
+    Draw indices in proportion to their weights in O(1) per draw.
+
+    Args:
+        weights (array-like): Non-negative weight per item
+        block_size (int): Items per block, about sqrt(n) if omitted
+        rng (random.Random): Source of randomness
+    """
+
+    def __init__(self, weights, block_size=None, rng=None):
+        self.weights = np.asarray(weights, dtype=np.float64).copy()
+        if (self.weights < 0).any():
+            raise ValueError("Weights must not be negative")
+
+        n = len(self.weights)
+        self.block_size = block_size or max(1, int(math.sqrt(n)))
+        self.rng = rng or random.Random()
+
+        self.blocks = [
+            AliasTable(self.weights[start:start + self.block_size])
+            for start in range(0, n, self.block_size)
+        ]
+        self._rebuild_top()
+
+    def _rebuild_top(self):
+        self.top = AliasTable([block.total for block in self.blocks])
+
+    @property
+    def total(self):
+        """Sum of all weights."""
+        return self.top.total
+
+    def update(self, indices, values):
+        """
+        Change the weights of some items.
+
+        Only the blocks containing those items and the table over block
+        totals are rebuilt.
+
+        Args:
+            indices (array-like): Items to change
+            values (array-like or float): New weights
+        """
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), indices.shape)
+        if (values < 0).any():
+            raise ValueError("Weights must not be negative")
+
+        self.weights[indices] = values
+        for block in np.unique(indices // self.block_size):
+            start = int(block) * self.block_size
+            self.blocks[block] = AliasTable(self.weights[start:start + self.block_size])
+        self._rebuild_top()
+
+    def draw(self):
+        """Draw one index."""
+        if self.top.total <= 0:
+            raise ValueError("No items have a positive weight")
+
+        block = self.top.draw(self.rng)
+        return block * self.block_size + self.blocks[block].draw(self.rng)
+
+    def draw_many(self, count):
+        """Draw several indices (with replacement)."""
+        return [self.draw() for _ in range(count)]
+
+def get_blocklist(path=None):
+    """Read the set of words that must never be chosen."""
+    path = path or WORD_BLOCKLIST_FILE
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip().lower() for line in f if line.strip() and not line.startswith("#")}
+
+def compute_word_weights(words, difficulty_table=None, history=None, blocklist=None, level=None, today=None):
+    """
+    Compute a selection weight for every word in a frequency-ordered list.
+
+    The weight combines a mild preference for common words, how close the
+    word's difficulty tier is to the target level, how long ago the word was
+    last seen, and the blocklist.
+
+    Args:
+        words (list): Words, most frequent first
+        difficulty_table (dict): Table from dailydose.core.difficulty, needed for level
+        history (dict): Date last seen (YYYY-MM-DD) keyed by word
+        blocklist (set): Words that get zero weight
+        level (str or int): Target difficulty tier name or number
+        today (datetime.date): Reference date for recency, today if omitted
+
+    Returns:
+        np.ndarray: Weight per word
+    """
+    n = len(words)
+    rank = np.arange(n) / max(n - 1, 1)
+    weights = 1.0 / (1.0 + FREQUENCY_BIAS * rank)
+
+    if level is not None and difficulty_table is not None:
+        if isinstance(level, str):
+            level = TIERS.index(level)
+        rows = lookup_indices(difficulty_table, words)
+        tiers = np.where(rows >= 0, difficulty_table["tiers"][rows], level)
+        distance = np.abs(tiers.astype(np.int64) - level)
+        weights *= np.select([distance == 0, distance == 1], [1.0, LEVEL_NEIGHBOUR_WEIGHT], LEVEL_FAR_WEIGHT)
+
+    if history:
+        today = today or datetime.date.today()
+        index = {word: i for i, word in enumerate(words)}
+        for word, last_seen in history.items():
+            i = index.get(word)
+            if i is None:
+                continue
+            try:
+                days = (today - datetime.date.fromisoformat(last_seen)).days
+            except (TypeError, ValueError):
+                days = 0
+            weights[i] *= 1.0 - math.exp(-max(days, 0) / RECENCY_DAYS)
+
+    if blocklist:
+        blocked = [i for i, word in enumerate(words) if word in blocklist]
+        weights[blocked] = 0.0
+
+    return weights
+
+class WordPicker:
+    """
+    Weighted word selection for one run.
+
+    The word list, weights and sampler are built on the first pick and
+    reused after that; words rejected by the caller (e.g. not found in the
+    dictionary) are given zero weight with an update of their blocks, so
+    each retry is a constant-time draw. When no word has any weight left, a
+    uniformly random word is picked instead.
+
+    Args:
+        level (str): Target difficulty tier name, any level if omitted
+        rng (random.Random): Source of randomness
+    """
+
+    def __init__(self, level=None, rng=None):
+        self.level = level
+        self.rng = rng
+        self.words = None
+        self.sampler = None
+        self.index = None
+
+    def _build(self):
+        try:
+            words = get_word_list()
+        except requests.RequestException as e:
+            # Nothing to weight without the word list; fail like get_random_word()
+            print(f"Error fetching random word: {e}")
+            sys.exit(1)
+        table = get_difficulty_table(words) if self.level else None
+        weights = compute_word_weights(
+            words,
+            difficulty_table=table,
+            history=get_word_history_dates(),
+            blocklist=get_blocklist(),
+            level=self.level
+        )
+
+        # Weight down every word already seen, unless that would leave nothing to pick
+        if not ALLOW_REPEATS:
+            reduced = np.where(get_seen_index(words).seen_mask(), weights * SEEN_WEIGHT, weights)
+            if reduced.sum() > 0:
+                weights = reduced
+
+        self.words = words
+        self.index = {word: i for i, word in enumerate(words)}
+        self.sampler = WeightedSampler(weights, rng=self.rng)
+
+    def pick(self, skip=()):
+        """
+        Pick a word.
+
+        Args:
+            skip (iterable): Words that must not be picked
+
+        Returns:
+            str: The chosen word
+        """
+        if self.sampler is None:
+            self._build()
+
+        rejected = [self.index[word] for word in skip
+                    if word in self.index and self.sampler.weights[self.index[word]] > 0]
+        if rejected:
+            self.sampler.update(rejected, 0.0)
+
+        if self.sampler.total <= 0:
+            return get_random_word()
+        return self.words[self.sampler.draw()]
+
+def get_weighted_random_word(level=None, rng=None):
+    """
+    Pick a word, preferring common, unseen or long-unseen words at the target level.
+
+    Words already seen get SEEN_WEIGHT times their weight unless
+    WORD_ALLOW_REPEATS is set, in which case only the recency decay applies.
+    Use a WordPicker to pick several words without recomputing the weights.
+
+    Args:
+        level (str): Target difficulty tier name, any level if omitted
+        rng (random.Random): Source of randomness
+
+    Returns:
+        str: The chosen word
+    """
+    return WordPicker(level=level, rng=rng).pick()
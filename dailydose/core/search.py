@@ -0,0 +1,159 @@
+"""
+Full-text search over the definitions and examples of cached entries.
+
+An inverted index maps each term to the sorted ids of the words whose
+definitions or examples contain it. Words with an entry and terms are both
+kept in sorted arrays, so ids are positions found with a binary search,
+and the posting lists are stored back to back in one array (CSR style).
+Everything is saved as .npy files and memory-mapped on load, so a query
+reads only the posting lists of its terms.
+
+Like the word graph, the index is brought up to date with the dictionary
+cache on use, reading only entries cached since the last build.
+"""
+import os
+import re
+import numpy as np
+from . import cache
+
+SEARCH_INDEX_DIR = os.path.join(cache.CACHE_DIR, "search")
+
+_ARRAYS = ("words", "terms", "indptr", "postings")
+
+_TERM = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Too common to narrow a search down; left out of the index and of queries
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the "
+    "this to was were which with".split()
+)
+
+def tokenize(text):
+    """Split text into lowercase search terms, without stopwords."""
+    return [term for term in _TERM.findall(text.lower()) if term not in STOPWORDS]
+
+def entry_terms(entry):
+    """Return the set of terms in an entry's definitions and examples."""
+    terms = set()
+    for meaning in entry.get("meanings", []):
+        for definition in meaning.get("definitions", []):
+            terms.update(tokenize(definition.get("definition") or ""))
+            terms.update(tokenize(definition.get("example") or ""))
+    return terms
+
+def build_index(entries, index=None):
+    """
+    Build an index from dictionary entries, or merge them into an existing index.
+
+    Args:
+        entries (iterable): (word, entry) pairs, as from cache.iter_entries()
+        index (dict): Index to extend, a new one is built if omitted
+
+    Returns:
+        dict: "words" and "terms" (both sorted), and "indptr" and "postings":
+            the word ids containing terms[i] are postings[indptr[i]:indptr[i + 1]]
+    """
+    new_terms = {}
+    for word, entry in entries:
+        new_terms[word] = entry_terms(entry)
+
+    old_words = np.asarray(index["words"]) if index is not None else np.array([], dtype=str)
+    old_terms = np.asarray(index["terms"]) if index is not None else np.array([], dtype=str)
+    words = np.union1d(old_words, np.array(sorted(new_terms), dtype=str))
+    terms = np.union1d(old_terms, np.array(sorted(set().union(*new_terms.values())), dtype=str))
+
+    term_ids = []
+    word_ids = []
+    if index is not None:
+        # Ids shift when new words or terms sort before old ones
+        counts = np.diff(np.asarray(index["indptr"]))
+        term_ids.append(np.searchsorted(terms, old_terms)[np.repeat(np.arange(len(old_terms)), counts)])
+        word_ids.append(np.searchsorted(words, old_words)[np.asarray(index["postings"], dtype=np.int64)])
+    for word, found in new_terms.items():
+        if found:
+            term_ids.append(np.searchsorted(terms, np.array(sorted(found), dtype=str)))
+            word_ids.append(np.full(len(found), np.searchsorted(words, word)))
+
+    term_ids = np.concatenate(term_ids) if term_ids else np.array([], dtype=np.int64)
+    word_ids = np.concatenate(word_ids) if word_ids else np.array([], dtype=np.int64)
+    # Pairs from entries that were already indexed are duplicates; unique() drops them
+    size = max(len(words), 1)
+    keys = np.unique(term_ids.astype(np.int64) * size + word_ids)
+
+    indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // size, minlength=len(terms)), out=indptr[1:])
+    return {"words": words, "terms": terms, "indptr": indptr, "postings": (keys % size).astype(np.uint32)}
+
+def save_index(index, path=None):
+    """Save an index as a directory of .npy files, replacing any saved index."""
+    cache.save_arrays({name: index[name] for name in _ARRAYS}, path or SEARCH_INDEX_DIR)
+
+def load_index(path=None):
+    """Memory-map a saved index, or return None if there isn't one."""
+    return cache.load_arrays(path or SEARCH_INDEX_DIR, _ARRAYS, "search index")
+
+def get_index(rebuild=False):
+    """
+    Return the saved index, first adding any entries cached since it was built.
+
+    Args:
+        rebuild (bool): Build from the whole cache even if an index is saved
+
+    Returns:
+        dict: The index
+    """
+    index = None if rebuild else load_index()
+
+    indexed = set(np.asarray(index["words"])) if index is not None else set()
+    new_words = [word for word in cache.iter_cached_words() if word not in indexed]
+    if index is not None and not new_words:
+        return index
+
+    entries = ((word, entry) for word in new_words for entry in [cache.load_entry(word)] if entry is not None)
+    index = build_index(entries, index)
+    save_index(index)
+    return index
+
+def get_postings(index, term):
+    """Return the ids of the words containing a term, empty if no word does."""
+    terms = index["terms"]
+    position = int(np.searchsorted(terms, term))
+    if position == len(terms) or terms[position] != term:
+        return np.array([], dtype=np.uint32)
+    return index["postings"][index["indptr"][position]:index["indptr"][position + 1]]
+
+def search(index, query, limit=None):
+    """
+    Find the words whose definitions or examples contain every term of a query.
+
+    Args:
+        index (dict): The index
+        query (str): Search terms
+        limit (int): Most words to return, all if omitted
+
+    Returns:
+        list: Matching words, alphabetically
+    """
+    terms = set(tokenize(query))
+    if not terms:
+        return []
+
+    # Intersect the shortest posting lists first
+    postings = sorted((get_postings(index, term) for term in terms), key=len)
+    matches = np.asarray(postings[0])
+    for other in postings[1:]:
+        if not len(matches):
+            break
+        matches = np.intersect1d(matches, other, assume_unique=True)
+
+    return [str(word) for word in index["words"][matches[:limit]]]
+
+def find_snippet(entry, query):
+    """Return the first definition or example of an entry that contains a query term."""
+    terms = set(tokenize(query))
+    for meaning in entry.get("meanings", []):
+        for definition in meaning.get("definitions", []):
+            for text in (definition.get("definition") or "", definition.get("example") or ""):
+                if terms.intersection(tokenize(text)):
+                    return text
+    return None
@@ -0,0 +1,226 @@
+"""
+Compact "already seen" index over word history.
+
+Words from the word list are tracked in a bitset indexed by their position
+in the list. Words outside the list, and (subscriber, word) pairs, go into a
+Bloom filter. Neither structure ever reports a seen word as new; the Bloom
+filter may rarely report a new pair as seen.
+"""
+import os
+import math
+import struct
+import hashlib
+import threading
+import numpy as np
+from .cache import CACHE_DIR
+from .storage import iter_history_words
+
+SEEN_INDEX_FILE = os.path.join(CACHE_DIR, "seen.idx")
+
+# Expected number of (subscriber, word) pairs and acceptable false positive rate
+BLOOM_CAPACITY = int(os.environ.get("SEEN_INDEX_CAPACITY", "1000000"))
+BLOOM_ERROR_RATE = 0.001
+
+_MAGIC = b"DDSI"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBIIQB")
+
+# mark_seen() loads, updates and rewrites the file; persist and notify may call it at once
+_mark_lock = threading.Lock()
+
+class SeenBitset:
+    """A fixed-size set of small integers stored one bit each."""
+
+    __slots__ = ("size", "bits")
+
+    def __init__(self, size, bits=None):
+        self.size = size
+        self.bits = bytearray(bits) if bits is not None else bytearray((size + 7) // 8)
+
+    def add(self, index):
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, index):
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def to_mask(self):
+        """Return a boolean NumPy array with one entry per index."""
+        packed = np.frombuffer(bytes(self.bits), dtype=np.uint8)
+        return np.unpackbits(packed, bitorder="little")[:self.size].astype(bool)
+
+    def count(self):
+        """Number of indexes in the set."""
+        return int(self.to_mask().sum())
+
+class BloomFilter:
+    """
+    A Bloom filter over strings.
+
+    Args:
+        capacity (int): Number of items the filter is sized for
+        error_rate (float): False positive rate at that capacity
+    """
+
+    __slots__ = ("num_bits", "num_hashes", "bits")
+
+    def __init__(self, capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE, num_bits=None, num_hashes=None, bits=None):
+        if num_bits is None:
+            num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        if num_hashes is None:
+            num_hashes = max(1, round(num_bits / max(capacity, 1) * math.log(2)))
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray((num_bits + 7) // 8)
+
+    def _positions(self, key):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+def _read_exactly(f, length):
+    """Read length bytes from f, raising EOFError if the file ends first."""
+    data = f.read(length)
+    if len(data) != length:
+        raise EOFError(f"file is truncated ({len(data)} of {length} bytes left)")
+    return data
+
+def _word_list_digest(words):
+    """Fingerprint of a word list, so an index is never used with a different list."""
+    return hashlib.blake2b("\n".join(words).encode("utf-8"), digest_size=8).digest()
+
+class SeenIndex:
+    """
+    Membership index of seen words, globally and per subscriber.
+
+    Args:
+        words (list): The word list; positions in it index the bitset
+        bitset (SeenBitset): Globally seen words of the list
+        bloom (BloomFilter): Filter for other words and subscriber pairs
+    """
+
+    def __init__(self, words, bitset=None, bloom=None):
+        self.words = list(words)
+        self.positions = {word: i for i, word in enumerate(self.words)}
+        self.bitset = bitset or SeenBitset(len(self.words))
+        self.bloom = bloom or BloomFilter()
+
+    @staticmethod
+    def _key(word, subscriber):
+        return f"{subscriber}\0{word}" if subscriber else f"\0{word}"
+
+    def add(self, word, subscriber=None):
+        """Mark a word as seen, globally or by one subscriber."""
+        position = self.positions.get(word)
+        if subscriber is None and position is not None:
+            self.bitset.add(position)
+        else:
+            self.bloom.add(self._key(word, subscriber))
+
+    def seen(self, word, subscriber=None):
+        """Check whether a word was seen, globally or by one subscriber."""
+        position = self.positions.get(word)
+        if subscriber is None and position is not None:
+            return position in self.bitset
+        return self._key(word, subscriber) in self.bloom
+
+    def seen_mask(self):
+        """Return a boolean array marking the globally seen words of the word list."""
+        return self.bitset.to_mask()
+
+    def matches(self, words):
+        """Check whether the index was built for this word list."""
+        return _word_list_digest(self.words) == _word_list_digest(words)
+
+    def save(self, path=None):
+        """Write the index to disk, replacing any previous file atomically."""
+        path = path or SEEN_INDEX_FILE
+        word_bytes = "\n".join(self.words).encode("utf-8")
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(word_bytes), self.bitset.size,
+                                 self.bloom.num_bits, self.bloom.num_hashes))
+            f.write(word_bytes)
+            f.write(self.bitset.bits)
+            f.write(self.bloom.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Load a saved index.
+
+        Returns:
+            SeenIndex: The loaded index, or None if the file is missing,
+                truncated or unreadable
+        """
+        path = path or SEEN_INDEX_FILE
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                magic, version, words_length, size, num_bits, num_hashes = _HEADER.unpack(_read_exactly(f, _HEADER.size))
+                if magic != _MAGIC or version != _VERSION:
+                    return None
+                # A partly written file would otherwise load with missing seen bits
+                word_bytes = _read_exactly(f, words_length)
+                bitset = SeenBitset(size, _read_exactly(f, (size + 7) // 8))
+                bloom = BloomFilter(num_bits=num_bits, num_hashes=num_hashes, bits=_read_exactly(f, (num_bits + 7) // 8))
+        except (OSError, EOFError, struct.error) as e:
+            print(f"Warning: Ignoring unreadable seen-word index: {e}")
+            return None
+
+        words = word_bytes.decode("utf-8").split("\n") if word_bytes else []
+        return cls(words, bitset, bloom)
+
+def build_seen_index(words):
+    """Build an index from every word in the history backends."""
+    index = SeenIndex(words)
+    for word in iter_history_words():
+        index.add(word)
+    return index
+
+def get_seen_index(words, rebuild=False):
+    """
+    Return the saved seen-word index for a word list, building it from history if needed.
+
+    Args:
+        words (list): The word list
+        rebuild (bool): Rebuild from history even if a saved index exists
+
+    Returns:
+        SeenIndex: The index
+    """
+    index = None if rebuild else SeenIndex.load()
+    if index is None or not index.matches(words):
+        index = build_seen_index(words)
+        index.save()
+    return index
+
+def mark_seen(pairs):
+    """
+    Record seen words in the saved index, if there is one.
+
+    Args:
+        pairs (iterable): (word, subscriber) tuples; subscriber None marks
+            the word as seen globally
+    """
+    with _mark_lock:
+        index = SeenIndex.load()
+        if index is None:
+            return
+
+        for word, subscriber in pairs:
+            index.add(word, subscriber)
+        index.save()
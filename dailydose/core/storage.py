@@ -2,12 +2,24 @@
 Storage operations for word data, supporting both MongoDB and local file storage.
 """
 import os
+import re
 import json
+import shutil
+import tempfile
 import datetime
+import contextlib
 import pymongo
+from bson import Binary
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, OperationFailure
 from dotenv import load_dotenv
-from .word_utils import get_learning_difficulty
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-process use only
+    fcntl = None
+from .word_utils import get_learning_difficulty, get_derived_content
+from .models import WordEntry, dumps, loads
+from . import metrics, compression
 
 # Load environment variables from .env file if it exists
 load_dotenv()
@@ -17,11 +29,21 @@ MONGODB_URI = os.environ.get("MONGODB_URI", None)  # Can be set via environment
 MONGODB_DB_NAME = os.environ.get("MONGODB_DB_NAME", "word_learning")
 MONGODB_COLLECTION = os.environ.get("MONGODB_COLLECTION", "word_history")
 
+# Local history file, used as a fallback and alongside MongoDB
+HISTORY_FILE = "word_history.json"
+
 # MongoDB client - will be initialized if connection string is provided
 mongo_client = None
 db = None
 word_collection = None
 
+# Dictionary fields of a MongoDB history document, stored compressed as "payload"
+_PAYLOAD_FIELDS = ("phonetics", "meanings")
+
+# Start of the entry array in a history file, and what may separate its entries
+_WORDS_ARRAY = re.compile(r'"words"\s*:\s*\[')
+_ARRAY_SEPARATORS = " \t\r\n,"
+
 def initialize_mongodb():
     """Initialize MongoDB connection if a connection string is provided"""
     global mongo_client, db, word_collection
@@ -64,53 +86,182 @@ def save_to_mongodb(word, info):
     try:
         today = datetime.datetime.now().strftime("%Y-%m-%d")
         
-        # Check if word already exists in database
-        existing_word = word_collection.find_one({"word": word})
-        
-        if existing_word:
-            # Update existing word
-            word_collection.update_one(
-                {"word": word},
-                {
-                    "$inc": {"review_count": 1},
-                    "$set": {"last_reviewed": today}
-                }
-            )
-        else:
-            # Insert new word
-            word_data = {
-                "word": word,
-                "date_added": today,
-                "last_reviewed": today,
-                "review_count": 1,
-                "difficulty": get_learning_difficulty(word)
-            }
-            
-            # Add some word info for future reference
-            if info:
-                word_data["phonetics"] = info.get("phonetics", [])
-                word_data["meanings"] = info.get("meanings", [])
+        with metrics.timer("storage_save", backend="mongo"):
+            # Check if word already exists in database
+            existing_word = word_collection.find_one({"word": word})
             
-            word_collection.insert_one(word_data)
+            if existing_word:
+                # Update existing word
+                word_collection.update_one(
+                    {"word": word},
+                    {
+                        "$inc": {"review_count": 1},
+                        "$set": {"last_reviewed": today}
+                    }
+                )
+            else:
+                # Insert new word
+                word_data = {
+                    "word": word,
+                    "date_added": today,
+                    "last_reviewed": today,
+                    "review_count": 1,
+                    "difficulty": get_derived_content(info)["difficulty"] if info else get_learning_difficulty(word)
+                }
+                
+                # Add some word info for future reference, without the fields we never read
+                if info:
+                    entry = WordEntry.coerce(info).to_dict()
+                    word_data["phonetics"] = entry.get("phonetics", [])
+                    word_data["meanings"] = entry.get("meanings", [])
+                
+                word_collection.insert_one(pack_document(word_data))
         
         return True
     except Exception as e:
         print(f"Error saving to MongoDB: {e}")
         return False
 
-def save_to_file(word, info):
-    """Save word to history file for spaced repetition learning"""
-    history_file = "word_history.json"
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
+def pack_document(doc):
+    """
+    Move a history document's dictionary fields into one compressed "payload".
+
+    Documents are returned unchanged while compression is off (see
+    dailydose.core.compression) or when they hold no dictionary fields.
+    """
+    fields = {key: doc[key] for key in _PAYLOAD_FIELDS if key in doc}
+    if not fields or compression.get_codec() is None:
+        return doc
+    
+    packed = {key: value for key, value in doc.items() if key not in _PAYLOAD_FIELDS}
+    packed["payload"] = Binary(compression.compress(dumps(fields)))
+    return packed
+
+def unpack_document(doc):
+    """Expand a document's compressed "payload" back into its dictionary fields."""
+    if "payload" not in doc:
+        return doc
+    
+    unpacked = {key: value for key, value in doc.items() if key != "payload"}
+    unpacked.update(loads(compression.decompress(doc["payload"])))
+    return unpacked
+
+@contextlib.contextmanager
+def history_lock():
+    """
+    Hold an exclusive advisory lock on the history file.
     
-    if os.path.exists(history_file):
+    The lock lives in a separate HISTORY_FILE + ".lock" file, so it survives
+    the history file being replaced. Readers don't need it: every write
+    replaces the file atomically.
+    """
+    fd = os.open(f"{HISTORY_FILE}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+def write_history(history):
+    """
+    Replace the history file atomically.
+    
+    The new content is written to a temporary file in the same directory,
+    flushed to disk and renamed over the old file, so a crash leaves either
+    the old or the new history, never a truncated one.
+    """
+    directory = os.path.dirname(os.path.abspath(HISTORY_FILE))
+    fd, tmp_path = tempfile.mkstemp(prefix=".word_history.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(history, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, HISTORY_FILE)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    # Make the rename itself durable (not supported on every platform)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+def append_journal(entry):
+    """Record an entry in the write-ahead journal before it is written to the history file."""
+    with open(f"{HISTORY_FILE}.journal", 'a') as f:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_journal():
+    """Return the journaled entries, ignoring a last line cut off by a crash."""
+    journal_file = f"{HISTORY_FILE}.journal"
+    if not os.path.exists(journal_file):
+        return []
+    
+    entries = []
+    with open(journal_file, 'r') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return entries
+
+def clear_journal():
+    """Empty the journal once its entries are safely in the history file."""
+    journal_file = f"{HISTORY_FILE}.journal"
+    if os.path.exists(journal_file):
+        os.remove(journal_file)
+
+def load_history():
+    """
+    Load the history file, recovering from an interrupted write.
+    
+    Entries left in the journal by a crash are added back. A damaged history
+    file (e.g. one truncated by an older version) is copied aside and the
+    entries that can still be read are kept, instead of starting over.
+    
+    Returns:
+        tuple: (history dict, whether anything was recovered)
+    """
+    history = {"words": []}
+    recovered = False
+    
+    if os.path.exists(HISTORY_FILE):
         try:
-            with open(history_file, 'r') as f:
+            with open(HISTORY_FILE, 'r') as f:
                 history = json.load(f)
         except json.JSONDecodeError:
-            history = {"words": []}
-    else:
-        history = {"words": []}
+            history = {"words": list(iter_history_file(HISTORY_FILE))}
+            backup_file = f"{HISTORY_FILE}.corrupt"
+            shutil.copyfile(HISTORY_FILE, backup_file)
+            print(f"Warning: {HISTORY_FILE} was damaged. Recovered {len(history['words'])} words; "
+                  f"the damaged file was copied to {backup_file}.")
+            recovered = True
+    
+    known = {entry["word"] for entry in history["words"]}
+    for entry in read_journal():
+        if entry["word"] not in known:
+            history["words"].append(entry)
+            known.add(entry["word"])
+            recovered = True
+    
+    return history, recovered
+
+@metrics.timed("storage_save", backend="file")
+def save_to_file(word, info):
+    """Save word to history file for spaced repetition learning"""
+    today = datetime.datetime.now().strftime("%Y-%m-%d")
     
     # Add word to history
     word_entry = {
@@ -120,17 +271,25 @@ def save_to_file(word, info):
         "next_review": today
     }
     
-    # Check if word already exists in history
-    for entry in history["words"]:
-        if entry["word"] == word:
-            entry["review_count"] += 1
-            return
-    
-    history["words"].append(word_entry)
-    
-    # Save updated history
-    with open(history_file, 'w') as f:
-        json.dump(history, f, indent=2)
+    # Hold the lock from read to write so concurrent runs don't lose each other's words
+    with history_lock():
+        history, recovered = load_history()
+        if recovered:
+            write_history(history)
+            clear_journal()
+        
+        # Check if word already exists in history
+        for entry in history["words"]:
+            if entry["word"] == word:
+                entry["review_count"] += 1
+                return
+        
+        history["words"].append(word_entry)
+        
+        # Journal first, so a crash during the rewrite can't lose the word
+        append_journal(word_entry)
+        write_history(history)
+        clear_journal()
 
 def save_word_history(word, info):
     """Save word to history using available methods"""
@@ -140,4 +299,127 @@ def save_word_history(word, info):
     # Always save to file as fallback
     save_to_file(word, info)
     
-    return mongo_success 
\ No newline at end of file
+    return mongo_success
+
+def _read_history_file():
+    """Return the entries of the local history file, empty if it is missing or unreadable."""
+    if not os.path.exists(HISTORY_FILE):
+        return []
+    
+    try:
+        with open(HISTORY_FILE, 'r') as f:
+            return json.load(f)["words"]
+    except (OSError, json.JSONDecodeError, KeyError):
+        return []
+
+def get_recent_words(count):
+    """
+    Get the most recently added words from history, newest first.
+    
+    MongoDB is used when connected, otherwise the local history file.
+    
+    Args:
+        count (int): Maximum number of words to return
+        
+    Returns:
+        list: Words, newest first
+    """
+    if word_collection is not None:
+        try:
+            cursor = word_collection.find({}, {"word": 1}).sort(
+                [("date_added", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)]
+            ).limit(count)
+            return [doc["word"] for doc in cursor]
+        except Exception as e:
+            print(f"Error reading history from MongoDB: {e}. Using local file storage.")
+    
+    # Entries are appended in the order they were added
+    return [entry["word"] for entry in reversed(_read_history_file()[-count:])] if count > 0 else []
+
+def get_word_history_dates():
+    """
+    Get the date each word in history was last seen.
+    
+    Returns:
+        dict: Date as YYYY-MM-DD keyed by word
+    """
+    if word_collection is not None:
+        try:
+            cursor = word_collection.find({}, {"word": 1, "last_reviewed": 1, "date_added": 1})
+            return {doc["word"]: doc.get("last_reviewed") or doc.get("date_added") for doc in cursor}
+        except Exception as e:
+            print(f"Error reading history from MongoDB: {e}. Using local file storage.")
+    
+    return {entry["word"]: entry.get("date_added") for entry in _read_history_file()}
+
+def iter_history_file(path=None, chunk_size=65536):
+    """
+    Yield the entries of a history file one at a time.
+    
+    The "words" array is parsed incrementally, so memory use is bounded by
+    the chunk size and the largest single entry rather than the file size.
+    A file that ends before the array is closed yields the complete entries
+    before the cut.
+    
+    Args:
+        path (str): History file, HISTORY_FILE if omitted
+        chunk_size (int): Characters to read at a time
+        
+    Yields:
+        dict: History entries, in file order
+    """
+    path = path or HISTORY_FILE
+    if not os.path.exists(path):
+        return
+    
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        # Read up to the opening bracket of the "words" array
+        buffer = ""
+        match = None
+        while match is None:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buffer += chunk
+            match = _WORDS_ARRAY.search(buffer)
+        
+        pos = match.end()
+        eof = False
+        while True:
+            while pos < len(buffer) and buffer[pos] in _ARRAY_SEPARATORS:
+                pos += 1
+            
+            if pos < len(buffer):
+                if buffer[pos] == "]":
+                    return
+                try:
+                    entry, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    # Usually an entry cut off at the end of the buffer
+                    if eof:
+                        print(f"Warning: Stopped reading {path} at an unreadable entry: {e}")
+                        return
+                else:
+                    pos = end
+                    yield entry
+                    continue
+            elif eof:
+                return
+            
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+def iter_history_words():
+    """Yield every word in history, from MongoDB (if connected) and the local file."""
+    if word_collection is not None:
+        try:
+            for doc in word_collection.find({}, {"word": 1}).batch_size(1000):
+                yield doc["word"]
+        except Exception as e:
+            print(f"Error reading history from MongoDB: {e}")
+    
+    for entry in iter_history_file():
+        yield entry["word"]
@@ -0,0 +1,239 @@
+"""
+Suppression list of addresses that must not be emailed.
+
+Addresses that bounced permanently or complained are added from SES
+notifications (an SNS-to-SQS queue or an exported file) or from a plain list.
+Only a 64-bit hash of each normalized address is kept: on disk as a sorted
+uint64 array (8 bytes per address), and in memory as a set of ints, so
+checking a subscriber is a constant-time set lookup even at millions of
+entries.
+"""
+import os
+import json
+import hashlib
+import contextlib
+import numpy as np
+import boto3
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-process use only
+    fcntl = None
+from .cache import CACHE_DIR
+from .log import get_logger
+from . import email_service
+
+SUPPRESSION_FILE = os.environ.get("SUPPRESSION_FILE") or os.path.join(CACHE_DIR, "suppressed.npy")
+
+# SQS queue subscribed to the SES bounce and complaint SNS topics
+SUPPRESSION_QUEUE_URL = os.environ.get("SUPPRESSION_QUEUE_URL") or None
+
+logger = get_logger("suppression")
+
+# Hashes loaded by this process
+_suppressed = None
+
+def normalize_address(email):
+    """Return the form of an address used for matching: trimmed and lowercase."""
+    return email.strip().lower()
+
+def hash_address(email):
+    """Return the 64-bit hash of a normalized address."""
+    digest = hashlib.blake2b(normalize_address(email).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def load_suppressed(path=None):
+    """
+    Return the set of suppressed address hashes, reading the file once per process.
+
+    Args:
+        path (str): Suppression file, SUPPRESSION_FILE if omitted
+
+    Returns:
+        set: Address hashes
+    """
+    global _suppressed
+    if path is None and _suppressed is not None:
+        return _suppressed
+
+    hashes = set()
+    file_path = path or SUPPRESSION_FILE
+    if os.path.exists(file_path):
+        try:
+            hashes = set(np.load(file_path, allow_pickle=False).tolist())
+        except (OSError, ValueError) as e:
+            logger.warning("suppression_list_unreadable", extra={"path": file_path, "error": str(e)})
+
+    if path is None:
+        _suppressed = hashes
+    return hashes
+
+def reload():
+    """Forget the loaded suppression list, e.g. after another process added to it."""
+    global _suppressed
+    _suppressed = None
+
+@contextlib.contextmanager
+def _file_lock(path):
+    fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+def suppress(addresses, path=None):
+    """
+    Add addresses to the suppression list.
+
+    Args:
+        addresses (iterable): Email addresses
+        path (str): Suppression file, SUPPRESSION_FILE if omitted
+
+    Returns:
+        dict: "added" (new addresses) and "total" counts
+    """
+    path = path or SUPPRESSION_FILE
+    new = np.fromiter((hash_address(email) for email in addresses if email.strip()), dtype=np.uint64)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with _file_lock(path):
+        existing = np.load(path, allow_pickle=False) if os.path.exists(path) else np.array([], dtype=np.uint64)
+        merged = np.union1d(existing, new).astype(np.uint64)
+        added = len(merged) - len(existing)
+        if added:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, merged, allow_pickle=False)
+            os.replace(tmp_path, path)
+
+    if path == SUPPRESSION_FILE:
+        reload()
+    return {"added": added, "total": len(merged)}
+
+def is_suppressed(email, suppressed=None):
+    """Check whether an address is on the suppression list."""
+    suppressed = load_suppressed() if suppressed is None else suppressed
+    return hash_address(email) in suppressed
+
+def filter_subscribers(addresses, suppressed=None):
+    """
+    Yield the addresses that aren't on the suppression list.
+
+    Args:
+        addresses (iterable): Email addresses, read lazily
+        suppressed (set): Address hashes, the saved list if omitted
+    """
+    suppressed = load_suppressed() if suppressed is None else suppressed
+    for email in addresses:
+        if not suppressed or hash_address(email) not in suppressed:
+            yield email
+
+def parse_ses_notification(notification):
+    """
+    Return the addresses an SES notification says should be suppressed.
+
+    Accepts SES bounce and complaint notifications, as published to SNS or
+    by an event destination, whether or not they are still wrapped in the
+    SNS envelope. Only permanent bounces count; transient ones (full
+    mailbox, throttling) are retried.
+
+    Args:
+        notification (dict or str): The notification, decoded or as JSON
+
+    Returns:
+        list: Addresses to suppress, empty for other notifications
+    """
+    if isinstance(notification, str):
+        notification = json.loads(notification)
+    if "Message" in notification and notification.get("Type") == "Notification":
+        return parse_ses_notification(notification["Message"])
+
+    kind = notification.get("notificationType") or notification.get("eventType")
+    if kind == "Bounce":
+        bounce = notification.get("bounce", {})
+        if bounce.get("bounceType") != "Permanent":
+            return []
+        recipients = bounce.get("bouncedRecipients", [])
+    elif kind == "Complaint":
+        recipients = notification.get("complaint", {}).get("complainedRecipients", [])
+    else:
+        return []
+    return [recipient["emailAddress"] for recipient in recipients if recipient.get("emailAddress")]
+
+def iter_import_addresses(path):
+    """
+    Yield the addresses to suppress from an import file.
+
+    Each line is either an address or an SES notification as JSON (for
+    example a dump of the SQS queue); blank lines and # comments are skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                try:
+                    yield from parse_ses_notification(line)
+                except (ValueError, AttributeError, TypeError) as e:
+                    logger.warning("notification_unreadable", extra={"line": line_number, "error": str(e)})
+            else:
+                yield line
+
+def import_suppressions(path):
+    """Add every address in an import file to the suppression list."""
+    return suppress(iter_import_addresses(path))
+
+def poll_ses_queue(queue_url=None, sqs_client=None, max_batches=100):
+    """
+    Read SES bounce and complaint notifications from an SQS queue into the suppression list.
+
+    Messages are deleted from the queue once their addresses are saved.
+
+    Args:
+        queue_url (str): Queue URL, SUPPRESSION_QUEUE_URL if omitted
+        sqs_client: boto3 SQS client, created from the AWS settings if omitted
+        max_batches (int): Most receive calls (of up to 10 messages each)
+
+    Returns:
+        dict: "messages" read, "added" addresses and "total" suppressed
+
+    Raises:
+        ValueError: If no queue URL is configured
+    """
+    queue_url = queue_url or SUPPRESSION_QUEUE_URL
+    if not queue_url:
+        raise ValueError("No queue URL. Set SUPPRESSION_QUEUE_URL or pass --queue-url.")
+    if sqs_client is None:
+        sqs_client = boto3.client(
+            "sqs",
+            region_name=email_service.AWS_REGION,
+            aws_access_key_id=email_service.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=email_service.AWS_SECRET_ACCESS_KEY
+        )
+
+    result = {"messages": 0, "added": 0, "total": len(load_suppressed())}
+    for _ in range(max_batches):
+        messages = sqs_client.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10,
+                                              WaitTimeSeconds=1).get("Messages", [])
+        if not messages:
+            break
+
+        addresses = []
+        for message in messages:
+            try:
+                addresses.extend(parse_ses_notification(message["Body"]))
+            except (ValueError, AttributeError, TypeError) as e:
+                logger.warning("notification_unreadable",
+                               extra={"message_id": message.get("MessageId"), "error": str(e)})
+        saved = suppress(addresses)
+
+        sqs_client.delete_message_batch(QueueUrl=queue_url, Entries=[
+            {"Id": str(i), "ReceiptHandle": message["ReceiptHandle"]} for i, message in enumerate(messages)
+        ])
+        result["messages"] += len(messages)
+        result["added"] += saved["added"]
+        result["total"] = saved["total"]
+    return result
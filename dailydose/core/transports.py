@@ -0,0 +1,242 @@
+"""
+Email transports: how a finished email artifact reaches a recipient.
+
+SESTransport calls the SES SendEmail API, one request per email.
+SMTPTransport talks to any SMTP server (a mail relay, a provider's
+submission port, or a local stand-in) through a pool of persistent,
+authenticated connections. Each connection carries many messages and is
+replaced when the server drops it.
+
+A transport's send() returns the message id, or raises TransportError when
+the email is refused.
+"""
+import ssl
+import queue
+import smtplib
+import threading
+from email import policy
+from email.message import EmailMessage
+from email.utils import make_msgid
+
+class TransportError(Exception):
+    """An email could not be delivered to the transport."""
+
+class Transport:
+    """Base class for email transports."""
+
+    # Used in metric names, e.g. "ses_send"
+    name = "transport"
+
+    def send(self, sender, recipient, artifact):
+        """
+        Send an email artifact to one recipient.
+
+        Args:
+            sender (str): From address
+            recipient (str): To address
+            artifact (dict): Artifact with "subject", "html" and "text" keys
+
+        Returns:
+            str: The message id
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release connections held by the transport."""
+
+class SESTransport(Transport):
+    """
+    Send through the SES SendEmail API.
+
+    Args:
+        client: boto3 SES client
+    """
+
+    name = "ses"
+
+    def __init__(self, client):
+        self.client = client
+
+    def send(self, sender, recipient, artifact):
+        response = self.client.send_email(
+            Source=sender,
+            Destination={
+                'ToAddresses': [recipient]
+            },
+            Message={
+                'Subject': {
+                    'Data': artifact["subject"],
+                    'Charset': 'UTF-8'
+                },
+                'Body': {
+                    'Html': {
+                        'Data': artifact["html"],
+                        'Charset': 'UTF-8'
+                    },
+                    'Text': {
+                        'Data': artifact["text"],
+                        'Charset': 'UTF-8'
+                    }
+                }
+            }
+        )
+        return response["MessageId"]
+
+def build_mime_message(sender, recipient, artifact):
+    """
+    Build a multipart/alternative message with the artifact's text and HTML parts.
+
+    Without a recipient, the To and Message-ID headers are left out.
+    """
+    message = EmailMessage()
+    message["From"] = sender
+    if recipient is not None:
+        message["To"] = recipient
+        message["Message-ID"] = make_msgid(domain=sender.rpartition("@")[2] or None)
+    message["Subject"] = artifact["subject"]
+    message.set_content(artifact["text"])
+    message.add_alternative(artifact["html"], subtype="html")
+    return message
+
+class SMTPTransport(Transport):
+    """
+    Send over SMTP through a pool of persistent connections.
+
+    Connections are opened on demand, up to pool_size at once, and kept
+    open between sends. A connection is closed after max_messages messages
+    (many servers limit messages per session) and reopened when the server
+    has dropped it or closed it with a 421 reply, in which case the message
+    is retried once on a newly opened connection.
+
+    Args:
+        host (str): SMTP server
+        port (int): SMTP port
+        username (str): Login name, no login if omitted
+        password (str): Login password
+        security (str): "starttls", "ssl" (implicit TLS) or "none"
+        pool_size (int): Most connections open at once
+        timeout (float): Socket timeout in seconds
+        max_messages (int): Messages per connection before it is replaced
+    """
+
+    name = "smtp"
+
+    def __init__(self, host, port=587, username=None, password=None, security="starttls",
+                 pool_size=4, timeout=30.0, max_messages=100):
+        if security not in ("starttls", "ssl", "none"):
+            raise ValueError(f"Unknown SMTP security '{security}' (use starttls, ssl or none)")
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.security = security
+        self.timeout = timeout
+        self.max_messages = max_messages
+        # Idle connections as [connection, messages sent], most recently used first
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        # (sender, artifact, message bytes without To and Message-ID) of the last artifact sent
+        self._rendered = None
+        self.connections_opened = 0
+
+    def _connect(self):
+        if self.security == "ssl":
+            connection = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout,
+                                          context=ssl.create_default_context())
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == "starttls":
+                connection.starttls(context=ssl.create_default_context())
+        try:
+            if self.username:
+                connection.login(self.username, self.password or "")
+        except BaseException:
+            _quit(connection)
+            raise
+        self.connections_opened += 1
+        return [connection, 0]
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _checkin(self, pooled):
+        if pooled[1] >= self.max_messages:
+            _quit(pooled[0])
+        else:
+            self._idle.put(pooled)
+
+    def _prepare_message(self, sender, recipient, artifact):
+        # Every recipient of an artifact gets the same message apart from two
+        # headers, so it is built and flattened once
+        rendered = self._rendered
+        if rendered is None or rendered[0] != sender or rendered[1] is not artifact:
+            body = build_mime_message(sender, None, artifact).as_bytes(policy=policy.SMTP)
+            rendered = self._rendered = (sender, artifact, body)
+
+        message_id = make_msgid(domain=sender.rpartition("@")[2] or None)
+        try:
+            headers = f"To: {recipient}\r\nMessage-ID: {message_id}\r\n".encode("ascii")
+        except UnicodeEncodeError:
+            # Internationalized address: send_message() negotiates SMTPUTF8 for it
+            message = build_mime_message(sender, recipient, artifact)
+            return message["Message-ID"], message
+        return message_id, headers + rendered[2]
+
+    def send(self, sender, recipient, artifact):
+        message_id, message = self._prepare_message(sender, recipient, artifact)
+
+        with self._slots:
+            for attempt in range(2):
+                try:
+                    # The retry opens a new connection: other idle connections
+                    # may have been closed by the server as well
+                    pooled = self._connect() if attempt else self._checkout()
+                except (smtplib.SMTPException, OSError) as e:
+                    raise TransportError(f"Could not connect to {self.host}:{self.port}: {e}")
+
+                try:
+                    if isinstance(message, bytes):
+                        pooled[0].sendmail(sender, [recipient], message)
+                    else:
+                        pooled[0].send_message(message)
+                except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                    if pooled[0].sock is not None:
+                        # Refused message, but the session is still usable
+                        self._checkin(pooled)
+                        if isinstance(e, smtplib.SMTPRecipientsRefused):
+                            raise TransportError(f"Recipient refused: {e.recipients}")
+                        raise TransportError(str(e))
+                    # 421: the server is closing the session (smtplib has closed
+                    # it); retry once on a new one
+                    _quit(pooled[0])
+                    if attempt:
+                        raise TransportError(str(e))
+                    continue
+                except OSError as e:
+                    # Also SMTPServerDisconnected: probably an idle connection the
+                    # server closed; retry once on a new one
+                    _quit(pooled[0])
+                    if attempt:
+                        raise TransportError(f"SMTP connection failed: {e}")
+                    continue
+
+                pooled[1] += 1
+                self._checkin(pooled)
+                return message_id
+
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _quit(connection)
+
+def _quit(connection):
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
@@ -1,20 +1,47 @@
 """
 Utility functions for word processing and analysis.
 """
+import os
 import requests
 import random
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from . import cache, difficulty, metrics
+from .morphology import analyze_word, set_known_words
+from .models import WordEntry
+
+# Word list and dictionary API locations (overridable, e.g. to point at a local stand-in)
+WORD_LIST_URL = os.environ.get("WORD_LIST_URL", "https://www.mit.edu/~ecprice/wordlist.10000")
+DICTIONARY_API_URL = os.environ.get("DICTIONARY_API_URL", "https://api.dictionaryapi.dev/api/v2/entries/en")
+
+# Shortest word that is ever picked
+MIN_WORD_LENGTH = 4
+
+@metrics.timed("word_fetch")
+def get_word_list():
+    """
+    Fetch the list of common English words, skipping very short words
+    
+    Raises:
+        requests.RequestException: If the word list can't be downloaded
+    """
+    # Get a list of words
+    response = requests.get(WORD_LIST_URL)
+    if response.status_code != 200:
+        raise requests.HTTPError(f"Word list request failed with status {response.status_code}")
+    words = response.content.decode('utf-8').splitlines()
+    
+    # Filter out very short words
+    words = [word for word in words if len(word) >= MIN_WORD_LENGTH]
+    
+    # Affixes are only split off stems found in the list
+    set_known_words(words)
+    return words
 
 def get_random_word():
     """Fetch a random word from a list of common English words"""
     try:
-        # Get a list of words
-        word_site = "https://www.mit.edu/~ecprice/wordlist.10000"
-        response = requests.get(word_site)
-        words = response.content.decode('utf-8').splitlines()
-        
-        # Filter out very short words
-        words = [word for word in words if len(word) > 3]
+        words = get_word_list()
         
         # Pick a random word
         return random.choice(words)
@@ -22,20 +49,79 @@ def get_random_word():
         print(f"Error fetching random word: {e}")
         sys.exit(1)
 
+def get_random_words(count):
+    """Fetch several distinct random words with a single word list download"""
+    try:
+        words = get_word_list()
+        return random.sample(words, min(count, len(words)))
+    except Exception as e:
+        print(f"Error fetching random words: {e}")
+        sys.exit(1)
+
 def get_word_info(word):
     """Get detailed information about a word using Free Dictionary API"""
     try:
-        url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-        response = requests.get(url)
+        url = f"{DICTIONARY_API_URL}/{word}"
+        with metrics.timer("dictionary_lookup"):
+            response = requests.get(url)
         
         if response.status_code == 200:
-            return response.json()[0]
+            metrics.increment("dictionary_lookups", result="found")
+            return WordEntry.from_json(response.content)
         else:
+            metrics.increment("dictionary_lookups", result="not_found")
             return None
     except Exception as e:
+        metrics.increment("dictionary_lookups", result="error")
         print(f"Error fetching word information: {e}")
         return None
 
+def get_cached_word_info(word):
+    """Get word information from the local cache, fetching and caching it on a miss"""
+    word_info = cache.load_entry(word)
+    if word_info is None or word_info.get("derived", {}).get("version") != DERIVED_CONTENT_VERSION:
+        metrics.increment("cache_lookups", cache="dictionary", result="miss")
+        word_info = word_info or get_word_info(word)
+        if word_info:
+            # Cache the derived content alongside the dictionary entry
+            word_info = WordEntry.coerce(word_info)
+            get_derived_content(word_info)
+            cache.save_entry(word, word_info)
+    else:
+        metrics.increment("cache_lookups", cache="dictionary", result="hit")
+    return word_info
+
+def get_word_infos(words, max_workers=8):
+    """
+    Get information for several words at once.
+    
+    Cached entries are returned directly; the rest are fetched from the
+    dictionary API concurrently.
+    
+    Args:
+        words (list): Words to look up
+        max_workers (int): Maximum number of concurrent API requests
+        
+    Returns:
+        dict: Word information keyed by word, None for words that weren't found
+    """
+    results = {}
+    missing = []
+    for word in dict.fromkeys(words):
+        word_info = cache.load_entry(word)
+        if word_info is None:
+            missing.append(word)
+        else:
+            metrics.increment("cache_lookups", cache="dictionary", result="hit")
+            results[word] = word_info
+    
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+            for word, word_info in zip(missing, executor.map(get_cached_word_info, missing)):
+                results[word] = word_info
+    
+    return results
+
 def get_etymology(word):
     """Get etymology information about a word using Etymonline API"""
     try:
@@ -47,53 +133,86 @@ def get_etymology(word):
         return "Etymology information not available."
 
 def get_learning_difficulty(word):
-    """Estimate the learning difficulty of a word based on various factors"""
+    """
+    Return the learning difficulty of a word: Basic, Intermediate or Advanced.
+    
+    Words in the saved difficulty table get their tier from it, the same tier
+    WORD_LEVEL and plan --level choose by. Other words are estimated from
+    their length and roots.
+    """
+    tier = difficulty.lookup_tier(word)
+    if tier is not None:
+        return tier
+    
     length = len(word)
     
     if length <= 5:
-        return "Basic"
+        tier = 0
     elif length <= 8:
-        return "Intermediate"
+        tier = 1
     else:
-        return "Advanced"
+        tier = 2
+    
+    # Several Greek or Latin roots mark academic vocabulary ("biology"), so such
+    # a word moves up one level; a single root ("phone") doesn't change it
+    if tier < 2 and len(analyze_word(word)["roots"]) >= 2:
+        tier += 1
+    
+    return ("Basic", "Intermediate", "Advanced")[tier]
 
 def get_memory_tip(word):
     """Generate a simple memory tip for the word"""
     if len(word) <= 4:
         return "Short words are often foundational vocabulary - practice using it in everyday conversation."
     
-    # Check if word contains common prefixes
-    prefixes = {
-        "un": "The prefix 'un-' often means 'not' or indicates a reversal of action.",
-        "re": "The prefix 're-' often means 'again' or 'back'.",
-        "pre": "The prefix 'pre-' often means 'before'.",
-        "post": "The prefix 'post-' often means 'after'.",
-        "in": "The prefix 'in-' can mean 'not' or 'into'.",
-        "dis": "The prefix 'dis-' often means 'not' or 'apart'.",
-        "en": "The prefix 'en-' often means 'cause to be'.",
-        "em": "The prefix 'em-' often means 'cause to be'.",
-        "anti": "The prefix 'anti-' means 'against' or 'opposite'.",
-        "auto": "The prefix 'auto-' means 'self' or 'same'.",
-        "bi": "The prefix 'bi-' means 'two'.",
-        "co": "The prefix 'co-' means 'together'."
-    }
+    # Explain the known parts of the word, outside in
+    parts = analyze_word(word)
+    tips = []
+    if parts["prefix"]:
+        tips.append(f"The prefix '{parts['prefix']['text']}-' {parts['prefix']['meaning']}.")
+    for root in parts["roots"]:
+        tips.append(f"The root '{root['text']}' {root['meaning']}.")
+    if parts["suffix"]:
+        tips.append(f"The suffix '-{parts['suffix']['text']}' {parts['suffix']['meaning']}.")
     
-    for prefix, meaning in prefixes.items():
-        if word.startswith(prefix):
-            return meaning
+    if tips:
+        return " ".join(tips)
     
     # Simple association tip
     return f"Try associating this word with a mental image or personal experience to better remember it."
 
-def get_usage_examples(word, definitions):
-    """Get additional usage examples beyond those provided in definitions"""
+def collect_related_content(meanings):
+    """
+    Walk the meanings data once and collect everything derived from it.
+    
+    Args:
+        meanings (list): Meanings from the dictionary API
+        
+    Returns:
+        tuple: (synonyms, antonyms, examples), all in order of appearance
+            and without duplicates or length limits applied
+    """
+    synonyms = []
+    antonyms = []
     examples = []
     
-    # Extract examples from definitions
-    for meaning in definitions:
+    for meaning in meanings:
+        # Get synonyms, antonyms and examples from definitions
         for definition in meaning.get("definitions", []):
+            synonyms.extend(definition.get("synonyms", []))
+            antonyms.extend(definition.get("antonyms", []))
             if "example" in definition:
                 examples.append(definition["example"])
+        
+        # Also check for synonyms/antonyms at the meaning level
+        synonyms.extend(meaning.get("synonyms", []))
+        antonyms.extend(meaning.get("antonyms", []))
+    
+    return synonyms, antonyms, examples
+
+def _complete_examples(word, examples):
+    """Pad a list of examples with generic ones and limit it to 3"""
+    examples = list(examples)
     
     # If we have fewer than 3 examples, add some generic ones
     if len(examples) < 3:
@@ -108,23 +227,55 @@ def get_usage_examples(word, definitions):
     
     return examples[:3]  # Return up to 3 examples
 
+def get_usage_examples(word, definitions):
+    """Get additional usage examples beyond those provided in definitions"""
+    _, _, examples = collect_related_content(definitions)
+    return _complete_examples(word, examples)
+
 def get_related_words(meanings):
     """Extract related words (antonyms, synonyms) from meanings data"""
-    synonyms = []
-    antonyms = []
-    
-    for meaning in meanings:
-        # Get synonyms and antonyms from definitions
-        for definition in meaning.get("definitions", []):
-            synonyms.extend(definition.get("synonyms", []))
-            antonyms.extend(definition.get("antonyms", []))
-        
-        # Also check for synonyms/antonyms at the meaning level
-        synonyms.extend(meaning.get("synonyms", []))
-        antonyms.extend(meaning.get("antonyms", []))
+    synonyms, antonyms, _ = collect_related_content(meanings)
     
     # Remove duplicates and limit length
     synonyms = list(dict.fromkeys(synonyms))[:5]
     antonyms = list(dict.fromkeys(antonyms))[:5]
     
-    return synonyms, antonyms 
\ No newline at end of file
+    return synonyms, antonyms
+
+# Bump when the way derived content is computed changes, so cached copies are rebuilt
+DERIVED_CONTENT_VERSION = 5
+
+def get_derived_content(word_data):
+    """
+    Get everything derived from a word's dictionary entry, computing it only once.
+    
+    The result is stored on word_data under "derived", so display, storage
+    and email all read the same values and it is cached together with the
+    dictionary entry.
+    
+    Args:
+        word_data (dict): Word data from the dictionary API
+        
+    Returns:
+        dict: difficulty, synonyms, antonyms, examples, memory_tip,
+            etymology and etymology_url for the word
+    """
+    derived = word_data.get("derived")
+    if derived and derived.get("version") == DERIVED_CONTENT_VERSION:
+        return derived
+    
+    word = word_data.get("word", "")
+    synonyms, antonyms, examples = collect_related_content(word_data.get("meanings", []))
+    
+    derived = {
+        "version": DERIVED_CONTENT_VERSION,
+        "difficulty": get_learning_difficulty(word),
+        "synonyms": list(dict.fromkeys(synonyms))[:5],
+        "antonyms": list(dict.fromkeys(antonyms))[:5],
+        "examples": _complete_examples(word, examples),
+        "memory_tip": get_memory_tip(word),
+        "etymology": get_etymology(word),
+        "etymology_url": f"https://www.etymonline.com/word/{word}"
+    }
+    word_data["derived"] = derived
+    return derived
@@ -1,10 +1,36 @@
 """
 Main entry point for the Daily Word application.
 """
+import os
 from dailydose.core.word_utils import get_random_word, get_word_info
 from dailydose.core.display import display_word_info
 from dailydose.core.storage import initialize_mongodb
+from dailydose.core.sampling import WORD_LEVEL, WordPicker
+from dailydose.core.graph import pick_next_word
+from dailydose.core.planner import get_planned_word_info
+from dailydose.core import metrics
 
+# "uniform" picks any word; "weighted" prefers common, unseen words near WORD_LEVEL;
+# "related" picks an unseen synonym of the last word, falling back to "weighted"
+WORD_SELECTION = os.environ.get("WORD_SELECTION", "uniform").lower()
+
+def choose_word(tried=(), picker=None):
+    """
+    Pick the next candidate word using the configured selection mode.
+    
+    Pass the same WordPicker for every retry of a run, so the weights are
+    computed once and rejected words are dropped from it.
+    """
+    if WORD_SELECTION == "related":
+        word = pick_next_word(skip=tried)
+        if word:
+            return word
+    if WORD_SELECTION in ("weighted", "related"):
+        picker = picker or WordPicker(level=WORD_LEVEL)
+        return picker.pick(skip=tried)
+    return get_random_word()
+
+@metrics.timed("run", command="daily")
 def main():
     """Main function that runs the program"""
     print("Finding a random English word for you...\n")
@@ -12,14 +38,24 @@ def main():
     # Try to initialize MongoDB connection
     initialize_mongodb()
     
+    # A word planned ahead (python -m dailydose plan) is sent from its stored email
+    planned = get_planned_word_info()
+    if planned:
+        display_word_info(planned)
+        return
+    
+    tried = set()
+    picker = WordPicker(level=WORD_LEVEL)
     while True:
-        word = get_random_word()
+        word = choose_word(tried, picker)
         word_info = get_word_info(word)
         
         if word_info:
             display_word_info(word_info)
             break
         else:
+            tried.add(word)
+            metrics.increment("retries", operation="word_lookup")
             print(f"Couldn't find information for '{word}'. Trying another word...")
 
 if __name__ == "__main__":
@@ -16,6 +16,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/DailyDose",
     packages=find_packages(),
+    package_data={"dailydose": ["data/*.tsv"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -25,7 +26,7 @@ setup(
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "dailydose=dailydose.main:main",
+            "dailydose=dailydose.cli:cli",
         ],
     },
 ) 
\ No newline at end of file
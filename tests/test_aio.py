@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch, MagicMock
+import time
+import shutil
+import tempfile
+import threading
+
+# Import the module to test
+from dailydose.core import aio, word_utils, email_service, morphology
+from benchmarks.fake_services import FakeServices, generate_words
+
+class TestAio(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the async API, against local stand-in services."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.services = FakeServices(latency=0.05).start()
+        self.addCleanup(self.services.stop)
+        env = self.services.environment()
+        for name in ("WORD_LIST_URL", "DICTIONARY_API_URL"):
+            patcher = patch.object(word_utils, name, env[name])
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Fetched word lists are remembered in a temporary file and analyzer
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        for patcher in (
+            patch.object(morphology, "KNOWN_WORDS_FILE", f"{temp_dir}/known_words.txt"),
+            patch.object(morphology, "_analyzer", morphology.MorphologyAnalyzer.from_file(morphology.MORPHOLOGY_FILE)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        """Close the event loop's HTTP session."""
+        await aio.close()
+
+    async def test_get_word_info_async(self):
+        """Test a dictionary lookup."""
+        word_info = await aio.get_word_info_async("kalo")
+
+        # Assertions
+        self.assertEqual(word_info["word"], "kalo")
+        self.assertEqual(word_info["meanings"][0]["partOfSpeech"], "noun")
+
+    async def test_get_word_info_async_not_found(self):
+        """Test that unknown words give None, like get_word_info."""
+        with patch.object(word_utils, "DICTIONARY_API_URL", f"{self.services.url}/missing"):
+            self.assertIsNone(await aio.get_word_info_async("kalo"))
+
+    async def test_get_random_word_async(self):
+        """Test picking a word from the word list."""
+        self.assertIn(await aio.get_random_word_async(), generate_words(10000))
+
+    async def test_get_word_list_async_error(self):
+        """Test that a failed word list download raises instead of parsing the error page."""
+        with patch.object(word_utils, "WORD_LIST_URL", f"{self.services.url}/missing"):
+            with self.assertRaises(aio.requests.HTTPError):
+                await aio.get_word_list_async()
+
+    @patch('dailydose.core.aio.cache')
+    async def test_lookups_run_concurrently(self, mock_cache):
+        """Test that many lookups overlap instead of running one after another."""
+        mock_cache.load_entry.return_value = None
+        words = generate_words(40)
+
+        # Call function
+        started = time.perf_counter()
+        results = await aio.get_word_infos_async(words + words[:5])
+        elapsed = time.perf_counter() - started
+
+        # Assertions
+        self.assertEqual(list(results), words)
+        self.assertTrue(all(results[word]["word"] == word for word in words))
+        self.assertEqual(mock_cache.save_entry.call_count, 40)
+        # 40 lookups of 50 ms each would take 2 s in sequence
+        self.assertLess(elapsed, 1.0)
+
+    @patch('dailydose.core.aio.storage.save_word_history')
+    async def test_save_runs_off_the_event_loop(self, mock_save):
+        """Test that history saves run on the worker threads."""
+        mock_save.side_effect = lambda word, info: threading.current_thread().name
+
+        # Call function
+        thread_name = await aio.save_word_history_async("kalo", {"word": "kalo"})
+
+        # Assertions
+        mock_save.assert_called_once_with("kalo", {"word": "kalo"})
+        self.assertTrue(thread_name.startswith("dailydose-aio"))
+
+    @patch.object(aio, "ASYNC_WORKERS", 3)
+    async def test_sends_are_bounded(self):
+        """Test that no more than ASYNC_WORKERS sends are in flight at once."""
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def send_email(**kwargs):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            return {"MessageId": "abc"}
+
+        mock_ses = MagicMock()
+        mock_ses.send_email.side_effect = send_email
+        artifact = {"subject": "s", "html": "h", "text": "t"}
+
+        with patch.object(email_service, "EMAIL_ENABLED", True), patch.object(email_service, "ses_client", mock_ses):
+            results = await aio.send_emails_async([f"user{i}@example.com" for i in range(20)], artifact)
+
+        # Assertions
+        self.assertEqual(results, [True] * 20)
+        self.assertLessEqual(in_flight[1], 3)
+
+    async def test_send_word_email_async_disabled(self):
+        """Test that nothing is rendered while email is disabled."""
+        with patch.object(email_service, "EMAIL_ENABLED", False), \
+             patch.object(email_service, "get_email_artifact") as mock_artifact:
+            self.assertFalse(await aio.send_word_email_async("user@example.com", {"word": "kalo"}))
+
+        # Assertions
+        mock_artifact.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import types
+from unittest.mock import patch
+import boto3
+import requests
+
+# Import the modules to test
+from benchmarks import harness
+from benchmarks import storage as storage_benchmark
+from benchmarks.fake_services import FakeServices, generate_words
+from dailydose.core import storage
+
+class TestBenchmarks(unittest.TestCase):
+    """Test cases for the benchmark harness and stand-in services."""
+
+    def test_stage_timer_wraps_and_restores(self):
+        """Test that wrapped functions are timed under their stage and restored afterwards."""
+        def lookup(word):
+            return word.upper()
+        module = types.SimpleNamespace(lookup=lookup)
+        alias = types.SimpleNamespace(lookup=lookup)
+
+        timer = harness.StageTimer()
+        timer.wrap("lookup", (module, "lookup"), (alias, "lookup"))
+        self.assertEqual(module.lookup("time"), "TIME")
+        alias.lookup("people")
+        timer.restore()
+
+        # Assertions
+        self.assertEqual(timer.summary()["lookup"]["count"], 2)
+        self.assertIs(module.lookup, lookup)
+        self.assertIs(alias.lookup, lookup)
+
+    def test_compare_to_baseline(self):
+        """Test that only meaningful slowdowns are reported."""
+        baseline = {"subscribers=1": {
+            "throughput": 100.0,
+            "stages": {"send": {"p50": 10.0, "p95": 20.0}, "render": {"p50": 0.1, "p95": 0.2}}
+        }}
+        results = {"subscribers=1": {
+            "throughput": 50.0,
+            "stages": {"send": {"p50": 11.0, "p95": 40.0}, "render": {"p50": 0.3, "p95": 0.4}}
+        }}
+
+        # Call function
+        regressions = harness.compare_to_baseline(results, baseline, tolerance=0.25)
+
+        # Assertions
+        self.assertEqual(len(regressions), 2)
+        self.assertIn("send p95", regressions[0])
+        self.assertIn("throughput", regressions[1])
+
+    def test_fake_services(self):
+        """Test the word list, dictionary and SES stand-ins."""
+        with FakeServices() as services:
+            env = services.environment()
+            words = requests.get(env["WORD_LIST_URL"]).text.splitlines()
+            entry = requests.get(f"{env['DICTIONARY_API_URL']}/kalo").json()[0]
+
+            ses = boto3.client("ses", region_name="us-east-1", endpoint_url=env["AWS_SES_ENDPOINT_URL"],
+                               aws_access_key_id="test", aws_secret_access_key="test")
+            response = ses.send_email(
+                Source="sender@example.com",
+                Destination={"ToAddresses": ["reader@example.com"]},
+                Message={"Subject": {"Data": "Hi"}, "Body": {"Text": {"Data": "Hello"}}}
+            )
+
+            # Assertions
+            self.assertEqual(words, generate_words(10000))
+            self.assertEqual(entry["word"], "kalo")
+            self.assertTrue(response["MessageId"])
+            self.assertEqual(services.emails_sent, 1)
+
+    def test_storage_benchmark_file_backend(self):
+        """Test a storage benchmark scenario on a small history file."""
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir)
+
+        with patch.object(storage, "HISTORY_FILE"), patch.object(storage, "word_collection"):
+            result = storage_benchmark.run_scenario(storage, "file", 10, work_dir, None)
+
+        with open(os.path.join(work_dir, "word_history.json")) as f:
+            saved = json.load(f)["words"]
+
+        # Assertions
+        self.assertEqual(result["stages"]["save"]["count"], storage_benchmark.MAX_SAVES)
+        self.assertGreater(result["peak_memory"], 0)
+        self.assertEqual(len(saved), 10 + storage_benchmark.MAX_SAVES + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
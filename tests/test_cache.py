@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import io
+import os
+import shutil
+import tempfile
+import contextlib
+import numpy as np
+
+# Import the module to test
+from dailydose.core import cache, compression
+
+class TestCache(unittest.TestCase):
+    """Test cases for the cache module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch.object(cache, "DICTIONARY_CACHE_DIR", self.temp_dir),
+            patch.object(cache, "_entries", {}),
+        ]
+        for p in self.patches:
+            p.start()
+
+        self.sample_word_data = {"word": "example", "meanings": []}
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_and_load_entry(self):
+        """Test storing an entry and reading it back from disk."""
+        cache.save_entry("example", self.sample_word_data)
+        cache.clear_memory_cache()
+
+        # Assertions
+        self.assertEqual(cache.load_entry("example").to_dict(), {"word": "example"})
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "example.entry")))
+
+    def test_load_missing_entry(self):
+        """Test that a missing entry returns None."""
+        self.assertIsNone(cache.load_entry("missing"))
+
+    def test_load_corrupt_entry(self):
+        """Test that an unreadable entry is treated as missing."""
+        with open(os.path.join(self.temp_dir, "broken.json"), "w") as f:
+            f.write("{not json")
+
+        self.assertIsNone(cache.load_entry("broken"))
+
+    def test_legacy_json_entry(self):
+        """Test that entries cached before compression are read and replaced on save."""
+        with open(os.path.join(self.temp_dir, "legacy.json"), "w") as f:
+            f.write('{"word": "legacy"}')
+
+        # Assertions
+        self.assertEqual(list(cache.iter_cached_words()), ["legacy"])
+        self.assertEqual(cache.load_entry("legacy").to_dict(), {"word": "legacy"})
+        cache.save_entry("legacy", {"word": "legacy"})
+        self.assertEqual(os.listdir(self.temp_dir), ["legacy.entry"])
+
+    def test_iter_entries(self):
+        """Test iterating over all cached entries."""
+        cache.save_entry("zebra", {"word": "zebra"})
+        cache.save_entry("apple pie", {"word": "apple pie"})
+
+        # Assertions
+        self.assertEqual(list(cache.iter_cached_words()), ["apple pie", "zebra"])
+        self.assertEqual(dict(cache.iter_entries())["zebra"].to_dict(), {"word": "zebra"})
+
+    def test_saved_entry_is_trimmed(self):
+        """Test that fields DailyDose never reads aren't cached."""
+        cache.save_entry("example", {
+            "word": "example",
+            "phonetics": [{"audio": "", "sourceUrl": "https://example.com", "license": {"name": "BY-SA 3.0"}}],
+            "meanings": [],
+            "license": {"name": "CC BY-SA 3.0"},
+            "sourceUrls": ["https://en.wiktionary.org/wiki/example"]
+        })
+
+        with open(os.path.join(self.temp_dir, "example.entry"), "rb") as f:
+            content = compression.decompress(f.read())
+
+        # Assertions
+        self.assertEqual(content, b'{"word":"example"}')
+
+    def test_save_and_load_arrays(self):
+        """Test that saved arrays are memory-mapped and a new save replaces the whole directory."""
+        path = os.path.join(self.temp_dir, "index")
+        cache.save_arrays({"words": np.array(["a", "b"]), "counts": np.arange(2)}, path)
+        first = cache.load_arrays(path, ("words", "counts"))
+
+        # Call function
+        cache.save_arrays({"words": np.array(["c"])}, path)
+
+        # Assertions
+        self.assertIsInstance(first["counts"], np.memmap)
+        self.assertEqual(list(first["words"]), ["a", "b"])
+        self.assertEqual(list(cache.load_arrays(path, ("words",))["words"]), ["c"])
+        self.assertEqual(os.listdir(path), ["words.npy"])
+        self.assertFalse(os.path.exists(f"{path}.tmp") or os.path.exists(f"{path}.old"))
+
+    def test_load_missing_arrays(self):
+        """Test that a missing or incomplete array directory loads as None."""
+        path = os.path.join(self.temp_dir, "index")
+        self.assertIsNone(cache.load_arrays(path, ("words",)))
+
+        cache.save_arrays({"words": np.array(["a"])}, path)
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            self.assertIsNone(cache.load_arrays(path, ("words", "counts"), "test index"))
+
+        # Assertions
+        self.assertIn("unreadable test index", printed.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+
+# Import the module to test
+from dailydose import cli
+
+class TestCli(unittest.TestCase):
+    """Test cases for the cli module."""
+
+    @patch('dailydose.cli.main')
+    def test_no_command_runs_main(self, mock_main):
+        """Test that running without a command shows the daily word."""
+        cli.cli([])
+        mock_main.assert_called_once()
+
+    @patch('dailydose.cli.send_digest')
+    @patch('dailydose.cli.display_digest')
+    @patch('dailydose.cli.prepare_digest')
+    @patch('dailydose.cli.initialize_mongodb')
+    def test_digest_dry_run(self, mock_init, mock_prepare, mock_display, mock_send):
+        """Test the digest command without sending emails."""
+        mock_prepare.return_value = [{"word": "example"}]
+
+        # Call function
+        cli.cli(["digest", "--count", "3", "--new", "--dry-run"])
+
+        # Assertions
+        mock_prepare.assert_called_once_with(3, new_words=True, max_workers=8, record=False)
+        mock_display.assert_called_once_with([{"word": "example"}])
+        mock_send.assert_not_called()
+
+    @patch('dailydose.cli.send_digest')
+    @patch('dailydose.cli.display_digest')
+    @patch('dailydose.cli.prepare_digest')
+    @patch('dailydose.cli.initialize_mongodb')
+    def test_digest_sends_when_enabled(self, mock_init, mock_prepare, mock_display, mock_send):
+        """Test that the digest is sent when email is enabled."""
+        mock_prepare.return_value = [{"word": "example"}]
+
+        with patch.object(cli.email_service, "EMAIL_ENABLED", True):
+            cli.cli(["digest"])
+
+        # Assertions
+        mock_prepare.assert_called_once_with(7, new_words=False, max_workers=8, record=True)
+        mock_send.assert_called_once_with([{"word": "example"}])
+
+    @patch('dailydose.cli.export_history')
+    @patch('dailydose.cli.initialize_mongodb')
+    def test_history_export(self, mock_init, mock_export):
+        """Test the history export command."""
+        mock_export.return_value = {"records": 2, "expected": 2, "verified": True}
+
+        # Call function
+        cli.cli(["history", "export", "backup.jsonl", "--backend", "file", "--restart"])
+
+        # Assertions
+        mock_export.assert_called_once_with("backup.jsonl", backend="file", resume=False, batch_size=1000)
+
+    @patch('dailydose.cli.profiling.run_profiled')
+    @patch('dailydose.cli.main')
+    def test_profile_wraps_run(self, mock_main, mock_profiled):
+        """Test that --profile runs the command under the profiler."""
+        cli.cli(["--profile", "sample", "--profile-top", "5", "--trace-memory"])
+
+        # Assertions
+        args, kwargs = mock_profiled.call_args
+        self.assertEqual(kwargs, {"mode": "sample", "output": None, "top": 5, "trace_memory": True})
+        mock_main.assert_not_called()
+        args[0]()
+        mock_main.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import io
+import os
+import json
+import shutil
+import tempfile
+import contextlib
+
+# Import the module to test
+from dailydose import cli
+from dailydose.core import cache, compression, storage
+from dailydose.core.models import WordEntry, dumps
+from benchmarks.fake_services import generate_words, make_entry
+
+def make_samples(words):
+    return [dumps(WordEntry.from_dict(make_entry(word))) for word in words]
+
+class TestCompression(unittest.TestCase):
+    """Test cases for the compression module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch.object(compression, "DICTIONARY_DIR", self.temp_dir),
+            patch.object(compression, "COMPRESSION", "zlib"),
+        ]
+        for p in self.patches:
+            p.start()
+        compression.reload()
+
+        words = generate_words(400)
+        self.samples = make_samples(words[:200])
+        self.other_samples = make_samples(words[200:])
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        for p in self.patches:
+            p.stop()
+        compression.reload()
+        shutil.rmtree(self.temp_dir)
+
+    def test_plain_json_passes_through(self):
+        """Test that uncompressed JSON is read as is."""
+        self.assertEqual(compression.decompress(b'{"word":"example"}'), b'{"word":"example"}')
+
+    def test_dictionaries_are_not_cache(self):
+        """Test that dictionaries default to a data directory that clearing the cache keeps."""
+        with patch.object(compression, "DICTIONARY_DIR", None):
+            directory = compression.get_dictionary_dir()
+
+        # Assertions
+        self.assertFalse(directory.startswith(os.path.join(cache.CACHE_DIR, "")))
+        self.assertEqual(directory, os.path.join(cache.PROJECT_ROOT, "compression"))
+
+    def test_round_trip_without_dictionary(self):
+        """Test compressing before any dictionary has been trained."""
+        payload = compression.compress(self.samples[0])
+
+        # Assertions
+        self.assertEqual(payload[:5], b"\x02\x00\x00\x00\x00")
+        self.assertEqual(compression.decompress(payload), self.samples[0])
+
+    def test_compression_off(self):
+        """Test that DAILYDOSE_COMPRESSION=none stores plain JSON."""
+        with patch.object(compression, "COMPRESSION", "none"):
+            self.assertEqual(compression.compress(self.samples[0]), self.samples[0])
+
+    def test_trained_dictionary_shrinks_payloads(self):
+        """Test that a dictionary trained on our entries beats compressing them alone."""
+        result = compression.train_dictionary(self.samples, codec="zlib")
+        sizes = compression.measure(self.other_samples, "zlib")
+
+        # Assertions
+        self.assertEqual(compression.get_current_ids(), {"zlib": result["id"]})
+        self.assertLess(sizes["trained"], sizes["plain"] * 0.6)
+        self.assertLess(sizes["trained"] * 3, sizes["raw"])
+        self.assertEqual(compression.decompress(compression.compress(self.other_samples[0])), self.other_samples[0])
+
+    def test_old_payloads_readable_after_retraining(self):
+        """Test that retraining keeps earlier dictionaries."""
+        compression.train_dictionary(self.samples, codec="zlib")
+        old_payload = compression.compress(self.samples[0])
+
+        # Call function
+        second = compression.train_dictionary(self.other_samples[:50] + self.samples[:10], codec="zlib")
+
+        # Assertions
+        self.assertEqual(compression.get_current_ids()["zlib"], second["id"])
+        self.assertEqual(compression.decompress(old_payload), self.samples[0])
+
+    def test_unreadable_payloads(self):
+        """Test that damaged payloads and missing dictionaries are reported as ValueError."""
+        compression.train_dictionary(self.samples, codec="zlib")
+        payload = compression.compress(self.samples[0])
+        with patch.object(compression, "DICTIONARY_DIR", tempfile.gettempdir() + "/missing-dictionaries"):
+            compression.reload()
+            with self.assertRaises(ValueError):
+                compression.decompress(payload)
+
+        # Assertions
+        with self.assertRaises(ValueError):
+            compression.decompress(b"\x02\x00\x00\x00\x00not deflate")
+        with self.assertRaises(ValueError):
+            compression.decompress(b"\x09garbage")
+
+    def test_too_few_samples(self):
+        """Test that training needs a minimum corpus."""
+        with self.assertRaises(ValueError):
+            compression.train_dictionary(self.samples[:3], codec="zlib")
+
+    @unittest.skipIf(compression.zstandard is None, "zstandard is not installed")
+    def test_zstd_round_trip(self):
+        """Test training and using a zstd dictionary."""
+        compression.train_dictionary(self.samples, codec="zstd", size=4096)
+        payload = compression.compress(self.other_samples[0], "zstd")
+
+        # Assertions
+        self.assertEqual(payload[0], 1)
+        self.assertEqual(compression.decompress(payload), self.other_samples[0])
+
+    def test_history_document_packing(self):
+        """Test that MongoDB documents keep dictionary fields in a compressed payload."""
+        doc = {"word": "kalo", "review_count": 1}
+        doc.update(json.loads(self.samples[0]))
+        del doc["word"]
+        doc["word"] = "kalo"
+
+        # Call functions
+        packed = storage.pack_document(doc)
+        unpacked = storage.unpack_document(packed)
+
+        # Assertions
+        self.assertEqual(sorted(packed), ["payload", "review_count", "word"])
+        self.assertEqual(unpacked, doc)
+        with patch.object(compression, "COMPRESSION", "none"):
+            self.assertIs(storage.pack_document(doc), doc)
+
+    @patch('dailydose.cli.initialize_mongodb')
+    @patch('dailydose.cli.iter_training_samples')
+    def test_train_command(self, mock_samples, mock_init):
+        """Test the compression train command."""
+        mock_samples.return_value = iter(self.samples)
+        printed = io.StringIO()
+
+        # Call function
+        with contextlib.redirect_stdout(printed):
+            cli.cli(["compression", "train", "--codec", "zlib"])
+
+        # Assertions
+        self.assertIn("zlib dictionary", printed.getvalue())
+        self.assertIn("on 200 payloads", printed.getvalue())
+        self.assertIn("zlib", compression.get_current_ids())
+
+
+if __name__ == '__main__':
+    unittest.main()
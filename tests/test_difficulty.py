@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Import the module to test
+from dailydose.core import difficulty, word_utils
+
+class TestDifficulty(unittest.TestCase):
+    """Test cases for the difficulty module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        # A small frequency-ordered word list
+        self.words = [
+            "time", "people", "make", "house", "water", "table", "example",
+            "garden", "picture", "yesterday", "transportation", "sophisticated",
+            "rhythm", "photosynthesis", "quixotic"
+        ]
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_encode_words(self):
+        """Test encoding words as padded letter codes."""
+        codes, lengths = difficulty.encode_words(["ab", "Zed"])
+
+        # Assertions
+        np.testing.assert_array_equal(lengths, [2, 3])
+        np.testing.assert_array_equal(codes, [[1, 2, 0], [26, 5, 4]])
+
+    def test_estimate_syllables(self):
+        """Test estimating syllable counts for a batch of words."""
+        words = ["cat", "table", "make", "yesterday", "rhythm"]
+        codes, lengths = difficulty.encode_words(words)
+
+        # Call function
+        syllables = difficulty.estimate_syllables(codes, lengths)
+
+        # Assertions
+        np.testing.assert_array_equal(syllables, [1, 2, 1, 3, 1])
+
+    def test_bigram_rarity(self):
+        """Test that words made of rare letter pairs score higher."""
+        codes, _ = difficulty.encode_words(["thethe", "thenthe", "qxzj"])
+
+        rarity = difficulty.bigram_rarity(codes)
+
+        # Assertions
+        self.assertGreater(rarity[2], rarity[0])
+
+    def test_build_difficulty_table(self):
+        """Test scoring and tiering a whole word list."""
+        table = difficulty.build_difficulty_table(self.words)
+
+        # Assertions
+        self.assertEqual(table["features"].shape, (len(self.words), len(difficulty.FEATURES)))
+        self.assertEqual(len(table["scores"]), len(self.words))
+        self.assertEqual(set(np.unique(table["tiers"])), {0, 1, 2})
+        self.assertEqual(difficulty.lookup_tiers(table, ["time", "photosynthesis", "missing"]),
+                         ["Basic", "Advanced", None])
+        self.assertIn("time", difficulty.words_in_tier(table, "Basic"))
+
+    def test_save_and_load_difficulty_table(self):
+        """Test persisting the table and loading it back."""
+        path = os.path.join(self.temp_dir, "difficulty.npz")
+        table = difficulty.build_difficulty_table(self.words)
+
+        # Call functions
+        difficulty.save_difficulty_table(table, path)
+        loaded = difficulty.load_difficulty_table(path)
+
+        # Assertions
+        self.assertEqual(set(loaded), set(table))
+        np.testing.assert_array_equal(loaded["scores"], table["scores"])
+        np.testing.assert_array_equal(loaded["words"], table["words"])
+
+    def test_get_difficulty_table_builds_once(self):
+        """Test that a saved table is reused instead of rebuilt."""
+        path = os.path.join(self.temp_dir, "difficulty.npz")
+
+        with patch.object(difficulty, "DIFFICULTY_TABLE_FILE", path):
+            first = difficulty.get_difficulty_table(self.words)
+            with patch.object(difficulty, "build_difficulty_table") as mock_build:
+                second = difficulty.get_difficulty_table()
+
+        # Assertions
+        mock_build.assert_not_called()
+        np.testing.assert_array_equal(first["tiers"], second["tiers"])
+
+    def test_learning_difficulty_matches_table(self):
+        """Test that the level shown for a word is the tier it is chosen by."""
+        path = os.path.join(self.temp_dir, "difficulty.npz")
+
+        with patch.object(difficulty, "DIFFICULTY_TABLE_FILE", path):
+            table = difficulty.get_difficulty_table(self.words)
+            shown = [word_utils.get_learning_difficulty(word) for word in self.words]
+            outside = word_utils.get_learning_difficulty("cat")
+
+        # Assertions
+        self.assertEqual(shown, difficulty.lookup_tiers(table, self.words))
+        self.assertEqual(outside, "Basic")
+        # Without a saved table the estimate from length and roots is used
+        with patch.object(difficulty, "DIFFICULTY_TABLE_FILE", os.path.join(self.temp_dir, "missing.npz")):
+            self.assertEqual(word_utils.get_learning_difficulty("time"), "Basic")
+            self.assertIsNone(difficulty.get_saved_table())
+
+    def test_get_difficulty_table_rebuilds_for_new_words(self):
+        """Test that a table saved for another word list is rebuilt."""
+        path = os.path.join(self.temp_dir, "difficulty.npz")
+
+        with patch.object(difficulty, "DIFFICULTY_TABLE_FILE", path):
+            difficulty.get_difficulty_table(self.words)
+            same = difficulty.get_difficulty_table(list(self.words))
+            changed = difficulty.get_difficulty_table(self.words + ["zephyr"])
+            saved = difficulty.load_difficulty_table()
+
+        # Assertions
+        self.assertEqual(len(same["words"]), len(self.words))
+        self.assertIn("zephyr", changed["words"])
+        self.assertIn("zephyr", saved["words"])
+
+    def test_lookup_compares_whole_words(self):
+        """Test that longer lookup words don't match a prefix in the table."""
+        table = difficulty.build_difficulty_table(["apple", "banana", "cherry", "table"])
+        empty = difficulty.build_difficulty_table([])
+
+        # Assertions
+        self.assertEqual(difficulty.lookup_tiers(table, ["bananarama", "cherryxyz", "banana"]),
+                         [None, None, difficulty.lookup_tiers(table, ["banana"])[0]])
+        self.assertEqual(difficulty.lookup_tiers(empty, ["apple"]), [None])
+        self.assertEqual(list(difficulty.lookup_indices(table, [])), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
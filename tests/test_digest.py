@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+
+# Import the module to test
+from dailydose.core import digest
+
+class TestDigest(unittest.TestCase):
+    """Test cases for the digest module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        # Sample word data for testing
+        self.sample_word_data = {
+            "word": "example",
+            "phonetics": [{"audio": ""}, {"text": "/ɪɡˈzɑːmpəl/"}],
+            "meanings": [
+                {
+                    "partOfSpeech": "noun",
+                    "definitions": [
+                        {
+                            "definition": "a representative form or pattern",
+                            "example": "I followed your example",
+                            "synonyms": ["model", "pattern"],
+                            "antonyms": ["exception"]
+                        }
+                    ],
+                    "synonyms": ["model", "pattern", "prototype"],
+                    "antonyms": ["exception", "anomaly"]
+                }
+            ]
+        }
+
+    def test_build_digest(self):
+        """Test building digest entries from word data."""
+        entries = digest.build_digest([self.sample_word_data])
+
+        # Assertions
+        self.assertEqual(len(entries), 1)
+        entry = entries[0]
+        self.assertEqual(entry["word"], "example")
+        self.assertEqual(entry["phonetic"], "/ɪɡˈzɑːmpəl/")
+        self.assertEqual(entry["part_of_speech"], "noun")
+        self.assertEqual(entry["definition"], "a representative form or pattern")
+        self.assertEqual(entry["difficulty"], "Intermediate")
+        self.assertEqual(entry["synonyms"], ["model", "pattern", "prototype"])
+        self.assertEqual(entry["examples"][0], "I followed your example")
+
+    @patch('dailydose.core.digest.get_word_infos')
+    @patch('dailydose.core.digest.get_recent_words')
+    def test_prepare_digest_from_history(self, mock_recent, mock_infos):
+        """Test preparing a digest from recent history, skipping unknown words."""
+        mock_recent.return_value = ["example", "unknown"]
+        mock_infos.return_value = {"example": self.sample_word_data, "unknown": None}
+
+        # Call function
+        entries = digest.prepare_digest(2, max_workers=4)
+
+        # Assertions
+        mock_recent.assert_called_once_with(2)
+        mock_infos.assert_called_once_with(["example", "unknown"], max_workers=4)
+        self.assertEqual([entry["word"] for entry in entries], ["example"])
+
+    @patch('dailydose.core.digest.persist')
+    @patch('dailydose.core.digest.get_word_infos')
+    @patch('dailydose.core.digest.WordPicker')
+    def test_prepare_digest_new_words(self, mock_picker, mock_infos, mock_persist):
+        """Test preparing a digest of new words, which are recorded in history."""
+        mock_picker.return_value.pick.side_effect = ["example", "unknown"]
+        mock_infos.return_value = {"example": self.sample_word_data, "unknown": None}
+
+        # Call function
+        entries = digest.prepare_digest(2, new_words=True)
+
+        # Assertions
+        self.assertEqual([entry["word"] for entry in entries], ["example"])
+        mock_persist.assert_called_once_with(self.sample_word_data)
+        self.assertEqual(self.sample_word_data["difficulty"], "Intermediate")
+
+    @patch('dailydose.core.digest.persist')
+    @patch('dailydose.core.digest.get_word_infos')
+    @patch('dailydose.core.digest.WordPicker')
+    def test_prepare_digest_new_words_dry_run(self, mock_picker, mock_infos, mock_persist):
+        """Test that a digest that isn't recorded leaves history alone."""
+        mock_picker.return_value.pick.return_value = "example"
+        mock_infos.return_value = {"example": self.sample_word_data}
+
+        # Call function
+        digest.prepare_digest(1, new_words=True, record=False)
+
+        # Assertions
+        mock_persist.assert_not_called()
+
+    @patch('dailydose.core.digest.WordPicker')
+    def test_get_digest_words_are_distinct(self, mock_picker):
+        """Test that picked words are skipped by later picks and a repeat ends the list."""
+        picked = []
+        def pick(skip=()):
+            picked.append(list(skip))
+            return ["apple", "berry", "apple"][len(picked) - 1]
+        mock_picker.return_value.pick.side_effect = pick
+
+        # Call function
+        words = digest.get_digest_words(5, new_words=True)
+
+        # Assertions
+        self.assertEqual(words, ["apple", "berry"])
+        self.assertEqual(picked, [[], ["apple"], ["apple", "berry"]])
+
+    @patch('dailydose.core.digest.send_email')
+    @patch('dailydose.core.digest.get_digest_artifact')
+    def test_send_digest_renders_once(self, mock_artifact, mock_send):
+        """Test that the digest is rendered once and sent to every subscriber."""
+        mock_artifact.return_value = {"subject": "s", "html": "h", "text": "t"}
+        mock_send.side_effect = [True, False]
+        entries = digest.build_digest([self.sample_word_data])
+
+        # Call function
+        sent = digest.send_digest(entries, ["a@example.com", "b@example.com"])
+
+        # Assertions
+        self.assertEqual(sent, 1)
+        mock_artifact.assert_called_once_with(entries)
+        self.assertEqual(mock_send.call_count, 2)
+
+    @patch('dailydose.core.digest.get_digest_artifact')
+    def test_send_digest_without_subscribers(self, mock_artifact):
+        """Test that nothing is rendered when there are no subscribers."""
+        self.assertEqual(digest.send_digest([{"word": "example"}], []), 0)
+        mock_artifact.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
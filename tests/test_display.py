@@ -41,7 +41,8 @@ class TestDisplay(unittest.TestCase):
     def test_display_word_info(self, mock_stdout):
         """Test displaying word information to console."""
         # Patch save_word_history to avoid side effects
-        with patch('dailydose.core.storage.save_word_history', return_value=True):
+        with patch('dailydose.core.pipeline.save_word_history', return_value=True), \
+                patch('dailydose.core.pipeline.mark_seen'):
             # Call function
             display.display_word_info(self.sample_word_data)
             
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+# Import the module to test
+from dailydose.core import email_service
+
+class TestEmailService(unittest.TestCase):
+    """Test cases for the email_service module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        # Use a throwaway template and cache directory
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_dir = os.path.join(self.temp_dir, "templates")
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        os.makedirs(self.template_dir)
+        with open(os.path.join(self.template_dir, "word_email.html"), "w") as f:
+            f.write("<h1>{{ word|upper }}</h1><p>{{ difficulty }}</p>")
+
+        self.patches = [
+            patch.object(email_service, "TEMPLATE_DIR", self.template_dir),
+            patch.object(email_service, "TEMPLATE_CACHE_DIR", self.cache_dir),
+            patch.object(email_service, "_template_env", None),
+            patch.object(email_service, "_template_cache", {}),
+            patch.object(email_service, "ARTIFACT_DIR", os.path.join(self.temp_dir, "artifacts")),
+            patch.object(email_service, "_artifact_cache", OrderedDict()),
+        ]
+        for p in self.patches:
+            p.start()
+
+        # Sample word data for testing
+        self.sample_word_data = {
+            "word": "example",
+            "phonetics": [{"text": "/ɪɡˈzɑːmpəl/"}],
+            "meanings": [],
+            "difficulty": "Intermediate"
+        }
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_template_env_is_shared(self):
+        """Test that one template environment is reused across calls."""
+        env = email_service.get_template_env()
+
+        # Assertions
+        self.assertIs(env, email_service.get_template_env())
+        self.assertTrue(env.auto_reload)
+        self.assertIsNotNone(env.bytecode_cache)
+
+    def test_get_template_writes_bytecode_cache(self):
+        """Test that compiled templates are stored in the bytecode cache."""
+        email_service.get_template("word_email.html")
+
+        # Assertions
+        self.assertTrue(os.listdir(self.cache_dir))
+
+    def test_get_template_throttles_checks(self):
+        """Test that template lookups only hit the environment once per interval."""
+        mock_env = MagicMock()
+        with patch.object(email_service, "_template_env", mock_env):
+            first = email_service.get_template("word_email.html")
+            second = email_service.get_template("word_email.html")
+
+        # Assertions
+        self.assertIs(first, second)
+        mock_env.get_template.assert_called_once_with("word_email.html")
+
+    def test_get_template_rechecks_after_interval(self):
+        """Test that template lookups re-check the file once the interval passes."""
+        mock_env = MagicMock()
+        with patch.object(email_service, "_template_env", mock_env), \
+                patch.object(email_service, "TEMPLATE_CHECK_INTERVAL", 0):
+            email_service.get_template("word_email.html")
+            email_service.get_template("word_email.html")
+
+        # Assertions
+        self.assertEqual(mock_env.get_template.call_count, 2)
+
+    def test_create_default_template_invalidates_cache(self):
+        """Test that writing the default template drops cached lookups."""
+        email_service.get_template("word_email.html")
+
+        # Call function
+        email_service.create_default_template()
+
+        # Assertions
+        self.assertEqual(email_service._template_cache, {})
+        self.assertIn("Daily Word:", email_service.get_template("word_email.html").render(word="x"))
+
+    @patch.object(email_service, "EMAIL_ENABLED", True)
+    @patch.object(email_service, "ses_client")
+    def test_send_word_email(self, mock_ses):
+        """Test rendering and sending a word email."""
+        mock_ses.send_email.return_value = {"MessageId": "abc123"}
+
+        # Call function
+        result = email_service.send_word_email("user@example.com", self.sample_word_data)
+
+        # Assertions
+        self.assertTrue(result)
+        kwargs = mock_ses.send_email.call_args[1]
+        self.assertEqual(kwargs["Destination"], {"ToAddresses": ["user@example.com"]})
+        self.assertIn("EXAMPLE", kwargs["Message"]["Body"]["Html"]["Data"])
+        self.assertIn("EXAMPLE", kwargs["Message"]["Body"]["Text"]["Data"])
+
+    def test_build_email_artifact(self):
+        """Test that the artifact holds minified HTML and a text part."""
+        html = '<html><head></head><body>\n  <p style="color: red;  margin:0">{}</p>\n</body></html>'
+
+        # Call function
+        artifact = email_service.build_email_artifact(self.sample_word_data, html.format("Hi"))
+
+        # Assertions
+        self.assertEqual(artifact["html"], '<html><head></head><body><p style="color:red;margin:0">Hi</p></body></html>')
+        self.assertEqual(artifact["text"], "Hi\n")
+        self.assertEqual(artifact["subject"], "📚 Daily Word: EXAMPLE")
+
+    def test_get_email_artifact_reuses_stored_artifact(self):
+        """Test that a stored artifact is reused instead of re-rendering."""
+        first = email_service.get_email_artifact(self.sample_word_data, date="2023-01-01")
+
+        # A fresh process only has the file on disk
+        with patch.object(email_service, "_artifact_cache", OrderedDict()), \
+                patch.object(email_service, "render_word_email") as mock_render:
+            second = email_service.get_email_artifact(self.sample_word_data, date="2023-01-01")
+
+        # Assertions
+        mock_render.assert_not_called()
+        self.assertEqual(first, second)
+        key = email_service.get_artifact_key(self.sample_word_data)
+        self.assertTrue(os.path.exists(email_service.get_artifact_path("example", "2023-01-01", key=key)))
+
+    def test_artifact_cache_is_bounded(self):
+        """Test that only the most recently used artifacts are kept in memory."""
+        with patch.object(email_service, "ARTIFACT_CACHE_SIZE", 2):
+            for word in ("alpha", "beta"):
+                email_service.save_email_artifact({"word": word}, date="2023-01-01")
+            # Using alpha makes beta the least recently used
+            email_service.load_email_artifact("alpha", date="2023-01-01")
+            email_service.save_email_artifact({"word": "gamma"}, date="2023-01-01")
+
+        # Assertions
+        cached = [os.path.basename(path) for path in email_service._artifact_cache]
+        self.assertEqual(cached, ["word-alpha.json", "word-gamma.json"])
+        # Dropped artifacts are still read back from disk
+        self.assertEqual(email_service.load_email_artifact("beta", date="2023-01-01"), {"word": "beta"})
+
+    def test_changed_word_data_gets_new_artifact(self):
+        """Test that new word data on the same day isn't sent with the old email."""
+        first = email_service.get_email_artifact(self.sample_word_data, date="2023-01-01")
+        changed = dict(self.sample_word_data, phonetics=[{"text": "/new/"}])
+
+        # Call function
+        with patch.object(email_service, "render_word_email", return_value="<p>new</p>") as mock_render:
+            second = email_service.get_email_artifact(changed, date="2023-01-01")
+
+        # Assertions
+        mock_render.assert_called_once()
+        self.assertNotEqual(first["html"], second["html"])
+
+    def test_changed_digest_entries_get_new_artifact(self):
+        """Test that a digest of the same words with new data isn't sent with the old email."""
+        entries = [{"word": "example", "definition": "a pattern"}]
+        changed = [{"word": "example", "definition": "a model"}]
+
+        # Call function
+        with patch.object(email_service, "render_digest_email", side_effect=["<p>old</p>", "<p>new</p>"]) as mock_render:
+            first = email_service.get_digest_artifact(entries, date="2023-01-01")
+            again = email_service.get_digest_artifact(entries, date="2023-01-01")
+            second = email_service.get_digest_artifact(changed, date="2023-01-01")
+
+        # Assertions
+        self.assertEqual(mock_render.call_count, 2)
+        self.assertEqual(first, again)
+        self.assertNotEqual(first["html"], second["html"])
+
+    def test_template_env_alias(self):
+        """Test that the old module-level template_env still works."""
+        self.assertIs(email_service.template_env, email_service.get_template_env())
+
+    @patch.object(email_service, "EMAIL_ENABLED", False)
+    def test_send_word_email_disabled(self):
+        """Test that nothing is sent when email is disabled."""
+        self.assertFalse(email_service.send_word_email("user@example.com", self.sample_word_data))
+
+
+if __name__ == '__main__':
+    unittest.main()
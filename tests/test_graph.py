@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import io
+import os
+import random
+import shutil
+import tempfile
+import contextlib
+import numpy as np
+
+# Import the module to test
+from dailydose import cli
+from dailydose.core import cache, graph, seen_index
+
+def make_entry(word, synonyms=(), antonyms=(), definition_synonyms=()):
+    return {
+        "word": word,
+        "meanings": [{
+            "partOfSpeech": "adjective",
+            "definitions": [{"definition": f"Being {word}.", "synonyms": list(definition_synonyms)}],
+            "synonyms": list(synonyms),
+            "antonyms": list(antonyms)
+        }]
+    }
+
+class TestGraph(unittest.TestCase):
+    """Test cases for the graph module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch.object(cache, "DICTIONARY_CACHE_DIR", os.path.join(self.temp_dir, "dictionary")),
+            patch.object(cache, "_entries", {}),
+            patch.object(graph, "GRAPH_DIR", os.path.join(self.temp_dir, "graph")),
+        ]
+        for p in self.patches:
+            p.start()
+
+        self.entries = [
+            ("happy", make_entry("happy", synonyms=["glad", "cheerful"], antonyms=["sad"])),
+            ("glad", make_entry("glad", synonyms=["pleased"], definition_synonyms=["Happy"])),
+            ("sad", make_entry("sad", synonyms=["unhappy", "gloomy"], antonyms=["happy"])),
+        ]
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_build_graph(self):
+        """Test interning words and building symmetric CSR adjacency arrays."""
+        word_graph = graph.build_graph(self.entries)
+        words = list(word_graph["words"])
+
+        # Assertions
+        self.assertEqual(words, sorted(words))
+        self.assertEqual(words, ["cheerful", "glad", "gloomy", "happy", "pleased", "sad", "unhappy"])
+        self.assertEqual(list(word_graph["words"][word_graph["has_entry"]]), ["glad", "happy", "sad"])
+        happy = graph.lookup_id(word_graph, "happy")
+        synonyms = graph.neighbours(word_graph, [happy], ("synonyms",))
+        self.assertEqual(list(word_graph["words"][synonyms]), ["cheerful", "glad"])
+        # The edge from "glad" back to "happy" is stored once
+        self.assertEqual(int(np.diff(word_graph["synonyms_indptr"])[happy]), 2)
+        self.assertEqual(graph.lookup_id(word_graph, "missing"), -1)
+
+    def test_related_words_hops(self):
+        """Test k-hop queries, nearest first."""
+        word_graph = graph.build_graph(self.entries)
+
+        # Assertions
+        self.assertEqual(graph.related_words(word_graph, "happy"), [("cheerful", 1), ("glad", 1)])
+        self.assertEqual(graph.related_words(word_graph, "cheerful", hops=2),
+                         [("happy", 1), ("glad", 2)])
+        self.assertEqual(graph.related_words(word_graph, "happy", hops=3)[-1], ("pleased", 2))
+        self.assertEqual(graph.related_words(word_graph, "happy", relation="antonyms"), [("sad", 1)])
+        self.assertIn(("gloomy", 2), graph.related_words(word_graph, "happy", hops=2, relation="all"))
+        self.assertEqual(graph.related_words(word_graph, "missing"), [])
+
+    def test_incremental_update(self):
+        """Test that new entries are merged into a saved graph without rereading old ones."""
+        for word, entry in self.entries[:2]:
+            cache.save_entry(word, entry)
+        first = graph.get_graph()
+        self.assertEqual(graph.related_words(first, "sad"), [])
+
+        cache.save_entry("sad", self.entries[2][1])
+        cache.save_entry("aloof", make_entry("aloof", synonyms=["distant"]))
+        with patch.object(cache, "load_entry", wraps=cache.load_entry) as mock_load:
+            updated = graph.get_graph()
+
+        # Assertions
+        self.assertEqual(sorted(call.args[0] for call in mock_load.call_args_list), ["aloof", "sad"])
+        self.assertEqual(graph.related_words(updated, "sad"), [("gloomy", 1), ("unhappy", 1)])
+        self.assertEqual(graph.related_words(updated, "happy", relation="antonyms"), [("sad", 1)])
+        self.assertEqual(graph.related_words(updated, "aloof"), [("distant", 1)])
+        self.assertEqual(graph.related_words(updated, "glad"), graph.related_words(graph.build_graph(
+            self.entries + [("aloof", make_entry("aloof", synonyms=["distant"]))]), "glad"))
+
+    def test_headword_differs_from_cache_key(self):
+        """Test that an entry whose headword doesn't match its cache key isn't read on every use."""
+        cache.save_entry("colour", make_entry("color", synonyms=["hue"]))
+        first = graph.get_graph()
+
+        with patch.object(cache, "load_entry", wraps=cache.load_entry) as mock_load:
+            again = graph.get_graph()
+
+        # Assertions
+        mock_load.assert_not_called()
+        self.assertEqual(list(again["indexed"]), ["colour"])
+        self.assertEqual(graph.related_words(first, "color"), [("hue", 1)])
+
+    def test_saved_graph_is_memory_mapped(self):
+        """Test saving and memory-mapping a graph."""
+        graph.save_graph(graph.build_graph(self.entries))
+
+        # Call function
+        loaded = graph.load_graph()
+
+        # Assertions
+        self.assertIsInstance(loaded["synonyms_indices"], np.memmap)
+        self.assertEqual(graph.related_words(loaded, "glad", hops=2),
+                         [("happy", 1), ("pleased", 1), ("cheerful", 2)])
+        with patch.object(cache, "load_entry") as mock_load:
+            graph.get_graph()
+        mock_load.assert_not_called()
+
+    def test_pick_near(self):
+        """Test picking an unseen word near today's word."""
+        word_graph = graph.build_graph(self.entries)
+        rng = random.Random(1)
+
+        picks = {graph.pick_near(word_graph, "happy", hops=2, exclude={"glad"}, rng=rng) for _ in range(50)}
+
+        # Assertions
+        self.assertEqual(picks, {"cheerful", "pleased"})
+        self.assertIsNone(graph.pick_near(word_graph, "happy", hops=1, exclude={"glad", "cheerful"}))
+
+    @patch('dailydose.core.graph.get_blocklist', return_value=set())
+    @patch('dailydose.core.graph.SeenIndex.load')
+    @patch('dailydose.core.graph.get_recent_words')
+    def test_pick_next_word(self, mock_recent, mock_load, mock_blocklist):
+        """Test that the next word stays near the last one and skips seen and tried words."""
+        for word, entry in self.entries:
+            cache.save_entry(word, entry)
+        index = seen_index.SeenIndex(["happy", "glad"], bloom=seen_index.BloomFilter(capacity=100))
+        index.add("happy")
+        index.add("glad")
+        mock_load.return_value = index
+        mock_recent.return_value = ["happy"]
+
+        # Call function
+        word = graph.pick_next_word(hops=2, skip={"pleased"})
+
+        # Assertions
+        self.assertEqual(word, "cheerful")
+        mock_recent.assert_called_once_with(1)
+        mock_recent.return_value = []
+        self.assertIsNone(graph.pick_next_word())
+
+    @patch('dailydose.core.graph.get_blocklist', return_value={"cheerful"})
+    @patch('dailydose.core.graph.SeenIndex.load', return_value=None)
+    @patch('dailydose.core.graph.get_recent_words')
+    def test_pick_next_word_filters(self, mock_recent, mock_load, mock_blocklist):
+        """Test the blocklist and length filter, and recent history standing in for a missing index."""
+        entries = self.entries + [("pleased", make_entry("pleased", synonyms=["fine", "ok"]))]
+        for word, entry in entries:
+            cache.save_entry(word, entry)
+        mock_recent.return_value = ["pleased", "happy"]
+
+        # Call function
+        picks = {graph.pick_next_word(hops=3, rng=random.Random(seed)) for seed in range(30)}
+
+        # Assertions
+        self.assertEqual(picks, {"fine", "glad"})
+        mock_recent.assert_called_with(graph.GRAPH_RECENT_WORDS)
+
+    def test_related_command(self):
+        """Test the related command."""
+        for word, entry in self.entries:
+            cache.save_entry(word, entry)
+        printed = io.StringIO()
+
+        # Call function
+        with contextlib.redirect_stdout(printed):
+            cli.cli(["related", "happy", "--hops", "2"])
+
+        # Assertions
+        self.assertIn("7 words from 3 cached entries", printed.getvalue())
+        self.assertIn("1 step: cheerful, glad", printed.getvalue())
+        self.assertIn("2 steps: pleased", printed.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
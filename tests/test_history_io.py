@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+import os
+import shutil
+import tempfile
+from bson import ObjectId
+
+# Import the module to test
+from dailydose.core import history_io, seen_index, storage
+
+class TestHistoryIO(unittest.TestCase):
+    """Test cases for the history_io module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.history_file = os.path.join(self.temp_dir, "word_history.json")
+        self.jsonl_file = os.path.join(self.temp_dir, "history.jsonl")
+        self.entries = [
+            {"word": "time", "date_added": "2023-01-01", "review_count": 0},
+            {"word": "people", "date_added": "2023-01-02", "review_count": 2},
+            {"word": "house", "date_added": "2023-01-03", "review_count": 1}
+        ]
+
+        self.seen_file = os.path.join(self.temp_dir, "seen.idx")
+        for patcher in (patch.object(storage, "HISTORY_FILE", self.history_file),
+                        patch.object(seen_index, "SEEN_INDEX_FILE", self.seen_file)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        shutil.rmtree(self.temp_dir)
+
+    def write_history(self, entries):
+        with open(self.history_file, 'w') as f:
+            json.dump({"words": entries}, f, indent=2)
+
+    def write_jsonl(self, entries):
+        with open(self.jsonl_file, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+
+    def read_jsonl(self):
+        with open(self.jsonl_file) as f:
+            return [json.loads(line) for line in f]
+
+    def test_get_backend(self):
+        """Test resolving the backend name."""
+        with patch.object(storage, "word_collection", None):
+            self.assertEqual(history_io.get_backend(), "file")
+            with self.assertRaises(ValueError):
+                history_io.get_backend("mongo")
+
+        with patch.object(storage, "word_collection", MagicMock()):
+            self.assertEqual(history_io.get_backend(), "mongo")
+
+    def test_export_from_file(self):
+        """Test exporting the history file in small batches."""
+        self.write_history(self.entries)
+
+        # Call function
+        result = history_io.export_history(self.jsonl_file, backend="file", batch_size=2)
+
+        # Assertions
+        self.assertEqual(self.read_jsonl(), self.entries)
+        self.assertEqual(result, {"records": 3, "expected": 3, "verified": True})
+        self.assertFalse(os.path.exists(history_io.get_checkpoint_path(self.jsonl_file)))
+
+    def test_export_resumes_from_checkpoint(self):
+        """Test that an interrupted export continues after the last checkpoint."""
+        self.write_history(self.entries)
+        # One record was committed, then a partial line was written before the interruption
+        committed = json.dumps(self.entries[0]) + "\n"
+        with open(self.jsonl_file, 'w') as f:
+            f.write(committed + '{"word": "peo')
+        history_io.save_checkpoint(history_io.get_checkpoint_path(self.jsonl_file), {
+            "operation": "export:file", "records": 1, "offset": len(committed), "last_id": None
+        })
+
+        # Call function
+        result = history_io.export_history(self.jsonl_file, backend="file")
+
+        # Assertions
+        self.assertEqual(self.read_jsonl(), self.entries)
+        self.assertTrue(result["verified"])
+
+    def test_export_from_mongodb(self):
+        """Test exporting MongoDB documents without their ids."""
+        ids = [ObjectId() for _ in self.entries]
+        collection = MagicMock()
+        collection.find.return_value.sort.return_value.batch_size.return_value = [
+            dict(entry, _id=_id) for entry, _id in zip(self.entries, ids)
+        ]
+        collection.count_documents.return_value = 3
+
+        with patch.object(storage, "word_collection", collection):
+            result = history_io.export_history(self.jsonl_file, backend="mongo")
+
+        # Assertions
+        self.assertEqual(self.read_jsonl(), self.entries)
+        self.assertTrue(result["verified"])
+        collection.find.assert_called_once_with({})
+
+    def test_import_to_mongodb(self):
+        """Test upserting entries with batched bulk writes."""
+        self.write_jsonl(self.entries + [{"date_added": "2023-01-04"}])
+        collection = MagicMock()
+        collection.bulk_write.side_effect = [
+            MagicMock(matched_count=1, upserted_count=1),
+            MagicMock(matched_count=0, upserted_count=1)
+        ]
+        collection.count_documents.return_value = 5
+
+        with patch.object(storage, "word_collection", collection):
+            result = history_io.import_history(self.jsonl_file, backend="mongo", batch_size=2)
+
+        # Assertions
+        self.assertEqual(collection.bulk_write.call_count, 2)
+        requests = collection.bulk_write.call_args_list[0][0][0]
+        self.assertEqual(requests[0]._filter, {"word": "time"})
+        self.assertEqual(result, {"records": 3, "written": 3, "skipped": 1, "total": 5, "verified": True})
+
+    def test_import_to_file_merges_existing(self):
+        """Test that imported entries replace existing ones and the rest are kept."""
+        self.write_history([{"word": "people", "date_added": "2022-12-01"}, {"word": "water"}])
+        self.write_jsonl(self.entries + [{"word": "time"}])
+
+        # Call function
+        result = history_io.import_history(self.jsonl_file, backend="file", batch_size=2)
+
+        with open(self.history_file) as f:
+            history = json.load(f)
+
+        # Assertions
+        self.assertEqual(history["words"], self.entries + [{"word": "water"}])
+        self.assertEqual(result["written"], 3)
+        self.assertEqual(result["skipped"], 1)
+        self.assertEqual(result["total"], 4)
+        self.assertTrue(result["verified"])
+        self.assertFalse(os.path.exists(f"{self.history_file}.import"))
+
+    def test_import_marks_words_seen(self):
+        """Test that imported words are marked in the seen-word index, also after resuming."""
+        seen_index.SeenIndex(["time", "people", "house", "water"]).save()
+        self.write_jsonl(self.entries)
+
+        real_save = history_io.save_checkpoint
+        def save_then_fail(path, state):
+            real_save(path, state)
+            raise KeyboardInterrupt
+        with patch.object(history_io, "save_checkpoint", side_effect=save_then_fail):
+            with self.assertRaises(KeyboardInterrupt):
+                history_io.import_history(self.jsonl_file, backend="file", batch_size=2)
+
+        # Call function
+        history_io.import_history(self.jsonl_file, backend="file", batch_size=2)
+
+        # Assertions
+        index = seen_index.SeenIndex.load()
+        self.assertEqual([index.seen(word) for word in ("time", "people", "house", "water")],
+                         [True, True, True, False])
+
+    def test_import_to_file_resumes_from_checkpoint(self):
+        """Test that an interrupted file import continues after the last checkpoint."""
+        self.write_jsonl(self.entries)
+        checkpoint_path = history_io.get_checkpoint_path(self.jsonl_file)
+
+        # Stop the first run after its first batch has been checkpointed
+        real_save = history_io.save_checkpoint
+        def save_then_fail(path, state):
+            real_save(path, state)
+            raise KeyboardInterrupt
+        with patch.object(history_io, "save_checkpoint", side_effect=save_then_fail):
+            with self.assertRaises(KeyboardInterrupt):
+                history_io.import_history(self.jsonl_file, backend="file", batch_size=2)
+        self.assertTrue(os.path.exists(checkpoint_path))
+
+        # Call function
+        result = history_io.import_history(self.jsonl_file, backend="file", batch_size=2)
+
+        with open(self.history_file) as f:
+            history = json.load(f)
+
+        # Assertions
+        self.assertEqual(history["words"], self.entries)
+        self.assertEqual(result["records"], 3)
+        self.assertTrue(result["verified"])
+        self.assertFalse(os.path.exists(checkpoint_path))
+
+    def test_file_round_trip(self):
+        """Test that exporting and importing leaves the history file unchanged."""
+        self.write_history(self.entries)
+        with open(self.history_file) as f:
+            original = f.read()
+
+        # Call functions
+        history_io.export_history(self.jsonl_file, backend="file")
+        history_io.import_history(self.jsonl_file, backend="file")
+
+        with open(self.history_file) as f:
+            self.assertEqual(f.read(), original)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import unittest
+
+# Import the module to test
+from dailydose.core import html_utils
+
+class TestHtmlUtils(unittest.TestCase):
+    """Test cases for the html_utils module."""
+
+    def test_minify_html(self):
+        """Test collapsing whitespace and removing comments."""
+        html = """
+        <table>
+          <!-- Header -->
+          <tr>
+            <td><strong>Synonyms:</strong>
+              <span>model</span>   <span>pattern</span></td>
+          </tr>
+        </table>
+        """
+
+        # Call function
+        result = html_utils.minify_html(html)
+
+        # Assertions
+        self.assertEqual(result, "<table><tr><td><strong>Synonyms:</strong> <span>model</span> <span>pattern</span></td></tr></table>")
+
+    def test_minify_html_keeps_conditional_comments(self):
+        """Test that Outlook conditional comments survive minification."""
+        html = "<div><!--[if mso]><table><![endif]--></div>"
+        self.assertIn("<!--[if mso]>", html_utils.minify_html(html))
+
+    def test_normalize_style(self):
+        """Test normalizing an inline style declaration."""
+        style = " color: red;\n  Padding: 4px  10px; color:blue; ; "
+        self.assertEqual(html_utils.normalize_style(style), "padding:4px 10px;color:blue")
+
+    def test_dedupe_styles_hoists_repeated_styles(self):
+        """Test moving repeated inline styles into a shared class."""
+        html = ('<html><head></head><body>'
+                '<span style="color:red">a</span><span style="color: red;">b</span>'
+                '<span class="x" style="color:red">c</span><p style="margin:0">d</p>'
+                '</body></html>')
+
+        # Call function
+        result = html_utils.dedupe_styles(html, hoist_min_count=2)
+
+        # Assertions
+        self.assertIn("<style>.s0{color:red}</style></head>", result)
+        self.assertEqual(result.count('<span class="s0">'), 2)
+        self.assertIn('<span class="x" style="color:red">c</span>', result)
+        self.assertIn('<p style="margin:0">d</p>', result)
+
+    def test_dedupe_styles_without_hoisting(self):
+        """Test that styles stay inline unless hoisting is enabled."""
+        html = '<head></head><span style="color:red">a</span><span style="color:red">b</span>'
+        self.assertNotIn("<style>", html_utils.dedupe_styles(html))
+
+    def test_html_to_text(self):
+        """Test converting HTML into a plain-text alternative."""
+        html = ('<html><head><title>Daily Word</title><style>p{}</style></head><body>'
+                '<h1>EXAMPLE</h1><p>&quot;an example&quot;</p>'
+                '<ul><li>one</li><li>two</li></ul>'
+                '<p><a href="https://example.com">Origin</a></p></body></html>')
+
+        # Call function
+        result = html_utils.html_to_text(html)
+
+        # Assertions
+        self.assertNotIn("Daily Word", result)
+        self.assertIn('EXAMPLE\n\n"an example"', result)
+        self.assertIn("- one", result)
+        self.assertIn("- two", result)
+        self.assertIn("Origin (https://example.com)", result)
+
+    def test_html_to_text_unescapes_once(self):
+        """Test that escaped entities in the text stay escaped once."""
+        result = html_utils.html_to_text("<p>Use &amp;lt; for &lt;</p>")
+
+        # Assertions
+        self.assertEqual(result, "Use &lt; for <\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import io
+import json
+import os
+import shutil
+import logging
+import tempfile
+import contextlib
+
+# Import the module to test
+from dailydose.core import log
+
+class TestLog(unittest.TestCase):
+    """Test cases for the structured logging module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "dailydose.log")
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        # Back to the default configuration for the other tests
+        log.setup()
+        shutil.rmtree(self.temp_dir)
+
+    def read_events(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_json_lines_through_queue(self):
+        """Test that events are written as JSON lines with their fields."""
+        log.setup("INFO", self.path)
+        logger = log.get_logger("email")
+
+        # Call functions
+        logger.info("email_sent", extra={"recipient": "user@example.com", "message_id": "abc"})
+        logger.debug("template_hit")
+        log.shutdown()
+
+        events = self.read_events()
+
+        # Assertions
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["event"], "email_sent")
+        self.assertEqual(events[0]["level"], "INFO")
+        self.assertEqual(events[0]["logger"], "dailydose.email")
+        self.assertEqual(events[0]["recipient"], "user@example.com")
+        self.assertIn("time", events[0])
+
+    def test_level_is_configurable(self):
+        """Test that DEBUG events are kept when the level allows them."""
+        log.setup("debug", self.path)
+        log.get_logger("email").debug("template_hit", extra={"template": "word_email.html"})
+        log.shutdown()
+
+        # Assertions
+        self.assertEqual(self.read_events()[0]["template"], "word_email.html")
+
+    def test_unknown_level_falls_back_to_info(self):
+        """Test that an unknown level name warns and uses INFO."""
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            log.setup("LOUD", self.path)
+
+        # Assertions
+        self.assertIn("unknown log level", mock_stdout.getvalue())
+        self.assertEqual(logging.getLogger(log.LOGGER_NAME).level, logging.INFO)
+
+    def test_sampler(self):
+        """Test that the sampler keeps a fixed share of events."""
+        every_tenth = log.EventSampler(0.1)
+        none = log.EventSampler(0)
+        everything = log.EventSampler(1)
+
+        kept = [i for i in range(30) if every_tenth.sample()]
+
+        # Assertions
+        self.assertEqual(kept, [0, 10, 20])
+        self.assertFalse(any(none.sample() for _ in range(100)))
+        self.assertTrue(all(everything.sample() for _ in range(100)))
+
+    def test_event_sampler_clamps_rate(self):
+        """Test that rates outside 0 to 1 keep everything or nothing instead of failing."""
+        self.assertTrue(all(log.EventSampler(5).sample() for _ in range(10)))
+        self.assertTrue(all(log.EventSampler(0.9).sample() for _ in range(10)))
+        self.assertFalse(any(log.EventSampler(-0.5).sample() for _ in range(10)))
+
+    def test_send_failures_logged_and_successes_sampled(self):
+        """Test send_email's per-recipient events."""
+        from dailydose.core import email_service
+        log.setup("INFO", self.path)
+        artifact = {"subject": "s", "html": "h", "text": "t"}
+
+        with patch.object(email_service, "EMAIL_ENABLED", True), \
+             patch.object(email_service, "ses_client") as mock_ses, \
+             patch.object(email_service, "_sent_sampler", log.EventSampler(0.5)):
+            mock_ses.send_email.side_effect = [{"MessageId": str(i)} for i in range(4)] + [Exception("throttled")]
+            with contextlib.redirect_stdout(io.StringIO()) as printed:
+                results = [email_service.send_email(f"user{i}@example.com", artifact) for i in range(5)]
+        log.shutdown()
+
+        events = self.read_events()
+
+        # Assertions
+        self.assertEqual(results, [True, True, True, True, False])
+        self.assertEqual([e["event"] for e in events], ["email_sent", "email_sent", "email_failed"])
+        self.assertEqual(events[2]["recipient"], "user4@example.com")
+        self.assertEqual(printed.getvalue(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import json
+import os
+import shutil
+import tempfile
+
+# Import the module to test
+from dailydose.core import metrics
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the metrics module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        metrics.reset()
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        metrics.disable()
+        metrics.reset()
+        shutil.rmtree(self.temp_dir)
+
+    def test_disabled_collects_nothing(self):
+        """Test that nothing is recorded while metrics are off."""
+        metrics.disable()
+
+        metrics.increment("emails", status="sent")
+        with metrics.timer("ses_send"):
+            pass
+
+        # Assertions
+        self.assertIs(metrics.timer("ses_send"), metrics.timer("template_render"))
+        self.assertEqual(metrics.snapshot()["counters"], [])
+        self.assertEqual(metrics.snapshot()["timers"], [])
+
+    def test_counters_and_timers(self):
+        """Test counting and timing with tags."""
+        metrics.enable("json", os.path.join(self.temp_dir, "metrics.json"))
+
+        @metrics.timed("storage_save", backend="file")
+        def save():
+            return "saved"
+
+        metrics.increment("cache_lookups", cache="dictionary", result="hit")
+        metrics.increment("cache_lookups", cache="dictionary", result="hit")
+        metrics.increment("cache_lookups", cache="dictionary", result="miss")
+        self.assertEqual(save(), "saved")
+        save()
+
+        data = metrics.snapshot()
+
+        # Assertions
+        self.assertEqual(data["counters"], [
+            {"name": "cache_lookups", "tags": {"cache": "dictionary", "result": "hit"}, "value": 2},
+            {"name": "cache_lookups", "tags": {"cache": "dictionary", "result": "miss"}, "value": 1}
+        ])
+        self.assertEqual(data["timers"][0]["name"], "storage_save")
+        self.assertEqual(data["timers"][0]["tags"], {"backend": "file"})
+        self.assertEqual(data["timers"][0]["count"], 2)
+        self.assertGreaterEqual(data["timers"][0]["sum"], data["timers"][0]["max"])
+
+    def test_export_json(self):
+        """Test writing metrics as JSON."""
+        path = os.path.join(self.temp_dir, "metrics.json")
+        metrics.enable("json", path)
+        metrics.increment("retries", operation="word_lookup")
+
+        # Call function
+        self.assertEqual(metrics.export(), path)
+
+        with open(path) as f:
+            data = json.load(f)
+
+        # Assertions
+        self.assertEqual(data["counters"][0]["value"], 1)
+        self.assertIn("generated_at", data)
+
+    def test_export_prometheus(self):
+        """Test writing metrics as a Prometheus textfile."""
+        path = os.path.join(self.temp_dir, "metrics.prom")
+        metrics.enable("prometheus", path)
+        metrics.increment("emails", status="sent")
+        metrics.observe("ses_send", 0.25)
+        metrics.observe("ses_send", 0.5)
+
+        # Call function
+        metrics.export()
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+
+        # Assertions
+        self.assertIn("# TYPE dailydose_emails_total counter", lines)
+        self.assertIn('dailydose_emails_total{status="sent"} 1', lines)
+        self.assertIn("# TYPE dailydose_ses_send_seconds summary", lines)
+        self.assertIn("dailydose_ses_send_seconds_count 2", lines)
+        self.assertIn("dailydose_ses_send_seconds_sum 0.750000", lines)
+        self.assertIn("dailydose_ses_send_seconds_max 0.500000", lines)
+
+    def test_enable_registers_export_at_exit(self):
+        """Test that enabling registers one exit hook and disabling removes it."""
+        with patch('dailydose.core.metrics.atexit') as mock_atexit:
+            metrics.enable("json")
+            metrics.enable("prometheus")
+            metrics.disable()
+
+        # Assertions
+        mock_atexit.register.assert_called_once_with(metrics.export)
+        mock_atexit.unregister.assert_called_once_with(metrics.export)
+
+    def test_enable_unknown_format(self):
+        """Test that unknown formats are rejected."""
+        with self.assertRaises(ValueError):
+            metrics.enable("csv")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import json
+import tracemalloc
+
+# Import the module to test
+from dailydose.core import models, email_service
+from dailydose.core.models import WordEntry
+
+API_RESPONSE = [{
+    "word": "example",
+    "phonetic": "/ɪɡˈzɑːmpəl/",
+    "phonetics": [
+        {"text": "/ɪɡˈzɑːmpəl/", "audio": "https://api.dictionaryapi.dev/media/pronunciations/en/example-uk.mp3",
+         "sourceUrl": "https://commons.wikimedia.org/w/index.php?curid=1", "license": {"name": "BY 3.0 US"}},
+        {"audio": "", "sourceUrl": "https://commons.wikimedia.org/w/index.php?curid=2"}
+    ],
+    "meanings": [
+        {
+            "partOfSpeech": "noun",
+            "definitions": [
+                {"definition": "a representative form or pattern", "example": "I followed your example",
+                 "synonyms": [], "antonyms": []}
+            ],
+            "synonyms": ["model", "pattern"],
+            "antonyms": []
+        }
+    ],
+    "license": {"name": "CC BY-SA 3.0", "url": "https://creativecommons.org/licenses/by-sa/3.0"},
+    "sourceUrls": ["https://en.wiktionary.org/wiki/example"]
+}]
+
+class TestModels(unittest.TestCase):
+    """Test cases for the models module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.payload = json.dumps(API_RESPONSE).encode("utf-8")
+
+    def test_from_json_trims_unused_fields(self):
+        """Test decoding an API response and dropping what we never read."""
+        entry = WordEntry.from_json(self.payload)
+
+        # Assertions
+        self.assertEqual(entry.to_dict(), {
+            "word": "example",
+            "phonetics": [{"text": "/ɪɡˈzɑːmpəl/", "audio": API_RESPONSE[0]["phonetics"][0]["audio"]}],
+            "meanings": [{
+                "partOfSpeech": "noun",
+                "definitions": [{"definition": "a representative form or pattern", "example": "I followed your example"}],
+                "synonyms": ["model", "pattern"]
+            }]
+        })
+
+    def test_dict_style_access(self):
+        """Test that entries read like the raw dictionaries they replace."""
+        entry = WordEntry.from_json(self.payload)
+        meaning = entry["meanings"][0]
+        definition = meaning.get("definitions")[0]
+
+        entry["difficulty"] = "Intermediate"
+
+        # Assertions
+        self.assertEqual(meaning["partOfSpeech"], "noun")
+        self.assertIn("example", definition)
+        self.assertNotIn("license", entry)
+        self.assertEqual(list(meaning.get("antonyms", [])), [])
+        self.assertEqual(entry.get("license", "none"), "none")
+        self.assertEqual(entry.difficulty, "Intermediate")
+        with self.assertRaises(KeyError):
+            entry["license"]
+        with self.assertRaises(KeyError):
+            entry["word"] = "other"
+
+    def test_round_trip(self):
+        """Test that serialized entries decode to an equal entry, with or without orjson."""
+        entry = WordEntry.from_json(self.payload)
+        entry["derived"] = {"version": 1, "difficulty": "Intermediate"}
+
+        encoded = entry.to_json()
+        with patch.object(models, "orjson", None):
+            fallback = entry.to_json()
+
+        # Assertions
+        self.assertEqual(WordEntry.from_json(encoded), entry)
+        self.assertEqual(json.loads(fallback), json.loads(encoded))
+        self.assertNotIn(b" ", fallback.replace(b"a representative form or pattern", b"")
+                         .replace(b"I followed your example", b""))
+
+    def test_renders_in_email_template(self):
+        """Test that the email template reads entries like dicts."""
+        html = email_service.render_word_email(WordEntry.from_json(self.payload))
+
+        # Assertions
+        self.assertIn("/ɪɡˈzɑːmpəl/", html)
+        self.assertIn("noun", html)
+        self.assertIn("I followed your example", html)
+
+    def test_smaller_than_raw_dicts(self):
+        """Test that many entries take less memory than the decoded payloads."""
+        def measure(build):
+            tracemalloc.start()
+            try:
+                kept = [build() for _ in range(200)]
+                return tracemalloc.get_traced_memory()[0], kept
+            finally:
+                tracemalloc.stop()
+
+        raw, _ = measure(lambda: json.loads(self.payload)[0])
+        compact, _ = measure(lambda: WordEntry.from_json(self.payload))
+
+        # Assertions
+        self.assertLess(compact, raw / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
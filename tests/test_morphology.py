@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+
+# Import the module to test
+from dailydose.core import morphology
+
+class TestMorphology(unittest.TestCase):
+    """Test cases for the morphology module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.analyzer = morphology.MorphologyAnalyzer(
+            prefixes={"in": "into", "inter": "between", "un": "not"},
+            suffixes={"tion": "action", "ation": "action or result", "able": "can be done"},
+            roots={"nat": "born", "nation": "people", "port": "carry"},
+            words=["import"]
+        )
+
+    def test_trie_longest_match(self):
+        """Test that the longest key wins regardless of insertion order."""
+        trie = morphology.AffixTrie()
+        trie.insert("in", "short")
+        trie.insert("inter", "long")
+
+        # Assertions
+        self.assertEqual(trie.longest_match("international"), (5, "long"))
+        self.assertEqual(trie.longest_match("inside"), (2, "short"))
+        self.assertEqual(trie.longest_match("outside"), (0, None))
+        self.assertEqual(len(trie), 2)
+
+    def test_trie_backward_match(self):
+        """Test matching reversed keys from the end of a word."""
+        trie = morphology.AffixTrie()
+        trie.insert("noit", "tion")
+
+        self.assertEqual(trie.longest_match("nation", 5, -1, step=-1), (4, "tion"))
+
+    def test_analyze_longest_prefix_and_suffix(self):
+        """Test splitting a word into prefix, roots and suffix."""
+        result = self.analyzer.analyze("Internationable")
+
+        # Assertions
+        self.assertEqual(result["prefix"], {"text": "inter", "meaning": "between"})
+        self.assertEqual(result["roots"], [{"text": "nation", "meaning": "people"}])
+        self.assertEqual(result["suffix"], {"text": "able", "meaning": "can be done"})
+
+        # "ation" beats "tion" once the stem is long enough
+        self.assertEqual(self.analyzer.analyze("importation")["suffix"]["text"], "ation")
+
+    def test_analyze_keeps_a_stem(self):
+        """Test that affixes leaving too short a stem are ignored."""
+        result = self.analyzer.analyze("unnation")
+
+        # Assertions
+        self.assertEqual(result["prefix"]["text"], "un")
+        self.assertEqual(result["roots"], [{"text": "nation", "meaning": "people"}])
+        self.assertIsNone(result["suffix"])
+
+    def test_analyze_avoids_false_prefixes(self):
+        """Test that an affix needs a known root or word left after it."""
+        analyzer = morphology.MorphologyAnalyzer(
+            prefixes={"bi": "two", "in": "into", "inter": "between", "re": "again", "un": "not"},
+            suffixes={"ing": "action", "ist": "person"},
+            roots={"bio": "life", "log": "word", "port": "carry"},
+            words=["insist", "interest", "lock", "read", "reader"]
+        )
+
+        # Assertions
+        self.assertIsNone(analyzer.analyze("interesting")["prefix"])
+        self.assertIsNone(analyzer.analyze("reading")["prefix"])
+        self.assertEqual(analyzer.analyze("reading")["suffix"]["text"], "ing")
+        self.assertEqual(analyzer.analyze("biology"), {"prefix": None, "suffix": None, "roots": [
+            {"text": "bio", "meaning": "life"}, {"text": "log", "meaning": "word"}]})
+        self.assertEqual(analyzer.analyze("report")["prefix"]["text"], "re")
+        self.assertEqual(analyzer.analyze("unlock")["prefix"]["text"], "un")
+        self.assertEqual(analyzer.analyze("reader"), {"prefix": None, "roots": [], "suffix": None})
+        self.assertEqual(analyzer.analyze("insist"), {"prefix": None, "roots": [], "suffix": None})
+
+    def test_analyze_without_word_list(self):
+        """Test that only known roots count as stems until a word list is known."""
+        analyzer = morphology.MorphologyAnalyzer(
+            prefixes={"re": "again", "un": "not"},
+            roots={"port": "carry"}
+        )
+
+        # Assertions
+        self.assertIsNone(analyzer.analyze("unlock")["prefix"])
+        self.assertEqual(analyzer.analyze("report")["prefix"]["text"], "re")
+
+        analyzer.set_words(["lock"])
+        self.assertEqual(analyzer.analyze("unlock")["prefix"]["text"], "un")
+
+    def test_known_words_are_remembered(self):
+        """Test that a fetched word list is saved and used by a freshly loaded analyzer."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "known_words.txt")
+            with patch.object(morphology, "KNOWN_WORDS_FILE", path), patch.object(morphology, "_analyzer", None):
+                self.assertIsNone(morphology.analyze_word("unlock")["prefix"])
+                morphology.set_known_words(["lock", "read"])
+
+                # Assertions
+                self.assertEqual(morphology.analyze_word("unlock")["prefix"]["text"], "un")
+                self.assertEqual(morphology.load_known_words(), ["lock", "read"])
+
+                morphology._analyzer = None
+                self.assertEqual(morphology.analyze_word("unlock")["prefix"]["text"], "un")
+
+    def test_analyze_no_match(self):
+        """Test a word without any known parts."""
+        self.assertEqual(self.analyzer.analyze("elephant"), {"prefix": None, "roots": [], "suffix": None})
+
+    def test_from_file(self):
+        """Test loading the analyzer from a data file."""
+        fd, path = tempfile.mkstemp(suffix=".tsv")
+        with os.fdopen(fd, "w") as f:
+            f.write("# comment\nprefix\tre\tagain\nsuffix\tness\tstate\nroot\tport\tcarry\n")
+        try:
+            analyzer = morphology.MorphologyAnalyzer.from_file(path)
+        finally:
+            os.remove(path)
+
+        result = analyzer.analyze("reportness")
+
+        # Assertions
+        self.assertEqual(result["prefix"]["meaning"], "again")
+        self.assertEqual(result["roots"][0]["text"], "port")
+        self.assertEqual(result["suffix"]["text"], "ness")
+
+    def test_bundled_data(self):
+        """Test the bundled data file and the shared analyzer."""
+        self.assertEqual(morphology.analyze_word("transportation")["prefix"]["text"], "trans")
+        self.assertEqual(morphology.count_morphemes("transportation"), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import os
+import time
+import shutil
+import tempfile
+import threading
+
+# Import the module to test
+from dailydose.core import pipeline, storage
+from dailydose.core.models import WordEntry
+
+def make_entry(word):
+    return {"word": word, "meanings": [{"partOfSpeech": "noun", "definitions": [{"definition": f"A {word}."}]}]}
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for the pipeline module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        # Keep any stray write away from the working directory's history file
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        patchers = {
+            "history_file": patch.object(storage, "HISTORY_FILE", os.path.join(self.temp_dir, "word_history.json")),
+            "get_word_info": patch('dailydose.core.pipeline.get_word_info',
+                                   side_effect=lambda word: None if word == "missing" else make_entry(word)),
+            "save_word_history": patch('dailydose.core.pipeline.save_word_history', return_value=False),
+            "mark_seen": patch('dailydose.core.pipeline.mark_seen'),
+            "send_word_email": patch('dailydose.core.pipeline.send_word_email', return_value=True),
+            "get_email_artifact": patch('dailydose.core.pipeline.get_email_artifact')
+        }
+        self.mocks = {name: patcher.start() for name, patcher in patchers.items()}
+        for patcher in patchers.values():
+            self.addCleanup(patcher.stop)
+        self.subscribers = ["a@example.com", "b@example.com"]
+
+    def test_enrich(self):
+        """Test that enrich adds the derived content and difficulty."""
+        word_data = pipeline.enrich(make_entry("example"))
+
+        # Assertions
+        self.assertEqual(word_data["difficulty"], word_data["derived"]["difficulty"])
+        self.assertIn("memory_tip", word_data["derived"])
+
+    def test_notify(self):
+        """Test that notify renders once, sends to everyone and counts the results."""
+        self.mocks["send_word_email"].side_effect = [True, False]
+        word_data = pipeline.enrich(make_entry("example"))
+
+        # Call function
+        emails = pipeline.notify(word_data, self.subscribers)
+
+        # Assertions
+        self.assertEqual(emails, {"subscribers": 2, "sent": 1, "failed": 1})
+        self.mocks["get_email_artifact"].assert_called_once_with(word_data)
+        self.assertEqual(list(self.mocks["mark_seen"].call_args[0][0]), [("example", "a@example.com")])
+
+    def test_deliver_runs_persist_and_notify_concurrently(self):
+        """Test that a slow save doesn't delay the emails."""
+        def slow_save(word, info):
+            time.sleep(0.3)
+            return True
+
+        def slow_send(email, word_data, artifact):
+            time.sleep(0.15)
+            return True
+
+        self.mocks["save_word_history"].side_effect = slow_save
+        self.mocks["send_word_email"].side_effect = slow_send
+        word_data = pipeline.enrich(make_entry("example"))
+
+        # Call function
+        started = time.perf_counter()
+        saved, emails = pipeline.deliver(word_data, subscribers=self.subscribers)
+        elapsed = time.perf_counter() - started
+
+        # Assertions
+        self.assertTrue(saved)
+        self.assertEqual(emails["sent"], 2)
+        self.assertLess(elapsed, 0.5)
+
+    def test_run_pipeline_batch(self):
+        """Test a batch of words, including one that isn't found."""
+        shown = []
+
+        # Call function
+        results = list(pipeline.run_pipeline(["alpha", "missing", "gamma"], subscribers=self.subscribers,
+                                             on_enriched=lambda data: shown.append(data["word"])))
+        by_word = {result["word"]: result for result in results}
+
+        # Assertions
+        self.assertEqual(sorted(by_word), ["alpha", "gamma", "missing"])
+        self.assertIsNone(by_word["missing"]["word_data"])
+        self.assertEqual(by_word["alpha"]["emails"]["sent"], 2)
+        self.assertIn("difficulty", by_word["gamma"]["word_data"])
+        self.assertIsNone(by_word["gamma"]["error"])
+        self.assertEqual(shown, ["alpha", "gamma"])
+        self.assertEqual(self.mocks["save_word_history"].call_count, 2)
+
+    def test_run_pipeline_word_entries(self):
+        """Test that WordEntry records from the dictionary go through every stage."""
+        self.mocks["get_word_info"].side_effect = lambda word: WordEntry.coerce(make_entry(word))
+
+        # Call function
+        results = list(pipeline.run_pipeline(["alpha", "beta"], subscribers=self.subscribers))
+
+        # Assertions
+        self.assertEqual(sorted(result["word"] for result in results), ["alpha", "beta"])
+        for result in results:
+            self.assertIsInstance(result["word_data"], WordEntry)
+            self.assertIsNone(result["error"])
+            self.assertEqual(result["emails"]["sent"], 2)
+        self.assertEqual(self.mocks["save_word_history"].call_count, 2)
+
+    def test_run_pipeline_without_sending(self):
+        """Test that send=False only persists."""
+        results = list(pipeline.run_pipeline(["alpha"], send=False))
+
+        # Assertions
+        self.assertIsNone(results[0]["emails"])
+        self.mocks["save_word_history"].assert_called_once()
+        self.mocks["send_word_email"].assert_not_called()
+
+    def test_run_pipeline_stage_error(self):
+        """Test that a failing stage is reported without stopping the other stages."""
+        self.mocks["save_word_history"].side_effect = OSError("disk full")
+
+        # Call function
+        results = list(pipeline.run_pipeline(["alpha", "beta"], subscribers=self.subscribers))
+
+        # Assertions
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(isinstance(result["error"], OSError) for result in results))
+        self.assertTrue(all(result["emails"]["sent"] == 2 for result in results))
+
+    def test_run_pipeline_queues_are_bounded(self):
+        """Test that a slow stage holds back fetching instead of letting words pile up."""
+        fetched = []
+        release = threading.Event()
+        self.mocks["get_word_info"].side_effect = lambda word: fetched.append(word) or make_entry(word)
+        self.mocks["send_word_email"].side_effect = lambda *args: release.wait(5)
+
+        results = pipeline.run_pipeline((f"word{i}" for i in range(100)), subscribers=["a@example.com"],
+                                        queue_size=2)
+        consumer = threading.Thread(target=lambda: list(results))
+        consumer.start()
+        time.sleep(0.5)
+        backlog = len(fetched)
+        release.set()
+        consumer.join(10)
+
+        # Assertions
+        # In flight: one word per stage thread plus one queue of 2 words between each pair
+        self.assertLess(backlog, 12)
+        self.assertEqual(len(fetched), 100)
+
+    def test_run_pipeline_daemon_source_can_stop(self):
+        """Test that a caller can stop reading from an endless source."""
+        def forever():
+            i = 0
+            while True:
+                i += 1
+                yield f"word{i}"
+
+        before = set(threading.enumerate())
+        results = pipeline.run_pipeline(forever(), send=False, queue_size=2)
+        first = [next(results)["word"] for _ in range(3)]
+        results.close()
+
+        # Assertions
+        self.assertEqual(first, ["word1", "word2", "word3"])
+        self.assertEqual(set(threading.enumerate()) - before, set())
+
+    def test_run_pipeline_close_waits_for_stages(self):
+        """Test that close() returns only after the stage in progress is done."""
+        finished = []
+
+        def slow_save(word, info):
+            time.sleep(0.3)
+            finished.append(word)
+            return True
+
+        self.mocks["save_word_history"].side_effect = slow_save
+
+        before = set(threading.enumerate())
+        results = pipeline.run_pipeline((f"word{i}" for i in range(100)), send=False, queue_size=2)
+        next(results)
+        saved = len(finished)
+        results.close()
+
+        # Assertions
+        self.assertLessEqual(len(finished), saved + 1)
+        self.assertEqual(set(threading.enumerate()) - before, set())
+        count = self.mocks["save_word_history"].call_count
+        time.sleep(0.4)
+        self.assertEqual(self.mocks["save_word_history"].call_count, count)
+
+
+if __name__ == '__main__':
+    unittest.main()
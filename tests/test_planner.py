@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch, MagicMock
+import io
+import os
+import random
+import shutil
+import datetime
+import tempfile
+from collections import OrderedDict
+import contextlib
+import numpy as np
+
+# Import the module to test
+from dailydose import cli, main
+from dailydose.core import cache, email_service, planner
+from dailydose.core.difficulty import build_difficulty_table
+from dailydose.core.models import WordEntry
+from dailydose.core.word_utils import get_derived_content
+
+WORDS = ["time", "year", "people", "house", "garden", "river", "lantern", "meadow", "harbour", "quiver"]
+
+def make_entry(word):
+    return {
+        "word": word,
+        "meanings": [{
+            "partOfSpeech": "noun",
+            "definitions": [{"definition": f"A kind of {word}.", "example": f"The {word} was there."}],
+            "synonyms": [],
+            "antonyms": []
+        }]
+    }
+
+class TestPlanner(unittest.TestCase):
+    """Test cases for the planner module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.seen = np.zeros(len(WORDS), dtype=bool)
+        self.lookups = []
+        self.invalid = set()
+
+        seen_index = MagicMock()
+        seen_index.seen_mask.side_effect = lambda: self.seen
+        self.patches = [
+            patch.object(cache, "DICTIONARY_CACHE_DIR", os.path.join(self.temp_dir, "dictionary")),
+            patch.object(cache, "_entries", {}),
+            patch.object(email_service, "ARTIFACT_DIR", os.path.join(self.temp_dir, "artifacts")),
+            patch.object(email_service, "_artifact_cache", OrderedDict()),
+            patch.object(planner, "PLAN_FILE", os.path.join(self.temp_dir, "plan.json")),
+            patch.object(planner, "PLAN_PROGRESSION", "weekly"),
+            patch.object(planner, "get_word_list", return_value=WORDS),
+            patch.object(planner, "get_difficulty_table", side_effect=build_difficulty_table),
+            patch.object(planner, "get_word_history_dates", return_value={}),
+            patch.object(planner, "get_blocklist", return_value=set()),
+            patch.object(planner, "get_seen_index", return_value=seen_index),
+            patch.object(planner, "get_cached_word_info", side_effect=self.fake_word_info),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def fake_word_info(self, word):
+        self.lookups.append(word)
+        if word in self.invalid:
+            return None
+        entry = WordEntry.coerce(make_entry(word))
+        get_derived_content(entry)
+        cache.save_entry(word, entry)
+        return entry
+
+    def test_level_for_date(self):
+        """Test the weekly difficulty progression and its overrides."""
+        monday = datetime.date(2026, 10, 19)
+
+        # Assertions
+        self.assertEqual(planner.level_for_date(monday), "Basic")
+        self.assertEqual(planner.level_for_date(monday + datetime.timedelta(days=3)), "Intermediate")
+        self.assertEqual(planner.level_for_date(monday + datetime.timedelta(days=6)), "Advanced")
+        self.assertEqual(planner.level_for_date(monday, level="Advanced"), "Advanced")
+        with patch.object(planner, "PLAN_PROGRESSION", "none"), patch.object(planner, "WORD_LEVEL", None):
+            self.assertIsNone(planner.level_for_date(monday))
+
+    def test_plan_days(self):
+        """Test that each day gets a different unseen word with a rendered email."""
+        self.seen[[0, 1]] = True
+        start = datetime.date.today() + datetime.timedelta(days=1)
+
+        # Call function
+        results = planner.plan_days(5, start=start, rng=random.Random(3))
+
+        # Assertions
+        words = [day["word"] for day in results]
+        self.assertEqual(len(set(words)), 5)
+        self.assertNotIn("time", words)
+        self.assertNotIn("year", words)
+        plan = planner.load_plan()
+        self.assertEqual([plan[day["date"]]["word"] for day in results], words)
+        for day in results:
+            self.assertEqual(day["level"], planner.level_for_date(datetime.date.fromisoformat(day["date"])))
+            key = email_service.get_artifact_key(cache.load_entry(day["word"]))
+            self.assertTrue(os.path.exists(email_service.get_artifact_path(day["word"], day["date"], key=key)))
+            self.assertIsNotNone(planner.get_planned_word_info(day["date"]))
+
+    def test_plan_skips_invalid_entries(self):
+        """Test that words without a usable entry are skipped and never retried."""
+        self.invalid = set(WORDS[:6])
+        start = datetime.date.today() + datetime.timedelta(days=1)
+
+        # Call function
+        results = planner.plan_days(4, start=start, rng=random.Random(5))
+
+        # Assertions
+        self.assertEqual(sorted(day["word"] for day in results), sorted(WORDS[6:]))
+        self.assertEqual(len(self.lookups), len(set(self.lookups)))
+        self.assertEqual(planner.plan_days(1, start=start + datetime.timedelta(days=4))[0]["word"], None)
+
+    def test_existing_days_are_kept(self):
+        """Test that planning again only fills new days unless replanning."""
+        start = datetime.date.today() + datetime.timedelta(days=1)
+        first = planner.plan_days(2, start=start, rng=random.Random(1))
+
+        # Call function
+        again = planner.plan_days(3, start=start, rng=random.Random(1))
+        replanned = planner.plan_days(2, start=start, replan=True, rng=random.Random(2))
+
+        # Assertions
+        self.assertEqual([day["word"] for day in again[:2]], [day["word"] for day in first])
+        self.assertEqual([day["planned"] for day in again], [False, False, True])
+        self.assertNotIn(again[2]["word"], [day["word"] for day in replanned])
+        self.assertEqual(len(planner.load_plan()), 3)
+
+    def test_past_days_are_dropped(self):
+        """Test that saving a plan forgets days before today."""
+        yesterday = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+        today = datetime.date.today().isoformat()
+
+        planner.save_plan({yesterday: {"word": "time"}, today: {"word": "year"}})
+
+        # Assertions
+        self.assertEqual(list(planner.load_plan()), [today])
+
+    def test_main_sends_planned_word(self):
+        """Test that the daily run uses the planned word without choosing or fetching one."""
+        planner.plan_days(1, start=datetime.date.today(), rng=random.Random(4))
+        word = planner.load_plan()[datetime.date.today().isoformat()]["word"]
+
+        with patch('dailydose.main.initialize_mongodb'), \
+                patch('dailydose.main.choose_word') as mock_choose, \
+                patch('dailydose.main.display_word_info') as mock_display:
+            main.main()
+
+        # Assertions
+        mock_choose.assert_not_called()
+        self.assertEqual(mock_display.call_args[0][0]["word"], word)
+
+    def test_planned_email_is_sent_without_rendering(self):
+        """Test that the daily run sends the email rendered by planning, through the real display and pipeline."""
+        planner.plan_days(1, start=datetime.date.today(), rng=random.Random(4))
+        email_service._artifact_cache.clear()
+        cache.clear_memory_cache()
+
+        with patch('dailydose.main.initialize_mongodb'), \
+                patch('dailydose.core.display.EMAIL_ENABLED', True), \
+                patch('dailydose.core.pipeline.iter_subscribers', return_value=["a@example.com"]), \
+                patch('dailydose.core.pipeline.send_word_email', return_value=True) as mock_send, \
+                patch('dailydose.core.pipeline.save_word_history', return_value=False), \
+                patch('dailydose.core.pipeline.mark_seen'), \
+                patch.object(email_service, "render_word_email", wraps=email_service.render_word_email) as mock_render, \
+                contextlib.redirect_stdout(io.StringIO()):
+            main.main()
+
+        # Assertions
+        mock_render.assert_not_called()
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertEqual(mock_send.call_args[0][2]["word"], planner.load_plan()[datetime.date.today().isoformat()]["word"])
+
+    def test_plan_command(self):
+        """Test the plan command output."""
+        printed = io.StringIO()
+        start = datetime.date.today() + datetime.timedelta(days=1)
+
+        # Call function
+        with patch('dailydose.cli.initialize_mongodb'), contextlib.redirect_stdout(printed):
+            cli.cli(["plan", "--days", "3", "--start", start.isoformat(), "--level", "Basic"])
+
+        # Assertions
+        lines = printed.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].strip().startswith(f"{start.isoformat()}  Basic"))
+
+
+if __name__ == '__main__':
+    unittest.main()
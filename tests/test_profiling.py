@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+import unittest
+import io
+import os
+import pstats
+import shutil
+import tempfile
+import contextlib
+from collections import Counter
+
+# Import the module to test
+from dailydose.core import profiling, metrics
+
+def busy(n=20000):
+    return sum(i * i for i in range(n))
+
+class TestProfiling(unittest.TestCase):
+    """Test cases for the profiling module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        metrics.reset()
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        metrics.disable()
+        metrics.reset()
+        shutil.rmtree(self.temp_dir)
+
+    def test_sampling_profiler_summary(self):
+        """Test collapsed output and the top-function summary."""
+        sampler = profiling.SamplingProfiler()
+        sampler.stacks = Counter({
+            ("main", "fetch", "recv"): 6,
+            ("main", "render"): 3,
+            ("main",): 1
+        })
+        path = os.path.join(self.temp_dir, "profile.txt")
+
+        # Call functions
+        sampler.write_collapsed(path)
+        top = sampler.top_functions(2)
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+
+        # Assertions
+        self.assertEqual(lines[0], "main;fetch;recv 6")
+        self.assertEqual(top, [("recv", 6, 6), ("render", 3, 3)])
+
+    def test_sampling_profiler_collects_samples(self):
+        """Test that the sampler records the profiled thread's stacks."""
+        output = os.path.join(self.temp_dir, "profile.txt")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            profiling.run_profiled(lambda: [busy() for _ in range(50)], mode="sample",
+                                   output=output, interval=0.001)
+
+        with open(output) as f:
+            content = f.read()
+
+        # Assertions
+        self.assertIn("busy (test_profiling.py", content)
+
+    def test_cprofile_artifact(self):
+        """Test that cProfile results are written as a pstats file and summarized."""
+        output = os.path.join(self.temp_dir, "profile.prof")
+        printed = io.StringIO()
+
+        with contextlib.redirect_stdout(printed):
+            result = profiling.run_profiled(busy, mode="cprofile", output=output, top=5)
+
+        # Assertions
+        self.assertEqual(result, busy())
+        self.assertTrue(pstats.Stats(output).total_calls > 0)
+        self.assertIn("Top 5 functions", printed.getvalue())
+
+    def test_trace_memory_per_stage(self):
+        """Test that nested stages each get their own memory peak."""
+        def run():
+            with metrics.timer("outer"):
+                with metrics.timer("inner"):
+                    data = bytearray(2_000_000)
+                    del data
+                small = bytearray(100_000)
+                del small
+
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            profiling.run_profiled(run, trace_memory=True)
+
+        stage_lines = [line.split()[-1] for line in printed.getvalue().splitlines() if "KiB" in line]
+
+        # Assertions
+        self.assertIn("Peak traced memory per stage", printed.getvalue())
+        self.assertEqual(sorted(stage_lines), ["inner", "outer"])
+
+    def test_stage_memory_tracker(self):
+        """Test the tracker's per-stage peaks directly."""
+        tracker = profiling.StageMemoryTracker()
+        profiling.tracemalloc.start()
+        try:
+            tracker.on_enter("outer", {})
+            tracker.on_enter("inner", {"kind": "big"})
+            data = bytearray(1_000_000)
+            del data
+            tracker.on_exit("inner", {"kind": "big"})
+            tracker.on_exit("outer", {})
+        finally:
+            profiling.tracemalloc.stop()
+
+        # Assertions
+        self.assertGreaterEqual(tracker.peaks["inner kind=big"], 1_000_000)
+        self.assertGreaterEqual(tracker.peaks["outer"], tracker.peaks["inner kind=big"])
+
+    def test_unknown_mode(self):
+        """Test that unknown profilers are rejected."""
+        with self.assertRaises(ValueError):
+            profiling.run_profiled(busy, mode="perf")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import io
+import os
+import time
+import shutil
+import tempfile
+import contextlib
+import numpy as np
+
+# Import the module to test
+from dailydose import cli
+from dailydose.core import cache, pipeline, quiz
+
+def make_entry(word, definitions, part_of_speech="noun", difficulty="Basic"):
+    return {
+        "word": word,
+        "meanings": [{"partOfSpeech": part_of_speech,
+                      "definitions": [{"definition": definition} for definition in definitions]}],
+        "derived": {"difficulty": difficulty}
+    }
+
+ENTRIES = [
+    ("cat", make_entry("cat", ["A small domesticated feline.", "A spiteful woman."])),
+    ("dog", make_entry("dog", ["A domesticated canine."])),
+    ("cow", make_entry("cow", ["A female bovine."])),
+    ("hen", make_entry("hen", ["A female chicken."])),
+    ("ewe", make_entry("ewe", ["A female sheep."])),
+    ("sow", make_entry("sow", ["A female pig.", "To plant seeds."])),
+    ("doe", make_entry("doe", ["A female pig"])),
+    ("run", make_entry("run", ["To move swiftly on foot."], part_of_speech="verb")),
+    ("café", make_entry("café", ["A small restaurant serving coffee — and crêpes."], difficulty="Intermediate")),
+    ("quickly", make_entry("quickly", ["With speed."], part_of_speech="adverb")),
+]
+
+class TestQuiz(unittest.TestCase):
+    """Test cases for the quiz module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch.object(cache, "DICTIONARY_CACHE_DIR", os.path.join(self.temp_dir, "dictionary")),
+            patch.object(cache, "_entries", {}),
+            patch.object(quiz, "QUIZ_INDEX_DIR", os.path.join(self.temp_dir, "quiz")),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_build_index(self):
+        """Test that rows are grouped by bucket with each definition once per bucket."""
+        index = quiz.build_index(ENTRIES)
+        indptr = index["indptr"]
+        basic_nouns = quiz.bucket_of("noun", "Basic")
+
+        # Call function
+        definitions = [quiz.get_definition(index, row) for row in range(indptr[basic_nouns], indptr[basic_nouns + 1])]
+
+        # Assertions
+        self.assertEqual(len(indptr), quiz.BUCKETS + 1)
+        self.assertEqual(len(index["indexed"]), len(ENTRIES))
+        self.assertEqual(len(definitions), 6)
+        self.assertEqual(sum(definition.rstrip(".") == "A female pig" for definition in definitions), 1)
+        self.assertNotIn("A spiteful woman.", definitions)
+        cafe = quiz.bucket_of("noun", "Intermediate")
+        self.assertEqual(quiz.get_definition(index, indptr[cafe]), "A small restaurant serving coffee — and crêpes.")
+
+    def test_index_updates_from_cache(self):
+        """Test that entries cached after the index was saved are added on use."""
+        for word, entry in ENTRIES[:3]:
+            cache.save_entry(word, entry)
+        first = quiz.get_index()
+        for word, entry in ENTRIES[3:]:
+            cache.save_entry(word, entry)
+
+        # Call function
+        index = quiz.get_index()
+
+        # Assertions
+        self.assertEqual(len(first["words"]), 3)
+        self.assertEqual(list(index["indexed"]), sorted(word for word, _ in ENTRIES))
+        self.assertIsInstance(quiz.load_index()["text"], np.memmap)
+        self.assertEqual(len(index["words"]), len(quiz.build_index(ENTRIES)["words"]))
+
+    def test_make_quiz(self):
+        """Test that distractors share the word's part of speech and difficulty."""
+        index = quiz.build_index(ENTRIES)
+        rng = np.random.default_rng(1)
+
+        for _ in range(20):
+            word_quiz = quiz.make_quiz(dict(ENTRIES)["cow"], index=index, rng=rng)
+
+            # Assertions
+            self.assertEqual(len(word_quiz["options"]), 4)
+            self.assertEqual(word_quiz["options"][word_quiz["answer"]], "A female bovine.")
+            self.assertEqual(len(set(word_quiz["options"])), 4)
+            for option in word_quiz["options"]:
+                self.assertIn(option, ["A female bovine.", "A small domesticated feline.", "A domesticated canine.",
+                                       "A female chicken.", "A female sheep.", "A female pig.", "A female pig"])
+
+    def test_own_definitions_excluded_by_cache_key(self):
+        """Test that a word's other meanings aren't distractors when its headword differs from its cache key."""
+        def two_meanings(word):
+            return {"word": word, "meanings": [
+                {"partOfSpeech": "noun", "definitions": [{"definition": f"The {word} you see."}]},
+                {"partOfSpeech": "verb", "definitions": [{"definition": f"To {word} something."}]}]}
+
+        entries = ENTRIES + [("sow2", two_meanings("Sow2")), ("colour", two_meanings("color"))]
+        index = quiz.build_index(entries)
+        rng = np.random.default_rng(4)
+
+        # Call function
+        capitalized = quiz.make_quizzes(two_meanings("Sow2"), 20, index=index, choices=12, rng=rng)
+        spelled = quiz.make_quizzes(two_meanings("color"), 20, index=index, choices=12, rng=rng, key="colour")
+
+        # Assertions
+        self.assertFalse([q for q in capitalized if "To Sow2 something." in q["options"]])
+        self.assertFalse([q for q in spelled if "To color something." in q["options"]])
+
+    def test_small_buckets_widen(self):
+        """Test falling back to other difficulties, then to any part of speech."""
+        index = quiz.build_index(ENTRIES)
+        entries = dict(ENTRIES)
+
+        # Call function
+        cafe = quiz.make_quiz(entries["café"], index=index, rng=np.random.default_rng(2))
+        running = quiz.make_quiz(entries["run"], index=index, choices=3, rng=np.random.default_rng(2))
+
+        # Assertions
+        self.assertEqual(len(cafe["options"]), 4)
+        self.assertEqual(len(running["options"]), 3)
+        self.assertNotIn("To move swiftly on foot.", [option for i, option in enumerate(running["options"])
+                                                      if i != running["answer"]])
+        self.assertIsNone(quiz.make_quiz({"word": "empty", "meanings": []}, index=index))
+
+    def test_batch_for_many_subscribers(self):
+        """Test that quizzes for 100,000 subscribers are cheap and varied."""
+        index = quiz.build_index(ENTRIES)
+        subscribers = (f"user{i}@example.com" for i in range(100000))
+
+        # Call function
+        started = time.perf_counter()
+        pairs = list(quiz.iter_subscriber_quizzes(dict(ENTRIES)["hen"], subscribers, index=index,
+                                                  rng=np.random.default_rng(3)))
+        elapsed = time.perf_counter() - started
+
+        # Assertions
+        self.assertEqual(len(pairs), 100000)
+        self.assertEqual(pairs[-1][0], "user99999@example.com")
+        self.assertEqual({word_quiz["answer"] for _, word_quiz in pairs}, {0, 1, 2, 3})
+        self.assertGreater(len({tuple(word_quiz["options"]) for _, word_quiz in pairs[:100]}), 10)
+        self.assertLess(elapsed, 5.0)
+
+    def test_quiz_in_email(self):
+        """Test that the notify stage adds each subscriber's quiz to the email."""
+        for word, entry in ENTRIES:
+            cache.save_entry(word, entry)
+        artifact = {"word": "cow", "subject": "Daily Word: COW", "html": "<html><body><p>cow</p></body></html>",
+                    "text": "cow"}
+
+        with patch.object(quiz, "QUIZ_IN_EMAIL", True), \
+                patch('dailydose.core.pipeline.send_word_email', return_value=True) as mock_send, \
+                patch('dailydose.core.pipeline.get_email_artifact', return_value=artifact), \
+                patch('dailydose.core.pipeline.mark_seen'):
+            emails = pipeline.notify(dict(ENTRIES)["cow"], subscribers=["a@example.com", "b@example.com"])
+
+        # Assertions
+        self.assertEqual(emails["sent"], 2)
+        sent = mock_send.call_args[0][2]
+        self.assertIn('Which definition matches &quot;cow&quot;?', sent["html"])
+        self.assertRegex(sent["html"], r"<details[^>]*><summary>Show the answer</summary><p[^>]*>[A-D]</p></details>")
+        self.assertNotIn("Answer:", sent["html"])
+        self.assertTrue(sent["html"].endswith("</div></body></html>"))
+        self.assertIn("A. ", sent["text"])
+        self.assertEqual(artifact["text"], "cow")
+
+    def test_quiz_command(self):
+        """Test the quiz command output."""
+        for word, entry in ENTRIES:
+            cache.save_entry(word, entry)
+        printed = io.StringIO()
+
+        # Call function
+        with contextlib.redirect_stdout(printed):
+            cli.cli(["quiz", "dog", "--choices", "3"])
+
+        # Assertions
+        lines = printed.getvalue().splitlines()
+        self.assertEqual(lines[1], 'Which definition matches "dog"?')
+        self.assertEqual(len([line for line in lines if line[:3] in ("A. ", "B. ", "C. ")]), 3)
+        self.assertTrue(lines[-1].startswith("Answer: "))
+
+
+if __name__ == '__main__':
+    unittest.main()
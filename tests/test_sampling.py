@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import io
+import datetime
+import contextlib
+import random
+import numpy as np
+
+# Import the module to test
+from dailydose.core import sampling
+from dailydose.core.difficulty import build_difficulty_table
+
+class TestSampling(unittest.TestCase):
+    """Test cases for the sampling module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.words = ["time", "people", "house", "water", "example", "transportation", "sophisticated"]
+
+    def test_alias_table_distribution(self):
+        """Test that draws follow the weights."""
+        table = sampling.AliasTable([1, 0, 3])
+        rng = random.Random(42)
+
+        counts = np.bincount([table.draw(rng) for _ in range(20000)], minlength=3)
+
+        # Assertions
+        self.assertEqual(counts[1], 0)
+        self.assertAlmostEqual(counts[2] / counts.sum(), 0.75, delta=0.02)
+
+    def test_weighted_sampler_distribution(self):
+        """Test drawing across several blocks."""
+        weights = np.zeros(100)
+        weights[[3, 57, 98]] = [1, 2, 1]
+        sampler = sampling.WeightedSampler(weights, block_size=10, rng=random.Random(1))
+
+        counts = np.bincount(sampler.draw_many(20000), minlength=100)
+
+        # Assertions
+        self.assertEqual(set(np.nonzero(counts)[0]), {3, 57, 98})
+        self.assertAlmostEqual(counts[57] / counts.sum(), 0.5, delta=0.02)
+        self.assertEqual(sampler.total, 4)
+
+    def test_weighted_sampler_update_rebuilds_only_touched_blocks(self):
+        """Test that updates only rebuild the affected blocks."""
+        sampler = sampling.WeightedSampler(np.ones(100), block_size=10, rng=random.Random(1))
+        untouched = sampler.blocks[5]
+
+        # Call function
+        sampler.update([0, 1, 2, 3, 4, 5, 6, 7, 8, 9], 0.0)
+
+        # Assertions
+        self.assertIs(sampler.blocks[5], untouched)
+        self.assertEqual(sampler.total, 90)
+        self.assertTrue(all(index >= 10 for index in sampler.draw_many(1000)))
+
+    def test_weighted_sampler_rejects_bad_weights(self):
+        """Test errors for negative weights and nothing to draw."""
+        with self.assertRaises(ValueError):
+            sampling.WeightedSampler([1, -1])
+        with self.assertRaises(ValueError):
+            sampling.WeightedSampler([0, 0]).draw()
+
+    def test_compute_word_weights(self):
+        """Test combining frequency, level, recency and the blocklist."""
+        table = build_difficulty_table(self.words)
+        today = datetime.date(2023, 1, 31)
+
+        # Call function
+        weights = sampling.compute_word_weights(
+            self.words,
+            difficulty_table=table,
+            history={"people": "2023-01-31", "house": "2022-01-01"},
+            blocklist={"water"},
+            level="Basic",
+            today=today
+        )
+
+        # Assertions
+        self.assertEqual(weights[1], 0.0)  # seen today
+        self.assertEqual(weights[3], 0.0)  # blocked
+        baseline = sampling.compute_word_weights(self.words, difficulty_table=table, level="Basic", today=today)
+        self.assertGreater(weights[2], 0.9 * baseline[2])  # seen long ago
+        self.assertEqual(weights[4], baseline[4])  # never seen
+        self.assertGreater(weights[0], weights[6])  # common, basic word beats rare, advanced one
+
+    @patch('dailydose.core.sampling.get_seen_index')
+    @patch('dailydose.core.sampling.get_blocklist', return_value=set())
+    @patch('dailydose.core.sampling.get_word_history_dates')
+    @patch('dailydose.core.sampling.get_word_list')
+    def test_get_weighted_random_word_skips_todays_word(self, mock_list, mock_history, mock_blocklist, mock_index):
+        """Test that a word seen today is never picked again."""
+        mock_list.return_value = ["time", "people"]
+        mock_history.return_value = {"time": datetime.date.today().isoformat()}
+
+        with patch.object(sampling, "ALLOW_REPEATS", True):
+            words = {sampling.get_weighted_random_word(rng=random.Random(i)) for i in range(20)}
+
+        # Assertions
+        self.assertEqual(words, {"people"})
+        mock_index.assert_not_called()
+
+    @patch('dailydose.core.sampling.get_seen_index')
+    @patch('dailydose.core.sampling.get_blocklist', return_value=set())
+    @patch('dailydose.core.sampling.get_word_history_dates', return_value={})
+    @patch('dailydose.core.sampling.get_word_list')
+    def test_get_weighted_random_word_skips_seen_words(self, mock_list, mock_history, mock_blocklist, mock_index):
+        """Test that words in the seen index are skipped when repeats aren't allowed."""
+        mock_list.return_value = ["time", "people", "house"]
+        mock_index.return_value.seen_mask.return_value = np.array([True, False, True])
+
+        with patch.object(sampling, "ALLOW_REPEATS", False), patch.object(sampling, "SEEN_WEIGHT", 0.0):
+            words = {sampling.get_weighted_random_word(rng=random.Random(i)) for i in range(20)}
+
+        # Assertions
+        self.assertEqual(words, {"people"})
+
+    @patch('dailydose.core.sampling.get_seen_index')
+    @patch('dailydose.core.sampling.get_blocklist', return_value=set())
+    @patch('dailydose.core.sampling.get_word_history_dates')
+    @patch('dailydose.core.sampling.get_word_list')
+    def test_seen_words_keep_recency_order(self, mock_list, mock_history, mock_blocklist, mock_index):
+        """Test that seen words are weighted down and the longest-unseen one still comes first."""
+        today = datetime.date.today()
+        mock_list.return_value = ["time", "people", "house"]
+        mock_history.return_value = {"time": (today - datetime.timedelta(days=5)).isoformat(),
+                                     "people": (today - datetime.timedelta(days=400)).isoformat()}
+        mock_index.return_value.seen_mask.return_value = np.array([True, True, False])
+
+        with patch.object(sampling, "ALLOW_REPEATS", False), patch.object(sampling, "SEEN_WEIGHT", 0.01):
+            picker = sampling.WordPicker(rng=random.Random(1))
+            picker.pick()
+            weights = picker.sampler.weights
+
+        # Assertions
+        self.assertGreater(weights[2], 10 * weights[1])
+        self.assertGreater(weights[1], weights[0])
+        self.assertGreater(weights[0], 0.0)
+
+    @patch('dailydose.core.sampling.get_seen_index')
+    @patch('dailydose.core.sampling.get_blocklist', return_value=set())
+    @patch('dailydose.core.sampling.get_word_history_dates', return_value={})
+    @patch('dailydose.core.sampling.get_word_list')
+    def test_word_picker_builds_once(self, mock_list, mock_history, mock_blocklist, mock_index):
+        """Test that retries reuse the weights and never return a rejected word."""
+        mock_list.return_value = ["time", "people", "house"]
+        mock_index.return_value.seen_mask.return_value = np.zeros(3, dtype=bool)
+        picker = sampling.WordPicker(rng=random.Random(1))
+
+        # Call function
+        first = picker.pick()
+        others = {picker.pick(skip={first}) for _ in range(20)}
+
+        # Assertions
+        self.assertNotIn(first, others)
+        mock_list.assert_called_once()
+        mock_history.assert_called_once()
+        with patch('dailydose.core.sampling.get_random_word', return_value="fallback"):
+            self.assertEqual(picker.pick(skip={"time", "people", "house"}), "fallback")
+
+    @patch('dailydose.core.sampling.get_word_list')
+    def test_word_picker_word_list_error(self, mock_list):
+        """Test that a failed word list download is reported and exits like get_random_word."""
+        mock_list.side_effect = sampling.requests.ConnectionError("no route to host")
+        printed = io.StringIO()
+
+        # Call function
+        with contextlib.redirect_stdout(printed), self.assertRaises(SystemExit) as raised:
+            sampling.WordPicker().pick()
+
+        # Assertions
+        self.assertEqual(raised.exception.code, 1)
+        self.assertIn("Error fetching random word: no route to host", printed.getvalue())
+
+    def test_parse_level(self):
+        """Test that WORD_LEVEL is matched without case and unknown levels are ignored."""
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            self.assertEqual(sampling.parse_level("basic"), "Basic")
+            self.assertIsNone(sampling.parse_level("expert"))
+            self.assertIsNone(sampling.parse_level(None))
+
+        # Assertions
+        self.assertIn("Ignoring unknown WORD_LEVEL 'expert'", printed.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
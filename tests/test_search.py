@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import io
+import os
+import shutil
+import tempfile
+import contextlib
+import numpy as np
+
+# Import the module to test
+from dailydose import cli
+from dailydose.core import cache, search
+from benchmarks.fake_services import generate_words, make_entry
+
+def entry(word, definition, example=None):
+    return {"word": word, "meanings": [{"partOfSpeech": "noun",
+                                        "definitions": [{"definition": definition, "example": example}]}]}
+
+class TestSearch(unittest.TestCase):
+    """Test cases for the search module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch.object(cache, "DICTIONARY_CACHE_DIR", os.path.join(self.temp_dir, "dictionary")),
+            patch.object(cache, "_entries", {}),
+            patch.object(search, "SEARCH_INDEX_DIR", os.path.join(self.temp_dir, "search")),
+        ]
+        for p in self.patches:
+            p.start()
+
+        self.entries = [
+            ("harbor", entry("harbor", "A sheltered place for ships.", "The ships stayed in the harbor.")),
+            ("lantern", entry("lantern", "A portable lamp in a case.", "She lit the lantern on the ship.")),
+            ("anchor", entry("anchor", "A heavy device that holds a ship in place.")),
+        ]
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_tokenize(self):
+        """Test splitting text into search terms without stopwords."""
+        self.assertEqual(search.tokenize("The Ship's lamp, in a case!"), ["ship's", "lamp", "case"])
+
+    def test_search_all_terms(self):
+        """Test that a word matches only if all terms appear in its definitions or examples."""
+        index = search.build_index(self.entries)
+
+        # Assertions
+        self.assertEqual(search.search(index, "ship"), ["anchor", "lantern"])
+        self.assertEqual(search.search(index, "SHIPS"), ["harbor"])
+        self.assertEqual(search.search(index, "ship place"), ["anchor"])
+        self.assertEqual(search.search(index, "ship lamp", limit=1), ["lantern"])
+        self.assertEqual(search.search(index, "ship submarine"), [])
+        self.assertEqual(search.search(index, "the a"), [])
+
+    def test_incremental_update(self):
+        """Test that new cache entries are merged into a saved index without rereading old ones."""
+        for word, data in self.entries[:2]:
+            cache.save_entry(word, data)
+        first = search.get_index()
+        self.assertEqual(search.search(first, "ship"), ["lantern"])
+
+        cache.save_entry("anchor", self.entries[2][1])
+        cache.save_entry("buoy", entry("buoy", "A floating marker for ships."))
+        with patch.object(cache, "load_entry", wraps=cache.load_entry) as mock_load:
+            updated = search.get_index()
+
+        # Assertions
+        self.assertEqual(sorted(call.args[0] for call in mock_load.call_args_list), ["anchor", "buoy"])
+        self.assertEqual(search.search(updated, "ships"), ["buoy", "harbor"])
+        self.assertEqual(search.search(updated, "ship"), ["anchor", "lantern"])
+        rebuilt = search.build_index(self.entries + [("buoy", entry("buoy", "A floating marker for ships."))])
+        for name in ("words", "terms", "indptr", "postings"):
+            np.testing.assert_array_equal(updated[name], rebuilt[name])
+
+    def test_saved_index_is_memory_mapped(self):
+        """Test saving and memory-mapping an index."""
+        search.save_index(search.build_index(self.entries))
+
+        # Call function
+        index = search.load_index()
+
+        # Assertions
+        self.assertIsInstance(index["postings"], np.memmap)
+        self.assertEqual(index["postings"].dtype, np.uint32)
+        self.assertEqual(search.search(index, "heavy device"), ["anchor"])
+
+    def test_large_vocabulary(self):
+        """Test an index over many generated entries."""
+        words = generate_words(2000)
+        index = search.build_index((word, make_entry(word)) for word in words)
+
+        # Assertions
+        self.assertEqual(len(index["words"]), 2000)
+        self.assertEqual(search.search(index, words[10]), [words[10]])
+
+    def test_search_command(self):
+        """Test the search command."""
+        for word, data in self.entries:
+            cache.save_entry(word, data)
+        printed = io.StringIO()
+
+        # Call function
+        with contextlib.redirect_stdout(printed):
+            cli.cli(["search", "ship", "--limit", "1"])
+
+        # Assertions
+        self.assertIn("2 of 3 cached words match 'ship':", printed.getvalue())
+        self.assertIn("anchor: A heavy device that holds a ship in place.", printed.getvalue())
+        self.assertIn("... and 1 more", printed.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
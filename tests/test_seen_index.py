@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Import the module to test
+from dailydose.core import seen_index
+
+class TestSeenIndex(unittest.TestCase):
+    """Test cases for the seen_index module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.words = ["time", "people", "house", "water", "example"]
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.temp_dir, "seen.idx")
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_bitset(self):
+        """Test adding and checking bitset members."""
+        bitset = seen_index.SeenBitset(10)
+        bitset.add(0)
+        bitset.add(9)
+
+        # Assertions
+        self.assertIn(9, bitset)
+        self.assertNotIn(5, bitset)
+        self.assertEqual(bitset.count(), 2)
+        np.testing.assert_array_equal(np.nonzero(bitset.to_mask())[0], [0, 9])
+
+    def test_bloom_filter(self):
+        """Test that added keys are always found and others rarely are."""
+        bloom = seen_index.BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"key{i}")
+
+        false_positives = sum(f"other{i}" in bloom for i in range(1000))
+
+        # Assertions
+        self.assertTrue(all(f"key{i}" in bloom for i in range(1000)))
+        self.assertLess(false_positives, 50)
+
+    def test_seen_index_global_and_per_subscriber(self):
+        """Test global and per-subscriber membership."""
+        index = seen_index.SeenIndex(self.words, bloom=seen_index.BloomFilter(capacity=100))
+        index.add("house")
+        index.add("water", "a@example.com")
+        index.add("zebra")
+
+        # Assertions
+        self.assertTrue(index.seen("house"))
+        self.assertTrue(index.seen("zebra"))
+        self.assertFalse(index.seen("water"))
+        self.assertTrue(index.seen("water", "a@example.com"))
+        self.assertFalse(index.seen("water", "b@example.com"))
+        np.testing.assert_array_equal(index.seen_mask(), [False, False, True, False, False])
+
+    def test_save_and_load(self):
+        """Test persisting the index and loading it back."""
+        index = seen_index.SeenIndex(self.words, bloom=seen_index.BloomFilter(capacity=100))
+        index.add("people")
+        index.add("time", "a@example.com")
+
+        # Call functions
+        index.save(self.index_file)
+        loaded = seen_index.SeenIndex.load(self.index_file)
+
+        # Assertions
+        self.assertEqual(loaded.words, self.words)
+        self.assertTrue(loaded.seen("people"))
+        self.assertTrue(loaded.seen("time", "a@example.com"))
+        self.assertFalse(loaded.seen("time"))
+
+    @patch('dailydose.core.seen_index.iter_history_words')
+    def test_truncated_index_is_rebuilt(self, mock_history):
+        """Test that a file cut short anywhere isn't loaded, so the index is rebuilt from history."""
+        mock_history.return_value = iter(["time"])
+        seen_index.SeenIndex(self.words, bloom=seen_index.BloomFilter(capacity=100)).save(self.index_file)
+        size = os.path.getsize(self.index_file)
+
+        # Cut off the header, the words, the bitset and the last Bloom filter byte
+        header_size = seen_index._HEADER.size
+        for length in (header_size - 1, header_size + 3, header_size + len("\n".join(self.words)), size - 1):
+            with open(self.index_file, "r+b") as f:
+                f.truncate(length)
+            with patch('sys.stdout'):
+                self.assertIsNone(seen_index.SeenIndex.load(self.index_file))
+
+        with patch.object(seen_index, "SEEN_INDEX_FILE", self.index_file), patch('sys.stdout'):
+            index = seen_index.get_seen_index(self.words)
+
+        # Assertions
+        self.assertTrue(index.seen("time"))
+        self.assertTrue(seen_index.SeenIndex.load(self.index_file).seen("time"))
+
+    @patch('dailydose.core.seen_index.iter_history_words')
+    def test_get_seen_index_rebuilds_for_new_word_list(self, mock_history):
+        """Test building from history and rebuilding when the word list changes."""
+        mock_history.return_value = iter(["time", "water"])
+
+        with patch.object(seen_index, "SEEN_INDEX_FILE", self.index_file):
+            index = seen_index.get_seen_index(self.words)
+            self.assertTrue(os.path.exists(self.index_file))
+
+            # Same list: loaded from disk without reading history again
+            again = seen_index.get_seen_index(self.words)
+
+            # Different list: rebuilt
+            mock_history.return_value = iter(["time"])
+            other = seen_index.get_seen_index(["time", "space"])
+
+        # Assertions
+        self.assertTrue(index.seen("water"))
+        self.assertTrue(again.seen("water"))
+        self.assertEqual(mock_history.call_count, 2)
+        self.assertEqual(other.words, ["time", "space"])
+
+    def test_mark_seen(self):
+        """Test recording pairs in the saved index."""
+        with patch.object(seen_index, "SEEN_INDEX_FILE", self.index_file):
+            # Nothing happens without a saved index
+            seen_index.mark_seen([("time", None)])
+            self.assertFalse(os.path.exists(self.index_file))
+
+            seen_index.SeenIndex(self.words, bloom=seen_index.BloomFilter(capacity=100)).save()
+            seen_index.mark_seen([("time", None), ("house", "a@example.com")])
+            index = seen_index.SeenIndex.load()
+
+        # Assertions
+        self.assertTrue(index.seen("time"))
+        self.assertTrue(index.seen("house", "a@example.com"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ from unittest.mock import patch, MagicMock, mock_open
 import json
 import os
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 import pymongo
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, OperationFailure
 
@@ -51,9 +52,10 @@ class TestStorage(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test fixtures after each test method."""
-        # Remove test history file
-        if os.path.exists(self.test_history_file):
-            os.remove(self.test_history_file)
+        # Remove test history file and its lock, journal and backup files
+        for suffix in ("", ".lock", ".journal", ".corrupt"):
+            if os.path.exists(self.test_history_file + suffix):
+                os.remove(self.test_history_file + suffix)
     
     @patch('pymongo.MongoClient')
     def test_initialize_mongodb(self, mock_client):
@@ -92,44 +94,38 @@ class TestStorage(unittest.TestCase):
             mock_client.assert_called_once()
     
     @patch('datetime.datetime')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('json.load')
-    @patch('json.dump')
-    def test_save_to_file_new_word(self, mock_json_dump, mock_json_load, mock_file, mock_datetime):
+    def test_save_to_file_new_word(self, mock_datetime):
         """Test saving a new word to file."""
         # Mock today's date
         mock_now = MagicMock()
         mock_now.strftime.return_value = self.today
         mock_datetime.now.return_value = mock_now
         
-        # Set up the mock to handle file exists check
-        mock_file.return_value.__enter__.return_value.read.return_value = '{}'
-        
-        # Mock existing history data
-        mock_json_load.return_value = {"words": []}
+        # Start from an empty history file
+        with open(self.test_history_file, 'w') as f:
+            json.dump({"words": []}, f)
         
-        # Mock os.path.exists to return True for history file existence check
-        with patch('os.path.exists', return_value=True):
+        with patch.object(storage, "HISTORY_FILE", self.test_history_file):
             # Call function
             storage.save_to_file("example", self.sample_word_data)
         
-        # Assertions
-        mock_file.assert_called()
-        mock_json_dump.assert_called_once()
-        
         # Check what was written to the file
-        args, kwargs = mock_json_dump.call_args
-        history_data = args[0]
+        with open(self.test_history_file) as f:
+            history_data = json.load(f)
         self.assertEqual(len(history_data["words"]), 1, "Should have one word added")
         self.assertEqual(history_data["words"][0]["word"], "example")
         self.assertEqual(history_data["words"][0]["date_added"], self.today)
         self.assertEqual(history_data["words"][0]["review_count"], 0)
+        
+        # The journal is cleared once the word is in the history file
+        self.assertFalse(os.path.exists(f"{self.test_history_file}.journal"))
     
+    @patch('dailydose.core.storage.history_lock')
     @patch('datetime.datetime')
     @patch('builtins.open', new_callable=mock_open)
     @patch('json.load')
     @patch('json.dump')
-    def test_save_to_file_existing_word(self, mock_json_dump, mock_json_load, mock_file, mock_datetime):
+    def test_save_to_file_existing_word(self, mock_json_dump, mock_json_load, mock_file, mock_datetime, mock_lock):
         """Test updating an existing word in file."""
         # Mock today's date
         mock_now = MagicMock()
@@ -250,6 +246,132 @@ class TestStorage(unittest.TestCase):
         # Assertions
         self.assertFalse(result)
     
+    def test_get_recent_words_from_mongodb(self):
+        """Test reading the most recent words from MongoDB."""
+        # Setup MongoDB mock
+        mock_collection = MagicMock()
+        mock_collection.find.return_value.sort.return_value.limit.return_value = [
+            {"word": "newest"}, {"word": "older"}
+        ]
+        
+        with patch.object(storage, "word_collection", mock_collection):
+            result = storage.get_recent_words(2)
+        
+        # Assertions
+        self.assertEqual(result, ["newest", "older"])
+        mock_collection.find.return_value.sort.return_value.limit.assert_called_once_with(2)
+    
+    @patch('builtins.open', new_callable=mock_open)
+    @patch('json.load')
+    def test_get_recent_words_from_file(self, mock_json_load, mock_file):
+        """Test reading the most recent words from the local history file."""
+        mock_json_load.return_value = {
+            "words": [{"word": "first"}, {"word": "second"}, {"word": "third"}]
+        }
+        
+        with patch.object(storage, "word_collection", None), \
+                patch('os.path.exists', return_value=True):
+            result = storage.get_recent_words(2)
+        
+        # Assertions
+        self.assertEqual(result, ["third", "second"])
+    
+    def test_get_word_history_dates_from_file(self):
+        """Test reading word dates from the local file, and an unreadable file."""
+        with open(self.test_history_file, 'w') as f:
+            json.dump({"words": [{"word": "time", "date_added": "2023-01-01"}]}, f)
+        
+        with patch.object(storage, "word_collection", None), \
+                patch.object(storage, "HISTORY_FILE", self.test_history_file):
+            dates = storage.get_word_history_dates()
+            with open(self.test_history_file, 'w') as f:
+                f.write('{"words": [')
+            damaged = storage.get_word_history_dates()
+            recent = storage.get_recent_words(5)
+        
+        # Assertions
+        self.assertEqual(dates, {"time": "2023-01-01"})
+        self.assertEqual(damaged, {})
+        self.assertEqual(recent, [])
+    
+    @patch('datetime.datetime')
+    def test_save_to_file_replays_journal(self, mock_datetime):
+        """Test that a word journaled before a crash is restored on the next save."""
+        mock_datetime.now.return_value.strftime.return_value = self.today
+        with open(self.test_history_file, 'w') as f:
+            json.dump({"words": [{"word": "time"}]}, f)
+        with open(f"{self.test_history_file}.journal", 'w') as f:
+            f.write(json.dumps({"word": "people"}) + "\n" + '{"word": "hou')
+        
+        with patch.object(storage, "HISTORY_FILE", self.test_history_file):
+            # Call function
+            storage.save_to_file("example", self.sample_word_data)
+        
+        with open(self.test_history_file) as f:
+            words = [entry["word"] for entry in json.load(f)["words"]]
+        
+        # Assertions
+        self.assertEqual(words, ["time", "people", "example"])
+        self.assertFalse(os.path.exists(f"{self.test_history_file}.journal"))
+    
+    @patch('datetime.datetime')
+    def test_save_to_file_recovers_damaged_file(self, mock_datetime):
+        """Test that a truncated history file keeps its readable words."""
+        mock_datetime.now.return_value.strftime.return_value = self.today
+        with open(self.test_history_file, 'w') as f:
+            f.write('{"words": [{"word": "time"}, {"word": "peo')
+        
+        with patch.object(storage, "HISTORY_FILE", self.test_history_file):
+            # Call function
+            storage.save_to_file("example", self.sample_word_data)
+        
+        with open(self.test_history_file) as f:
+            words = [entry["word"] for entry in json.load(f)["words"]]
+        
+        # Assertions
+        self.assertEqual(words, ["time", "example"])
+        self.assertTrue(os.path.exists(f"{self.test_history_file}.corrupt"))
+    
+    def test_save_to_file_concurrent_writers(self):
+        """Test that parallel saves don't lose each other's words."""
+        words = [f"word{i}" for i in range(20)]
+        
+        with patch.object(storage, "HISTORY_FILE", self.test_history_file):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda word: storage.save_to_file(word, None), words))
+        
+        with open(self.test_history_file) as f:
+            saved = {entry["word"] for entry in json.load(f)["words"]}
+        
+        # Assertions
+        self.assertEqual(saved, set(words))
+    
+    def test_iter_history_file(self):
+        """Test reading history entries incrementally, across chunk boundaries."""
+        history = {"words": [
+            {"word": "example", "date_added": self.today, "note": "a ] and a { inside"},
+            {"word": "café", "date_added": self.today}
+        ]}
+        with open(self.test_history_file, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2)
+        
+        # Call function
+        entries = list(storage.iter_history_file(self.test_history_file, chunk_size=7))
+        
+        # Assertions
+        self.assertEqual(entries, history["words"])
+    
+    def test_iter_history_file_truncated(self):
+        """Test that a file cut off mid-array yields the complete entries."""
+        with open(self.test_history_file, 'w') as f:
+            f.write('{"words": [{"word": "example"}, {"word": "sam')
+        
+        # Call function
+        entries = list(storage.iter_history_file(self.test_history_file))
+        
+        # Assertions
+        self.assertEqual(entries, [{"word": "example"}])
+    
     @patch('dailydose.core.storage.save_to_mongodb')
     @patch('dailydose.core.storage.save_to_file')
     def test_save_word_history(self, mock_save_file, mock_save_mongo):
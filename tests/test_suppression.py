@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch, MagicMock
+import io
+import os
+import json
+import time
+import shutil
+import tempfile
+import contextlib
+import numpy as np
+
+# Import the module to test
+from dailydose import cli
+from dailydose.core import email_service, pipeline, suppression
+
+def bounce(address, bounce_type="Permanent"):
+    return {"notificationType": "Bounce",
+            "bounce": {"bounceType": bounce_type, "bouncedRecipients": [{"emailAddress": address}]}}
+
+def complaint(address):
+    return {"notificationType": "Complaint", "complaint": {"complainedRecipients": [{"emailAddress": address}]}}
+
+def sns_envelope(message):
+    return {"Type": "Notification", "MessageId": "1", "Message": json.dumps(message)}
+
+class TestSuppression(unittest.TestCase):
+    """Test cases for the suppression module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "suppressed.npy")
+        self.patches = [
+            patch.object(suppression, "SUPPRESSION_FILE", self.path),
+            patch.object(suppression, "_suppressed", None),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_suppress_and_check(self):
+        """Test that addresses are matched after normalizing."""
+        result = suppression.suppress(["Bounced@Example.com ", "other@example.com", "other@example.com"])
+
+        # Assertions
+        self.assertEqual(result, {"added": 2, "total": 2})
+        self.assertTrue(suppression.is_suppressed("bounced@example.com"))
+        self.assertFalse(suppression.is_suppressed("fine@example.com"))
+        self.assertEqual(suppression.suppress(["OTHER@example.com"]), {"added": 0, "total": 2})
+
+    def test_only_hashes_are_stored(self):
+        """Test that the file holds 8-byte hashes and no addresses."""
+        suppression.suppress(["secret@example.com"])
+
+        # Assertions
+        with open(self.path, "rb") as f:
+            self.assertNotIn(b"secret", f.read())
+        self.assertEqual(np.load(self.path).dtype, np.uint64)
+
+    def test_unreadable_file_is_logged(self):
+        """Test that a damaged suppression file is logged and treated as empty."""
+        with open(self.path, "wb") as f:
+            f.write(b"not an array")
+
+        # Call function
+        with self.assertLogs("dailydose.suppression", "WARNING") as logs:
+            hashes = suppression.load_suppressed()
+
+        # Assertions
+        self.assertEqual(hashes, set())
+        self.assertEqual(logs.records[0].getMessage(), "suppression_list_unreadable")
+        self.assertEqual(logs.records[0].path, self.path)
+
+    def test_filter_subscribers_streams(self):
+        """Test that the filter reads its input lazily and drops suppressed addresses."""
+        suppression.suppress(["b@example.com"])
+        read = []
+
+        def addresses():
+            for email in ["a@example.com", "B@example.com", "c@example.com"]:
+                read.append(email)
+                yield email
+
+        filtered = suppression.filter_subscribers(addresses())
+
+        # Assertions
+        self.assertEqual(next(filtered), "a@example.com")
+        self.assertEqual(read, ["a@example.com"])
+        self.assertEqual(list(filtered), ["c@example.com"])
+
+    def test_million_entries(self):
+        """Test that checks stay fast with a million suppressed addresses."""
+        hashes = np.unique(np.random.default_rng(1).integers(0, 2**63, size=1_000_000, dtype=np.uint64))
+        np.save(self.path, np.append(hashes, np.uint64(suppression.hash_address("x@example.com"))))
+        suppressed = suppression.load_suppressed()
+
+        # Call function
+        started = time.perf_counter()
+        kept = list(suppression.filter_subscribers((f"user{i}@example.com" for i in range(10000)), suppressed))
+        elapsed = time.perf_counter() - started
+
+        # Assertions
+        self.assertEqual(len(suppressed), len(hashes) + 1)
+        self.assertTrue(suppression.is_suppressed("x@example.com"))
+        self.assertEqual(len(kept), 10000)
+        self.assertLess(elapsed, 1.0)
+
+    def test_parse_ses_notification(self):
+        """Test reading addresses from SES notifications."""
+        self.assertEqual(suppression.parse_ses_notification(bounce("a@example.com")), ["a@example.com"])
+        self.assertEqual(suppression.parse_ses_notification(bounce("a@example.com", "Transient")), [])
+        self.assertEqual(suppression.parse_ses_notification(json.dumps(sns_envelope(complaint("c@example.com")))),
+                         ["c@example.com"])
+        self.assertEqual(suppression.parse_ses_notification({"notificationType": "Delivery"}), [])
+
+    def test_import_file(self):
+        """Test importing a file of addresses and SES notifications."""
+        import_path = os.path.join(self.temp_dir, "bounces.jsonl")
+        with open(import_path, "w") as f:
+            f.write("# exported bounces\n")
+            f.write("plain@example.com\n\n")
+            f.write(json.dumps(sns_envelope(bounce("bounced@example.com"))) + "\n")
+            f.write(json.dumps(bounce("soft@example.com", "Transient")) + "\n")
+            f.write("{not json\n")
+
+        # Call function
+        with self.assertLogs("dailydose.suppression", "WARNING") as logs:
+            result = suppression.import_suppressions(import_path)
+
+        # Assertions
+        self.assertEqual(result, {"added": 2, "total": 2})
+        self.assertEqual([(record.getMessage(), record.line) for record in logs.records],
+                         [("notification_unreadable", 6)])
+        self.assertTrue(suppression.is_suppressed("bounced@example.com"))
+        self.assertFalse(suppression.is_suppressed("soft@example.com"))
+
+    def test_poll_ses_queue(self):
+        """Test reading notifications from SQS and deleting them once saved."""
+        sqs = MagicMock()
+        sqs.receive_message.side_effect = [
+            {"Messages": [
+                {"MessageId": "1", "ReceiptHandle": "r1", "Body": json.dumps(sns_envelope(bounce("a@example.com")))},
+                {"MessageId": "2", "ReceiptHandle": "r2", "Body": json.dumps(sns_envelope(complaint("b@example.com")))},
+                {"MessageId": "3", "ReceiptHandle": "r3", "Body": "{not json"},
+            ]},
+            {}
+        ]
+
+        # Call function
+        with self.assertLogs("dailydose.suppression", "WARNING") as logs:
+            result = suppression.poll_ses_queue("https://sqs.example/queue", sqs_client=sqs)
+
+        # Assertions
+        self.assertEqual(result, {"messages": 3, "added": 2, "total": 2})
+        entries = sqs.delete_message_batch.call_args[1]["Entries"]
+        self.assertEqual([entry["ReceiptHandle"] for entry in entries], ["r1", "r2", "r3"])
+        self.assertEqual([record.message_id for record in logs.records], ["3"])
+        with patch.object(suppression, "SUPPRESSION_QUEUE_URL", None):
+            with self.assertRaises(ValueError):
+                suppression.poll_ses_queue()
+
+    def test_subscribers_skip_suppressed(self):
+        """Test that subscriber lists and the notify stage leave out suppressed addresses."""
+        suppression.suppress(["b@example.com"])
+
+        with patch.dict(os.environ, {"EMAIL_SUBSCRIBERS": "a@example.com, b@example.com"}):
+            self.assertEqual(email_service.get_subscribers(), ["a@example.com"])
+            with patch('dailydose.core.pipeline.send_word_email', return_value=True) as mock_send, \
+                    patch('dailydose.core.pipeline.get_email_artifact'), \
+                    patch('dailydose.core.pipeline.mark_seen'):
+                emails = pipeline.notify({"word": "example"})
+
+        # Assertions
+        self.assertEqual(emails, {"subscribers": 1, "sent": 1, "failed": 0})
+        self.assertEqual(mock_send.call_args[0][0], "a@example.com")
+
+    def test_suppression_commands(self):
+        """Test the suppression add and check commands."""
+        printed = io.StringIO()
+
+        # Call function
+        with contextlib.redirect_stdout(printed):
+            cli.cli(["suppression", "add", "a@example.com"])
+            cli.cli(["suppression", "check", "A@example.com", "b@example.com"])
+
+        # Assertions
+        self.assertIn("Added 1 addresses. The suppression list holds 1.", printed.getvalue())
+        self.assertIn("A@example.com: suppressed", printed.getvalue())
+        self.assertIn("b@example.com: not suppressed", printed.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
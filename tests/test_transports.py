@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+import unittest
+from unittest.mock import patch, MagicMock
+import email
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+# Import the module to test
+from dailydose.core import email_service, transports
+from dailydose.core.transports import SMTPTransport, TransportError
+from benchmarks.fake_services import FakeSMTPServer
+
+ARTIFACT = {"subject": "Word of the Day: café", "html": "<p>A <b>café</b> sells coffee.</p>",
+            "text": "A café sells coffee."}
+
+class TestTransports(unittest.TestCase):
+    """Test cases for the transports module."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.server = FakeSMTPServer(username="dailydose", password="secret", keep_messages=True).start()
+        self.addCleanup(self.server.stop)
+
+    def make_transport(self, **kwargs):
+        transport = SMTPTransport(self.server.host, self.server.port, username="dailydose", password="secret",
+                                  security="none", **kwargs)
+        self.addCleanup(transport.close)
+        return transport
+
+    def test_smtp_sends_multipart_message(self):
+        """Test that the artifact goes out with a text and an HTML part."""
+        transport = self.make_transport()
+
+        # Call function
+        message_id = transport.send("noreply@example.com", "reader@example.com", ARTIFACT)
+
+        # Assertions
+        recipients, data = self.server.messages[0]
+        message = email.message_from_bytes(data, policy=email.policy.default)
+        self.assertEqual(recipients, ["reader@example.com"])
+        self.assertEqual(message["Message-ID"], message_id)
+        self.assertEqual(message["Subject"], ARTIFACT["subject"])
+        self.assertEqual(message.get_body(("plain",)).get_content().strip(), ARTIFACT["text"])
+        self.assertEqual(message.get_body(("html",)).get_content().strip(), ARTIFACT["html"])
+
+    def test_smtp_reuses_connections(self):
+        """Test that many messages share one authenticated connection."""
+        transport = self.make_transport()
+
+        for i in range(50):
+            transport.send("noreply@example.com", f"reader{i}@example.com", ARTIFACT)
+
+        # Assertions
+        self.assertEqual(self.server.emails_sent, 50)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(transport.connections_opened, 1)
+
+    def test_smtp_replaces_connections_after_max_messages(self):
+        """Test that a connection is closed after max_messages messages."""
+        transport = self.make_transport(max_messages=10)
+
+        for i in range(25):
+            transport.send("noreply@example.com", f"reader{i}@example.com", ARTIFACT)
+
+        # Assertions
+        self.assertEqual(self.server.connections, 3)
+
+    def test_smtp_reconnects_when_dropped(self):
+        """Test that a message is retried on a new connection when the server has closed the old one."""
+        self.server.server.max_messages_per_connection = 3
+        transport = self.make_transport()
+
+        for i in range(10):
+            transport.send("noreply@example.com", f"reader{i}@example.com", ARTIFACT)
+
+        # Assertions
+        self.assertEqual(self.server.emails_sent, 10)
+        self.assertEqual(self.server.connections, 4)
+
+    def test_smtp_retries_on_a_new_connection(self):
+        """Test that the retry doesn't take another idle connection the server may have closed too."""
+        transport = self.make_transport()
+        for _ in range(2):
+            pooled = transport._connect()
+            pooled[0].sock.shutdown(socket.SHUT_RDWR)
+            transport._checkin(pooled)
+
+        # Call function
+        transport.send("noreply@example.com", "reader@example.com", ARTIFACT)
+
+        # Assertions
+        self.assertEqual(self.server.emails_sent, 1)
+        self.assertEqual(transport.connections_opened, 3)
+
+    def test_smtp_421_closes_connection(self):
+        """Test that a 421 reply drops the connection and retries the message on a new one."""
+        self.server.server.max_messages_per_connection = 2
+        self.server.server.announce_close = True
+        transport = self.make_transport()
+
+        for i in range(5):
+            transport.send("noreply@example.com", f"reader{i}@example.com", ARTIFACT)
+
+        # Assertions
+        self.assertEqual(self.server.emails_sent, 5)
+        self.assertEqual(self.server.connections, 3)
+        self.assertEqual(transport._idle.qsize(), 1)
+
+    def test_smtp_pool_is_bounded(self):
+        """Test concurrent sends from many threads through a small pool."""
+        transport = self.make_transport(pool_size=3)
+
+        with ThreadPoolExecutor(max_workers=12) as executor:
+            list(executor.map(lambda i: transport.send("noreply@example.com", f"reader{i}@example.com", ARTIFACT),
+                              range(120)))
+
+        # Assertions
+        self.assertEqual(self.server.emails_sent, 120)
+        self.assertLessEqual(self.server.connections, 3)
+
+    def test_smtp_refused_recipient(self):
+        """Test that a refused recipient raises TransportError and keeps the connection."""
+        self.server.server.reject.add("gone@example.com")
+        transport = self.make_transport()
+
+        with self.assertRaises(TransportError):
+            transport.send("noreply@example.com", "gone@example.com", ARTIFACT)
+        transport.send("noreply@example.com", "reader@example.com", ARTIFACT)
+
+        # Assertions
+        self.assertEqual(self.server.emails_sent, 1)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_smtp_errors(self):
+        """Test failed logins and unreachable servers."""
+        bad_login = SMTPTransport(self.server.host, self.server.port, username="dailydose", password="wrong",
+                                  security="none")
+        unreachable = SMTPTransport("127.0.0.1", 1, security="none", timeout=1)
+
+        # Assertions
+        with self.assertRaises(TransportError):
+            bad_login.send("noreply@example.com", "reader@example.com", ARTIFACT)
+        with self.assertRaises(TransportError):
+            unreachable.send("noreply@example.com", "reader@example.com", ARTIFACT)
+        with self.assertRaises(ValueError):
+            SMTPTransport("localhost", security="tls")
+
+    def test_ses_transport(self):
+        """Test that the SES transport calls SendEmail."""
+        client = MagicMock()
+        client.send_email.return_value = {"MessageId": "abc123"}
+
+        # Call function
+        message_id = transports.SESTransport(client).send("noreply@example.com", "reader@example.com", ARTIFACT)
+
+        # Assertions
+        self.assertEqual(message_id, "abc123")
+        kwargs = client.send_email.call_args[1]
+        self.assertEqual(kwargs["Destination"], {"ToAddresses": ["reader@example.com"]})
+        self.assertEqual(kwargs["Message"]["Body"]["Text"]["Data"], ARTIFACT["text"])
+
+    def test_send_email_over_smtp(self):
+        """Test that send_email uses the SMTP transport when configured."""
+        settings = {"EMAIL_ENABLED": True, "EMAIL_TRANSPORT": "smtp", "SMTP_HOST": self.server.host,
+                    "SMTP_PORT": self.server.port, "SMTP_SECURITY": "none", "SMTP_USERNAME": "dailydose",
+                    "SMTP_PASSWORD": "secret", "ses_client": None}
+        with patch.multiple(email_service, **settings):
+            self.addCleanup(email_service.close_transport)
+            results = [email_service.send_email(f"reader{i}@example.com", ARTIFACT) for i in range(5)]
+            self.server.server.reject.add("gone@example.com")
+            refused = email_service.send_email("gone@example.com", ARTIFACT)
+
+        # Assertions
+        self.assertEqual(results, [True] * 5)
+        self.assertFalse(refused)
+        self.assertEqual(self.server.connections, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,31 @@
 #!/usr/bin/env python3
 import unittest
 from unittest.mock import patch, MagicMock
+import json
+import shutil
+import tempfile
 import requests
 
 # Import the module to test
-from dailydose.core import word_utils
+from dailydose.core import word_utils, morphology
 
 class TestWordUtils(unittest.TestCase):
     """Test cases for the word_utils module."""
     
     def setUp(self):
         """Set up test fixtures before each test method."""
+        # Affixes are split off stems from a fixed word list, which fetched lists don't overwrite
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        analyzer = morphology.MorphologyAnalyzer.from_file(morphology.MORPHOLOGY_FILE)
+        analyzer.set_words(["ample", "lock"])
+        for patcher in (
+            patch.object(morphology, "KNOWN_WORDS_FILE", f"{self.temp_dir}/known_words.txt"),
+            patch.object(morphology, "_analyzer", analyzer),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
         # Sample word data for testing
         self.sample_word_data = {
             "word": "example",
@@ -52,6 +67,38 @@ class TestWordUtils(unittest.TestCase):
         # Assertions
         self.assertIn(word, ["apple", "banana", "cherry", "date", "eggplant"])
         mock_get.assert_called_once_with("https://www.mit.edu/~ecprice/wordlist.10000")
+        
+        # The fetched list is remembered for splitting affixes
+        self.assertEqual(morphology.load_known_words(), ["apple", "banana", "cherry", "date", "eggplant"])
+    
+    @patch('requests.get')
+    def test_get_random_words(self, mock_get):
+        """Test fetching several distinct random words with one download."""
+        # Mock response
+        mock_response = MagicMock()
+        mock_response.content = b"cat\napple\nbanana\ncherry\neggplant"
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        
+        # Call function
+        words = word_utils.get_random_words(3)
+        
+        # Assertions
+        self.assertEqual(len(set(words)), 3)
+        self.assertTrue(set(words) <= {"apple", "banana", "cherry", "eggplant"})
+        mock_get.assert_called_once()
+    
+    @patch('requests.get')
+    def test_get_word_list_error(self, mock_get):
+        """Test that a failed word list download raises instead of parsing the error page."""
+        mock_response = MagicMock()
+        mock_response.status_code = 503
+        mock_response.content = b"<html>Service Unavailable</html>"
+        mock_get.return_value = mock_response
+        
+        # Call function
+        with self.assertRaises(requests.HTTPError):
+            word_utils.get_word_list()
     
     @patch('requests.get')
     def test_get_word_info_success(self, mock_get):
@@ -59,14 +106,14 @@ class TestWordUtils(unittest.TestCase):
         # Mock response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [self.sample_word_data]
+        mock_response.content = json.dumps([self.sample_word_data]).encode("utf-8")
         mock_get.return_value = mock_response
         
         # Call function
         result = word_utils.get_word_info("example")
         
         # Assertions
-        self.assertEqual(result, self.sample_word_data)
+        self.assertEqual(result.to_dict(), self.sample_word_data)
         mock_get.assert_called_once_with("https://api.dictionaryapi.dev/api/v2/entries/en/example")
     
     @patch('requests.get')
@@ -84,7 +131,76 @@ class TestWordUtils(unittest.TestCase):
         self.assertIsNone(result)
         mock_get.assert_called_once_with("https://api.dictionaryapi.dev/api/v2/entries/en/nonexistentword")
     
-    def test_get_learning_difficulty(self):
+    @patch('dailydose.core.word_utils.get_word_info')
+    def test_get_cached_word_info(self, mock_get_info):
+        """Test that word information is fetched once and then served from cache."""
+        mock_get_info.return_value = self.sample_word_data
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with patch.object(word_utils.cache, "DICTIONARY_CACHE_DIR", temp_dir), \
+                    patch.object(word_utils.cache, "_entries", {}):
+                first = word_utils.get_cached_word_info("example")
+                second = word_utils.get_cached_word_info("example")
+        finally:
+            shutil.rmtree(temp_dir)
+        
+        # Assertions
+        self.assertEqual(first["meanings"][0]["partOfSpeech"], "noun")
+        self.assertIn("derived", first)
+        self.assertIs(second, first)
+        mock_get_info.assert_called_once_with("example")
+    
+    @patch('dailydose.core.word_utils.get_word_info')
+    def test_get_word_infos(self, mock_get_info):
+        """Test batch lookups mixing cache hits, fetched and unknown words."""
+        mock_get_info.side_effect = lambda word: {"word": word} if word != "unknown" else None
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with patch.object(word_utils.cache, "DICTIONARY_CACHE_DIR", temp_dir), \
+                    patch.object(word_utils.cache, "_entries", {"cached": {"word": "cached"}}):
+                result = word_utils.get_word_infos(["cached", "fresh", "unknown", "fresh"])
+        finally:
+            shutil.rmtree(temp_dir)
+        
+        # Assertions
+        self.assertEqual(set(result), {"cached", "fresh", "unknown"})
+        self.assertEqual(result["fresh"]["word"], "fresh")
+        self.assertIsNone(result["unknown"])
+        self.assertEqual(mock_get_info.call_count, 2)
+    
+    def test_get_derived_content(self):
+        """Test computing derived content once and storing it on the word data."""
+        derived = word_utils.get_derived_content(self.sample_word_data)
+        
+        # Assertions
+        self.assertIs(self.sample_word_data["derived"], derived)
+        self.assertEqual(derived["difficulty"], "Intermediate")
+        self.assertEqual(derived["synonyms"], ["model", "pattern", "prototype"])
+        self.assertEqual(derived["antonyms"], ["exception", "anomaly"])
+        self.assertEqual(derived["examples"][0], "I followed your example")
+        self.assertEqual(len(derived["examples"]), 3)
+        self.assertIn("prefix 'ex-'", derived["memory_tip"])
+        self.assertEqual(derived["etymology_url"], "https://www.etymonline.com/word/example")
+        
+        # A second call returns the stored result without recomputing
+        with patch('dailydose.core.word_utils.collect_related_content') as mock_collect:
+            self.assertIs(word_utils.get_derived_content(self.sample_word_data), derived)
+            mock_collect.assert_not_called()
+    
+    def test_get_derived_content_stale_version(self):
+        """Test that derived content from an older version is recomputed."""
+        self.sample_word_data["derived"] = {"version": 0, "difficulty": "Basic"}
+        
+        derived = word_utils.get_derived_content(self.sample_word_data)
+        
+        # Assertions
+        self.assertEqual(derived["version"], word_utils.DERIVED_CONTENT_VERSION)
+        self.assertEqual(derived["difficulty"], "Intermediate")
+    
+    @patch('dailydose.core.difficulty.get_saved_table', return_value=None)
+    def test_get_learning_difficulty(self, mock_table):
         """Test difficulty level classification."""
         # Test basic word
         self.assertEqual(word_utils.get_learning_difficulty("cat"), "Basic")
@@ -94,6 +210,11 @@ class TestWordUtils(unittest.TestCase):
         
         # Test advanced word
         self.assertEqual(word_utils.get_learning_difficulty("sophisticated"), "Advanced")
+        
+        # One root keeps the length-based level; several raise it by one
+        self.assertEqual(word_utils.get_learning_difficulty("phone"), "Basic")
+        self.assertEqual(word_utils.get_learning_difficulty("scope"), "Basic")
+        self.assertEqual(word_utils.get_learning_difficulty("biology"), "Advanced")
     
     def test_get_memory_tip(self):
         """Test memory tip generation."""